@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for MultiClip internals
+Run a module directly, e.g. `python -m benchmarks.bench_clipboard_backend`
+"""
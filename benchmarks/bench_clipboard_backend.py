@@ -0,0 +1,66 @@
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from shared.clipboard_backend import (
+    ClipboardBackend, MemoryClipboardBackend, PyperclipBackend, TkHelperBackend
+)
+
+
+def _time_calls(fn: Callable[[], None], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_us": statistics.mean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p99_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6,
+    }
+
+
+def bench_backend(backend: ClipboardBackend, iterations: int, payload: str) -> Dict[str, Dict[str, float]]:
+    backend.copy(payload)
+    return {
+        "copy": _summarize(_time_calls(lambda: backend.copy(payload), iterations)),
+        "paste": _summarize(_time_calls(backend.paste, iterations)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-operation clipboard latency")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--size", type=int, default=1024, help="payload size in characters")
+    args = parser.parse_args()
+
+    payload = ("multiclip benchmark " * (args.size // 20 + 1))[:args.size]
+    factories = [
+        ("memory", MemoryClipboardBackend),
+        ("pyperclip", PyperclipBackend),
+        ("tk-helper", TkHelperBackend),
+    ]
+
+    for name, factory in factories:
+        try:
+            backend = factory()
+        except Exception as e:
+            print(f"{name:<10} unavailable: {e}")
+            continue
+        try:
+            results = bench_backend(backend, args.iterations, payload)
+        finally:
+            backend.close()
+        for op, stats in results.items():
+            print(f"{name:<10} {op:<6} mean {stats['mean_us']:9.1f} us  "
+                  f"p50 {stats['p50_us']:9.1f} us  p99 {stats['p99_us']:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import time
+from typing import List
+
+from shared.blob_store import BlobStore
+from shared.compression import CODECS, compression_report, unpack_text
+
+
+def load_corpus(paths: List[str]) -> List[str]:
+    """Slot snapshots (JSON objects of slot -> content) contribute each slot; other files count whole"""
+    samples = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+            text = f.read()
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            samples.extend(unpack_text(value) for value in data.values()
+                           if isinstance(value, (str, dict)))
+        else:
+            samples.append(text)
+    return [sample for sample in samples if sample]
+
+
+def synthetic_log(size: int) -> str:
+    """Log-like text of roughly size characters, a stand-in for a large copied log"""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = (f"2024-01-01 12:{i // 60 % 60:02d}:{i % 60:02d},{i % 1000:03d} INFO "
+                f"worker-{i % 8} processed request id={i * 7919 % 100003} in {i % 250} ms\n")
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines)[:size]
+
+
+def bench_read_path(sample: str, codec: str, reads: int) -> dict:
+    """Cold (decompressing) and cached read time for one payload stored in a BlobStore"""
+    store = BlobStore(spill_threshold=None, compress_threshold=0, codec=codec)
+    key = store.put(sample)
+    start = time.perf_counter()
+    store._cache.clear()
+    store.get(key)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(reads):
+        store.get(key)
+    warm = (time.perf_counter() - start) / reads
+    stats = store.stats()
+    store.close()
+    return {"cold_ms": cold * 1000, "cached_us": warm * 1e6,
+            "stored_bytes": stats["compressed_bytes"] or len(sample.encode("utf-8"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compression ratio and time per codec on clipboard text")
+    parser.add_argument("corpus", nargs="*",
+                        help="slot snapshots (e.g. clipboard_dict.json) or plain files; "
+                             "defaults to ./clipboard_dict.json plus a synthetic 20 MB log")
+    parser.add_argument("--log-mb", type=float, default=20.0)
+    args = parser.parse_args()
+
+    paths = args.corpus or [path for path in ["clipboard_dict.json"] if os.path.exists(path)]
+    samples = load_corpus(paths)
+    big = synthetic_log(int(args.log_mb * 1024 * 1024)) if not args.corpus else max(samples, key=len)
+    if not args.corpus:
+        samples.append(big)
+
+    codecs = [name for name in CODECS if name != "none"]
+    print(f"corpus: {len(samples)} entries, {sum(len(s) for s in samples)} chars")
+    for row in compression_report(samples, codecs):
+        print(f"{row['codec']:<6} ratio {row['ratio']:6.2f}x  "
+              f"{row['input_bytes']:>11} -> {row['output_bytes']:>10} bytes  "
+              f"compress {row['compress_ms']:9.1f} ms  decompress {row['decompress_ms']:8.1f} ms")
+
+    print(f"\nread path for the largest entry ({len(big)} chars):")
+    for codec in codecs:
+        result = bench_read_path(big, codec, reads=100)
+        print(f"{codec:<6} stored {result['stored_bytes']:>10} bytes  "
+              f"first read {result['cold_ms']:8.1f} ms  cached read {result['cached_us']:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+
+from shared.blob_store import BlobStore
+from shared.clipboard_manager import ClipboardManager
+from shared.control_client import ControlClient
+from shared.control_server import ControlServer
+
+
+def _run_clients(socket_path: str, clients: int, requests_per_client: int,
+                 make_request) -> float:
+    """Run concurrent clients and return the aggregate requests per second"""
+    barrier = threading.Barrier(clients + 1)
+
+    def worker(index: int):
+        with ControlClient(socket_path) as client:
+            barrier.wait()
+            for i in range(requests_per_client):
+                client.call(make_request(index, i))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return clients * requests_per_client / (time.perf_counter() - start)
+
+
+def bench_control_socket(requests_per_client: int, clients: int, size: int,
+                         batch_size: int) -> Dict[str, float]:
+    payload = ("multiclip benchmark " * (size // 20 + 1))[:size]
+    manager = ClipboardManager(num_slots=10, blob_store=BlobStore(spill_threshold=None))
+    for slot_id in range(manager.num_slots):
+        manager.store_in_slot(slot_id, f"{slot_id} {payload}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "control.sock")
+        server = ControlServer(manager, socket_path)
+        server.start()
+        try:
+            results = {
+                "get_rps": _run_clients(socket_path, clients, requests_per_client,
+                                        lambda c, i: {"op": "get", "slot": i % 10 + 1}),
+                "set_rps": _run_clients(socket_path, clients, requests_per_client,
+                                        lambda c, i: {"op": "set", "slot": i % 10 + 1,
+                                                      "content": payload}),
+                "list_rps": _run_clients(socket_path, clients, requests_per_client,
+                                         lambda c, i: {"op": "list"}),
+            }
+            batch = {"op": "batch",
+                     "requests": [{"op": "get", "slot": i % 10 + 1} for i in range(batch_size)]}
+            batches_per_second = _run_clients(socket_path, clients,
+                                              max(1, requests_per_client // batch_size),
+                                              lambda c, i: batch)
+            results["batched_get_rps"] = batches_per_second * batch_size
+        finally:
+            server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure control socket throughput")
+    parser.add_argument("--requests", type=int, default=5000, help="requests per client")
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--size", type=int, default=1024, help="slot payload size in characters")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    results = bench_control_socket(args.requests, args.clients, args.size, args.batch_size)
+    for name, rps in results.items():
+        print(f"{name:<16} {rps:12.0f} req/s  ({1e6 / rps:8.1f} us/req)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Benchmarks for the core engines on deterministic synthetic data
+    python -m benchmarks.bench_core --output results.json
+    python -m benchmarks.bench_core --compare results.json   # against an earlier commit
+Runs headless: the clipboard is in-memory and synthetic keystrokes are faked.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks import generators
+from benchmarks.fakes import FakeInput, install_fake_clipboard
+from diff_marker.diff_manager import DiffManager
+from shared import clipboard_backend as clipboard
+from shared.blob_store import BlobStore
+from shared.clipboard_manager import ClipboardManager
+from shared.config_manager import ConfigManager
+
+
+def measure(fn: Callable[[], Any], min_time: float, max_runs: int = 1000) -> Dict[str, float]:
+    """Time fn until min_time has elapsed or max_runs samples were taken
+
+    Calls faster than a millisecond are timed in batches (like timeit) so
+    timer resolution does not swamp the result; samples are per call.
+    """
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    number = max(1, min(10_000, int(0.001 / first))) if first > 0 else 10_000
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_runs and (len(samples) < 3 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered) * number,
+        "mean_ms": statistics.mean(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min_ms": ordered[0],
+    }
+
+
+class Recorder:
+    def __init__(self, min_time: float):
+        self.min_time = min_time
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self, suite: str, name: str, params: Dict[str, Any], fn: Callable[[], Any],
+            max_runs: int = 1000):
+        timing = measure(fn, self.min_time, max_runs)
+        self.results.append({"suite": suite, "name": name, "params": params, **timing})
+        shown = " ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{suite:<10} {name:<22} {shown:<32} p50 {timing['p50_ms']:10.4f} ms  "
+              f"p95 {timing['p95_ms']:10.4f} ms  ({timing['runs']} runs)")
+
+
+def bench_clipboard(recorder: Recorder, quick: bool, tmp: str):
+    fake_clipboard = install_fake_clipboard()
+    fake_input = FakeInput(fake_clipboard)
+    for size in ([100, 10_000] if quick else [100, 10_000, 1_000_000]):
+        # 64 payloads through 16 slots: every store brings content no slot currently holds
+        payloads = generators.payloads(seed=size, count=64, chars=size)
+        blob_store = BlobStore(spill_threshold=None)
+        manager = ClipboardManager(num_slots=16, blob_store=blob_store)
+        counter = iter(range(10 ** 9))
+
+        def store():
+            n = next(counter)
+            manager.store_in_slot(n % 16, payloads[n % 64])
+
+        recorder.run("clipboard", "store_in_slot", {"chars": size}, store)
+
+        def store_and_index():
+            # The full cost with the search index: the store plus the background indexing it queues
+            store()
+            manager.index.flush()
+
+        recorder.run("clipboard", "store_and_index", {"chars": size}, store_and_index)
+        recorder.run("clipboard", "get_slot_content", {"chars": size},
+                     lambda: manager.get_slot_content(next(counter) % 16))
+
+        def copy_via_hotkey():
+            # What add_to_slot does once Ctrl+C lands: read the clipboard, store it
+            n = next(counter)
+            fake_input.selection = payloads[n % 64]
+            fake_input.hotkey("ctrl", "c")
+            manager.store_in_slot(n % 16, clipboard.paste())
+
+        recorder.run("clipboard", "copy_via_hotkey", {"chars": size}, copy_via_hotkey)
+        blob_store.close()
+
+    for slots in ([10, 100] if quick else [10, 100, 1000]):
+        blob_store = BlobStore(spill_threshold=None)
+        manager = ClipboardManager(num_slots=slots, blob_store=blob_store)
+        manager.store_many({i: text for i, text in enumerate(generators.payloads(seed=slots, count=slots,
+                                                                                 chars=1000))})
+        path = os.path.join(tmp, f"state_{slots}.json")
+        recorder.run("clipboard", "save_state", {"slots": slots}, lambda: manager.save_state(path))
+        recorder.run("clipboard", "load_state", {"slots": slots}, lambda: manager.load_state(path))
+        blob_store.close()
+
+
+def bench_diff(recorder: Recorder, quick: bool):
+    manager = DiffManager()
+    sizes = [100, 1000] if quick else [100, 1000, 10_000]
+    densities = [0.01, 0.1] if quick else [0.001, 0.01, 0.1, 0.5]
+    for lines in sizes:
+        left = generators.text_lines(seed=lines, count=lines)
+        for density in densities:
+            right = generators.mutate_lines(left, density, seed=lines)
+            text1, text2 = "\n".join(left), "\n".join(right)
+            recorder.run("diff", "calculate_diff", {"lines": lines, "density": density},
+                         lambda: manager.calculate_diff(text1, text2), max_runs=50)
+
+
+def bench_snippets(recorder: Recorder, quick: bool):
+    trees = [(3, 5, 10)] if quick else [(3, 5, 10), (4, 6, 10)]
+    for depth, fanout, per_category in trees:
+        manager = generators.snippet_tree(seed=depth * 100 + fanout, depth=depth, fanout=fanout,
+                                          commands_per_category=per_category)
+        commands = generators.count_commands(manager)
+        for label, query in (("common", "a"), ("rare", "qzx"), ("miss", "no such snippet")):
+            recorder.run("snippets", "search_all_commands", {"commands": commands, "query": label},
+                         lambda: manager.search_all_commands(query), max_runs=200)
+
+
+def bench_config(recorder: Recorder, quick: bool, tmp: str):
+    config_manager = ConfigManager(config_dir=os.path.join(tmp, "config"))
+    for label, key in (("shallow", "hotkeys"), ("deep", "storage.codec"),
+                       ("missing", "behavior.no.such.key")):
+        recorder.run("config", "get", {"key": label}, lambda: config_manager.get(key))
+
+
+SUITES = {
+    "clipboard": lambda recorder, quick, tmp: bench_clipboard(recorder, quick, tmp),
+    "diff": lambda recorder, quick, tmp: bench_diff(recorder, quick),
+    "snippets": lambda recorder, quick, tmp: bench_snippets(recorder, quick),
+    "config": lambda recorder, quick, tmp: bench_config(recorder, quick, tmp),
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return f"{result['suite']}/{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(baseline: Dict[str, Any], current: List[Dict[str, Any]], threshold: float) -> int:
+    """Print p50 changes against a baseline results file; returns the number of regressions"""
+    before = {_result_key(result): result for result in baseline["results"]}
+    print(f"\ncompared with {baseline['meta'].get('commit') or 'baseline'} (threshold {threshold:.0%}):")
+    regressions = 0
+    for result in current:
+        old = before.get(_result_key(result))
+        if old is None or old["p50_ms"] <= 0:
+            continue
+        change = result["p50_ms"] / old["p50_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "faster"
+        print(f"  {_result_key(result):<70} {old['p50_ms']:10.4f} -> {result['p50_ms']:10.4f} ms "
+              f"{change:+7.1%} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the core engines on synthetic data")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="run only this suite (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="smaller grids for a fast check")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to sample each case")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative p50 change reported as a regression")
+    args = parser.parse_args()
+
+    recorder = Recorder(args.min_time)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.suite or list(SUITES):
+            SUITES[name](recorder, args.quick, tmp)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": recorder.results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if compare(baseline, recorder.results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
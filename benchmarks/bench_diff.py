@@ -0,0 +1,128 @@
+"""
+Diff algorithms compared on large synthetic inputs: runtime and output quality
+    python -m benchmarks.bench_diff
+    python -m benchmarks.bench_diff --quick --algorithm histogram --algorithm difflib
+    python -m benchmarks.bench_diff --file-mb 200   # also two 200 MB log files via DiffManager.diff_files
+Quality is the number of lines left unmatched (deleted plus inserted) and the
+number of hunks; "excess" is how many more unmatched lines an algorithm leaves
+than Myers, whose edit script is minimal.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from benchmarks import generators
+from diff_marker.algorithms import ALGORITHMS, Opcode
+from diff_marker.diff_manager import DiffManager
+
+
+def quality(opcodes: List[Opcode]) -> Dict[str, int]:
+    unmatched = hunks = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag != "equal":
+            unmatched += (i2 - i1) + (j2 - j1)
+            hunks += 1
+    return {"unmatched": unmatched, "hunks": hunks}
+
+
+def corpora(quick: bool):
+    sizes = [2_000, 10_000] if quick else [10_000, 50_000]
+    densities = [0.01, 0.1]
+    for lines in sizes:
+        for kind, make in (("text", generators.text_lines), ("log", generators.log_lines)):
+            left = make(seed=lines, count=lines)
+            for density in densities:
+                right = generators.mutate_lines(left, density, seed=lines + 1)
+                yield ({"input": kind, "lines": lines, "density": density},
+                       [line + "\n" for line in left], [line + "\n" for line in right])
+
+
+def write_log_pair(directory: str, megabytes: int):
+    """Two log files of about megabytes each: a few scattered edits and an appended tail"""
+    base = generators.log_lines(seed=7, count=20_000)
+    rng = random.Random(1)
+    paths = (os.path.join(directory, "left.log"), os.path.join(directory, "right.log"))
+    with open(paths[0], "w") as left, open(paths[1], "w") as right:
+        chunk = 0
+        while left.tell() < megabytes * 1_000_000:
+            lines = [f"{chunk:05d}-{i:05d} {line}\n" for i, line in enumerate(base)]
+            left.writelines(lines)
+            if chunk % 25 == 3:
+                lines = [line.upper() if rng.random() < 0.01 else line for line in lines]
+            right.writelines(lines)
+            chunk += 1
+        right.writelines(f"appended {i}\n" for i in range(100))
+    return paths
+
+
+def bench_files(names: List[str], megabytes: int) -> List[Dict[str, Any]]:
+    results = []
+    manager = DiffManager()
+    with tempfile.TemporaryDirectory() as tmp:
+        path1, path2 = write_log_pair(tmp, megabytes)
+        print(f"\nfiles: 2 x {os.path.getsize(path1) / 1e6:.0f} MB")
+        for name in names:
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = manager.diff_files(path1, path2, algorithm=name)
+            elapsed = (time.perf_counter() - start) * 1000
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {name:<10} {elapsed:10.1f} ms  heap peak {peak / 2 ** 20:7.1f} MiB  "
+                  f"{manager.get_diff_stats(result)}")
+            results.append({"algorithm": name, "params": {"input": "files", "megabytes": megabytes},
+                            "ms": elapsed, "heap_peak_bytes": peak})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare diff algorithms on large inputs")
+    parser.add_argument("--algorithm", action="append", choices=sorted(ALGORITHMS),
+                        help="run only this algorithm (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs for a fast check")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best is reported")
+    parser.add_argument("--file-mb", type=int, help="also diff two generated log files of this many MB")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    names = args.algorithm or list(ALGORITHMS)
+    if "myers" not in names:
+        names.append("myers")  # reference for excess edits
+    results: List[Dict[str, Any]] = []
+    for params, left, right in corpora(args.quick):
+        shown = " ".join(f"{key}={value}" for key, value in params.items())
+        print(f"\n{shown}")
+        rows = {}
+        for name in names:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                opcodes = ALGORITHMS[name](left, right)
+                best = min(best, (time.perf_counter() - start) * 1000)
+            rows[name] = {"algorithm": name, "params": params, "ms": best, **quality(opcodes)}
+        minimal = rows["myers"]["unmatched"]
+        for name in names:
+            row = rows[name]
+            row["excess"] = row["unmatched"] - minimal
+            print(f"  {name:<10} {row['ms']:10.1f} ms  unmatched {row['unmatched']:7d} "
+                  f"(excess {row['excess']:+6d})  hunks {row['hunks']:6d}")
+            results.append(row)
+
+    if args.file_mb:
+        # Timed with tracemalloc on, so slower than untraced runs
+        results.extend(bench_files(names, args.file_mb))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict
+
+from shared.slot_journal import SlotJournal
+from shared.sqlite_store import SQLiteStore
+
+
+def make_slots(count: int, size: int, seed: int = 1) -> Dict[str, str]:
+    """Deterministic word-like slot contents of roughly size characters each"""
+    rng = random.Random(seed)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+             for _ in range(2000)]
+    slots = {}
+    for i in range(count):
+        text = []
+        total = 0
+        while total < size:
+            word = rng.choice(words)
+            text.append(word)
+            total += len(word) + 1
+        slots[f"slot_{i + 1}"] = " ".join(text)[:size]
+    return slots
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Mean milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_backend(name: str, store, slots: Dict[str, str], writes: int, query: str) -> Dict[str, float]:
+    keys = list(slots)
+    store.compact(slots)
+
+    counter = iter(range(writes))
+    update = lambda: store.append_many({keys[next(counter) % len(keys)]: f"updated {time.time()}"})
+    write_ms = _time(update, writes)
+    load_ms = _time(store.load, 5)
+
+    if isinstance(store, SQLiteStore):
+        search_ms = _time(lambda: store.search(query, 20), 20)
+    else:
+        # The JSON backend has no index: load, then scan every slot
+        search_ms = _time(lambda: [key for key, value in store.load().items()
+                                   if query in value.lower()][:20], 5)
+    return {"backend": name, "write_ms": write_ms, "load_ms": load_ms, "search_ms": search_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON journal vs SQLite slot store")
+    parser.add_argument("--slots", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=2000, help="characters per slot")
+    parser.add_argument("--writes", type=int, default=200, help="single-slot changes to time")
+    parser.add_argument("--no-sync", action="store_true", help="skip fsync / use synchronous=NORMAL")
+    args = parser.parse_args()
+
+    slots = make_slots(args.slots, args.size)
+    query = next(iter(slots.values()))[100:108]
+    sync = not args.no_sync
+    print(f"{args.slots} slots x {args.size} chars, {args.writes} writes, sync={sync}, query {query!r}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SlotJournal(os.path.join(tmp, "clipboard_dict.json"), sync=sync)
+        sqlite = SQLiteStore(os.path.join(tmp, "multiclip.db"), sync=sync)
+        try:
+            for name, store in (("json", journal), ("sqlite", sqlite)):
+                result = bench_backend(name, store, slots, args.writes, query)
+                print(f"{result['backend']:<7} write {result['write_ms']:7.3f} ms  "
+                      f"load {result['load_ms']:8.2f} ms  search {result['search_ms']:8.2f} ms")
+        finally:
+            journal.close()
+            sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Headless stand-ins for the clipboard and synthetic input
+Benchmarks install these so they never touch the real clipboard, keyboard
+or X display.
+"""
+from typing import List, Tuple
+
+from shared import clipboard_backend
+from shared.clipboard_backend import MemoryClipboardBackend
+
+
+def install_fake_clipboard(content: str = "") -> MemoryClipboardBackend:
+    """Route shared.clipboard_backend.copy/paste to a process-local clipboard"""
+    backend = MemoryClipboardBackend(content)
+    clipboard_backend.set_clipboard_backend(backend)
+    return backend
+
+
+class FakeInput:
+    """pyautogui-compatible hotkey sender
+
+    Ctrl+C puts `selection` on the clipboard, as the focused app would;
+    Ctrl+V records what would have been pasted. Every call is logged in `sent`.
+    """
+
+    def __init__(self, clipboard: MemoryClipboardBackend, selection: str = ""):
+        self.clipboard = clipboard
+        self.selection = selection
+        self.PAUSE = 0.0
+        self.sent: List[Tuple[str, ...]] = []
+        self.pasted: List[str] = []
+
+    def hotkey(self, *keys: str):
+        self.sent.append(keys)
+        if keys == ("ctrl", "c"):
+            self.clipboard.copy(self.selection)
+        elif keys == ("ctrl", "v"):
+            self.pasted.append(self.clipboard.paste())
@@ -0,0 +1,97 @@
+"""
+Deterministic synthetic corpora for the benchmarks
+Every generator takes a seed, so the same arguments give the same data on
+every machine and commit.
+"""
+import random
+from typing import List
+
+from shared.snippets_manager import SnippetCategory, SnippetCommand, SnippetsManager
+
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def vocabulary(seed: int, size: int = 2000) -> List[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_ALPHABET) for _ in range(rng.randint(2, 10))) for _ in range(size)]
+
+
+def text_lines(seed: int, count: int, line_chars: int = 60) -> List[str]:
+    """count lines of word-like text, each about line_chars long"""
+    rng = random.Random(seed)
+    words = vocabulary(seed)
+    lines = []
+    for _ in range(count):
+        line = []
+        length = 0
+        while length < line_chars:
+            word = rng.choice(words)
+            line.append(word)
+            length += len(word) + 1
+        lines.append(" ".join(line))
+    return lines
+
+
+def payloads(seed: int, count: int, chars: int) -> List[str]:
+    """Clipboard-sized texts of exactly chars characters"""
+    lines_per_payload = max(1, chars // 60 + 1)
+    lines = text_lines(seed, count * lines_per_payload)
+    return ["\n".join(lines[i * lines_per_payload:(i + 1) * lines_per_payload])[:chars]
+            for i in range(count)]
+
+
+def log_lines(seed: int, count: int, templates: int = 40) -> List[str]:
+    """Repetitive log-like lines: a few templates, most lines recurring many times"""
+    rng = random.Random(seed)
+    words = vocabulary(seed)
+    shapes = [" ".join(rng.choice(words) for _ in range(rng.randint(3, 7))) for _ in range(templates)]
+    levels = ("INFO", "INFO", "INFO", "DEBUG", "WARN")
+    return [f"{rng.choice(levels)} {rng.choice(shapes)} status={rng.choice((200, 200, 200, 404, 500))}"
+            for _ in range(count)]
+
+
+def mutate_lines(lines: List[str], density: float, seed: int) -> List[str]:
+    """Copy of lines with about density * len(lines) edits, mixed between replace, insert and delete"""
+    rng = random.Random(seed)
+    words = vocabulary(seed + 1)
+    edits = set(rng.sample(range(len(lines)), min(len(lines), max(1, round(len(lines) * density)))))
+    result = []
+    for i, line in enumerate(lines):
+        if i not in edits:
+            result.append(line)
+            continue
+        kind = rng.random()
+        if kind < 0.5:
+            result.append(line + " " + rng.choice(words))
+        elif kind < 0.75:
+            result.append(line)
+            result.append(" ".join(rng.choice(words) for _ in range(8)))
+        # else: deleted
+    return result
+
+
+def snippet_tree(seed: int, depth: int, fanout: int, commands_per_category: int) -> SnippetsManager:
+    """SnippetsManager with fanout root categories, each nested depth levels with fanout children"""
+    rng = random.Random(seed)
+    words = vocabulary(seed)
+
+    def build(name: str, level: int, parent=None) -> SnippetCategory:
+        category = SnippetCategory(name, parent)
+        for _ in range(commands_per_category):
+            content = " ".join(rng.choice(words) for _ in range(rng.randint(3, 8)))
+            description = " ".join(rng.choice(words) for _ in range(rng.randint(2, 6)))
+            category.add_command(SnippetCommand(content, description))
+        if level < depth:
+            for i in range(fanout):
+                category.add_subcategory(build(f"{name}.{i}", level + 1, category))
+        return category
+
+    manager = SnippetsManager()
+    manager.root_categories = [build(f"cat{i}", 1) for i in range(fanout)]
+    return manager
+
+
+def count_commands(manager: SnippetsManager) -> int:
+    def walk(category: SnippetCategory) -> int:
+        return len(category.commands) + sum(walk(sub) for sub in category.subcategories)
+    return sum(walk(category) for category in manager.root_categories)
@@ -0,0 +1,357 @@
+"""
+Line diff algorithms behind DiffManager
+Every algorithm maps two line sequences to difflib-style opcodes
+(tag, i1, i2, j1, j2), so results render the same whichever one ran.
+"""
+import difflib
+from array import array
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+Opcode = Tuple[str, int, int, int, int]
+Block = Tuple[int, int, int]  # (i, j, size): a[i:i + size] == b[j:j + size]
+
+# Histogram diff gives up on lines occurring more often than this and falls back to Myers
+MAX_CHAIN = 64
+
+
+def _intern(a: Sequence[str], b: Sequence[str]) -> Tuple[List[int], List[int]]:
+    """Replace lines by small ints so comparisons and hashing are cheap"""
+    ids: Dict[str, int] = {}
+    return ([ids.setdefault(line, len(ids)) for line in a],
+            [ids.setdefault(line, len(ids)) for line in b])
+
+
+def _discard_unmatched(a: Sequence[int], b: Sequence[int]) -> Tuple[array, array, array, array]:
+    """Drop lines that do not occur on the other side at all
+
+    They can never be part of a match, so the result is unchanged, but each
+    one would otherwise be an edit the algorithms have to search around;
+    a typical edit (a changed line) disappears entirely. Returns the reduced
+    sequences and the original index of each kept line, as typed arrays so
+    million-line inputs stay at a few bytes per line.
+    """
+    in_b = set(b)
+    a_index = array('Q', (i for i, line in enumerate(a) if line in in_b))
+    del in_b
+    in_a = set(a)
+    b_index = array('Q', (j for j, line in enumerate(b) if line in in_a))
+    del in_a
+    return (array('q', (a[i] for i in a_index)), array('q', (b[j] for j in b_index)),
+            a_index, b_index)
+
+
+def _restore(blocks: List[Block], a_index: List[int], b_index: List[int]) -> List[Block]:
+    """Map blocks over the reduced sequences back to original positions, splitting at discarded lines"""
+    restored: List[Block] = []
+    for i, j, size in blocks:
+        for k in range(size):
+            oi, oj = a_index[i + k], b_index[j + k]
+            if restored:
+                pi, pj, psize = restored[-1]
+                if pi + psize == oi and pj + psize == oj:
+                    restored[-1] = (pi, pj, psize + 1)
+                    continue
+            restored.append((oi, oj, 1))
+    return restored
+
+
+def _trim(a: Sequence[int], b: Sequence[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int,
+          blocks: List[Block]) -> Tuple[int, int, int, int]:
+    """Match the common prefix and suffix of a region; returns what is left"""
+    start = a_lo
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        a_lo += 1
+        b_lo += 1
+    if a_lo > start:
+        blocks.append((start, b_lo - (a_lo - start), a_lo - start))
+    end = a_hi
+    while a_hi > a_lo and b_hi > b_lo and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+    if a_hi < end:
+        blocks.append((a_hi, b_hi, end - a_hi))
+    return a_lo, a_hi, b_lo, b_hi
+
+
+def _middle_snake(a: Sequence[int], b: Sequence[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int
+                  ) -> Tuple[int, int, int, int]:
+    """Myers' middle snake: the diagonal run halfway along a shortest edit script
+
+    Searches forward from the start and backward from the end at once and
+    returns (x, y, u, v), the snake from (x, y) to (u, v), where the paths
+    meet. Only two arrays of furthest reaching x per diagonal are kept, so
+    space is linear. Both regions must be non-empty.
+    """
+    n, m = a_hi - a_lo, b_hi - b_lo
+    delta = n - m
+    odd = delta & 1
+    size = (n + m + 1) // 2 + 2
+    # Indexed by diagonal k = x - y; negative k wraps to the end of the list
+    forward = [0] * (2 * size + 1)
+    backward = [0] * (2 * size + 1)
+    for d in range((n + m + 1) // 2 + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[k - 1] < forward[k + 1]):
+                x = forward[k + 1]
+            else:
+                x = forward[k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            forward[k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + backward[delta - k] >= n:
+                return a_lo + x0, b_lo + y0, a_lo + x, b_lo + y
+        for k in range(-d, d + 1, 2):
+            # x and y count back from the end of the region
+            if k == -d or (k != d and backward[k - 1] < backward[k + 1]):
+                x = backward[k + 1]
+            else:
+                x = backward[k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            backward[k] = x
+            if not odd and -d <= delta - k <= d and x + forward[delta - k] >= n:
+                return a_hi - x, b_hi - y, a_hi - x0, b_hi - y0
+    raise AssertionError("middle snake not found")
+
+
+def _myers(a: Sequence[int], b: Sequence[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int,
+           blocks: List[Block]):
+    """Linear-space Myers: split at the middle snake and solve both halves"""
+    regions = [(a_lo, a_hi, b_lo, b_hi)]
+    while regions:
+        a_lo, a_hi, b_lo, b_hi = _trim(a, b, *regions.pop(), blocks)
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+        x, y, u, v = _middle_snake(a, b, a_lo, a_hi, b_lo, b_hi)
+        if u > x:
+            blocks.append((x, y, u - x))
+        regions.append((a_lo, x, b_lo, y))
+        regions.append((u, a_hi, v, b_hi))
+
+
+def _longest_increasing(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Patience sorting: longest run of pairs increasing in both i and j (pairs sorted by i)"""
+    tails: List[int] = []  # index into pairs of the smallest tail of each pile
+    back = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if pairs[tails[mid]][1] < j:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo:
+            back[index] = tails[lo - 1]
+        if lo == len(tails):
+            tails.append(index)
+        else:
+            tails[lo] = index
+    result = []
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        result.append(pairs[index])
+        index = back[index]
+    result.reverse()
+    return result
+
+
+def _patience(a: Sequence[int], b: Sequence[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int,
+              blocks: List[Block]):
+    """Anchor on lines unique to both sides, in order, and diff the gaps between them
+
+    Gaps with no unique common line are left to Myers.
+    """
+    regions = [(a_lo, a_hi, b_lo, b_hi)]
+    while regions:
+        a_lo, a_hi, b_lo, b_hi = _trim(a, b, *regions.pop(), blocks)
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+        counts: Dict[int, List[int]] = {}
+        for i in range(a_lo, a_hi):
+            entry = counts.get(a[i])
+            if entry is None:
+                counts[a[i]] = [1, 0, i, 0]  # count in a, count in b, index in a, index in b
+            else:
+                entry[0] += 1
+        for j in range(b_lo, b_hi):
+            entry = counts.get(b[j])
+            if entry is not None:
+                entry[1] += 1
+                entry[3] = j
+        pairs = sorted((i, j) for count_a, count_b, i, j in counts.values() if count_a == 1 and count_b == 1)
+        anchors = _longest_increasing(pairs)
+        if not anchors:
+            _myers(a, b, a_lo, a_hi, b_lo, b_hi, blocks)
+            continue
+        prev_i, prev_j = a_lo, b_lo
+        for i, j in anchors:
+            regions.append((prev_i, i, prev_j, j))
+            blocks.append((i, j, 1))
+            prev_i, prev_j = i + 1, j + 1
+        regions.append((prev_i, a_hi, prev_j, b_hi))
+
+
+def _histogram(a: Sequence[int], b: Sequence[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int,
+               blocks: List[Block]):
+    """git's histogram diff: split around the longest common run built on the rarest lines
+
+    Each region counts its lines in a, then every line of b that occurs in a
+    at most as often as the best candidate so far seeds a match, extended in
+    both directions. The run with the lowest occurrence count wins (longer
+    breaks ties); both sides of it are diffed the same way. Regions where every
+    common line is more frequent than MAX_CHAIN go to Myers.
+    """
+    regions = [(a_lo, a_hi, b_lo, b_hi)]
+    while regions:
+        a_lo, a_hi, b_lo, b_hi = _trim(a, b, *regions.pop(), blocks)
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+        positions: Dict[int, List[int]] = {}
+        for i in range(a_lo, a_hi):
+            positions.setdefault(a[i], []).append(i)
+
+        best = None  # (a start, b start, length)
+        best_count = MAX_CHAIN
+        j = b_lo
+        while j < b_hi:
+            occurrences = positions.get(b[j])
+            next_j = j + 1
+            if occurrences is None or len(occurrences) > best_count:
+                j = next_j
+                continue
+            for i in occurrences:
+                start_i, start_j = i, j
+                while start_i > a_lo and start_j > b_lo and a[start_i - 1] == b[start_j - 1]:
+                    start_i -= 1
+                    start_j -= 1
+                end_i, end_j = i + 1, j + 1
+                while end_i < a_hi and end_j < b_hi and a[end_i] == b[end_j]:
+                    end_i += 1
+                    end_j += 1
+                count = min(len(positions[a[k]]) for k in range(start_i, end_i))
+                if best is None or count < best_count or (count == best_count and end_i - start_i > best[2]):
+                    best = (start_i, start_j, end_i - start_i)
+                    best_count = count
+                next_j = max(next_j, end_j)
+            j = next_j
+
+        if best is None:
+            if any(line in positions for line in b[b_lo:b_hi]):
+                _myers(a, b, a_lo, a_hi, b_lo, b_hi, blocks)
+            continue
+        i, j, size = best
+        blocks.append(best)
+        regions.append((a_lo, i, b_lo, j))
+        regions.append((i + size, a_hi, j + size, b_hi))
+
+
+def _blocks_to_opcodes(blocks: List[Block], n: int, m: int) -> List[Opcode]:
+    """Same tagging as SequenceMatcher.get_opcodes(): gaps on both sides are a replace"""
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in sorted(blocks) + [(n, m, 0)]:
+        tag = ""
+        if i < ai and j < bj:
+            tag = "replace"
+        elif i < ai:
+            tag = "delete"
+        elif j < bj:
+            tag = "insert"
+        if tag:
+            opcodes.append((tag, i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            if opcodes and opcodes[-1][0] == "equal":
+                _, i1, _, j1, _ = opcodes.pop()
+                opcodes.append(("equal", i1, i, j1, j))
+            else:
+                opcodes.append(("equal", ai, i, bj, j))
+    return opcodes
+
+
+def _run(search: Callable) -> Callable[[Sequence[str], Sequence[str]], List[Opcode]]:
+    def diff(a: Sequence, b: Sequence) -> List[Opcode]:
+        # Integer arrays (line hashes from file_diff) already compare cheaply
+        a_ids, b_ids = (a, b) if isinstance(a, array) and isinstance(b, array) else _intern(a, b)
+        a_kept, b_kept, a_index, b_index = _discard_unmatched(a_ids, b_ids)
+        blocks: List[Block] = []
+        search(a_kept, b_kept, 0, len(a_kept), 0, len(b_kept), blocks)
+        return _blocks_to_opcodes(_restore(sorted(blocks), a_index, b_index), len(a), len(b))
+    return diff
+
+
+def _difflib(a: Sequence[str], b: Sequence[str]) -> List[Opcode]:
+    return difflib.SequenceMatcher(None, a, b).get_opcodes()
+
+
+# name -> opcodes(a, b); "difflib" is SequenceMatcher with its usual junk heuristic
+ALGORITHMS: Dict[str, Callable[[Sequence[str], Sequence[str]], List[Opcode]]] = {
+    "histogram": _run(_histogram),
+    "patience": _run(_patience),
+    "myers": _run(_myers),
+    "difflib": _difflib,
+}
+
+DEFAULT_ALGORITHM = "histogram"
+
+
+def get_opcodes(a: Sequence[str], b: Sequence[str], algorithm: str = DEFAULT_ALGORITHM) -> List[Opcode]:
+    try:
+        diff = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown diff algorithm: {algorithm}")
+    return diff(a, b)
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff range, as difflib writes it"""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        start -= 1
+    return f"{start + 1},{length}"
+
+
+def group_opcodes(opcodes: List[Opcode], n: int = 3) -> List[List[Opcode]]:
+    """Hunks of changes with n lines of context, as SequenceMatcher.get_grouped_opcodes()"""
+    matcher = difflib.SequenceMatcher(None, (), ())
+    matcher.opcodes = list(opcodes)  # get_grouped_opcodes() reads (and edits) the cached opcodes
+    return list(matcher.get_grouped_opcodes(n))
+
+
+def unified_diff(a: Sequence[str], b: Sequence[str], opcodes: List[Opcode], fromfile: str = "",
+                 tofile: str = "", n: int = 3, lineterm: str = "\n") -> Iterator[str]:
+    """difflib.unified_diff output for precomputed opcodes"""
+    return unified_hunks(a, b, group_opcodes(opcodes, n), fromfile, tofile, lineterm)
+
+
+def unified_hunks(a: Sequence[str], b: Sequence[str], groups: List[List[Opcode]], fromfile: str = "",
+                  tofile: str = "", lineterm: str = "\n") -> Iterator[str]:
+    """Unified diff lines for already grouped opcodes (see group_opcodes)"""
+    started = False
+    for group in groups:
+        if not started:
+            started = True
+            yield f"--- {fromfile}{lineterm}"
+            yield f"+++ {tofile}{lineterm}"
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@{lineterm}"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield " " + line
+                continue
+            if tag in ("replace", "delete"):
+                for line in a[i1:i2]:
+                    yield "-" + line
+            if tag in ("replace", "insert"):
+                for line in b[j1:j2]:
+                    yield "+" + line
@@ -1,7 +1,10 @@
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from typing import Optional, Callable
-import pyperclip
+from shared import clipboard_backend as clipboard
+from .algorithms import ALGORITHMS
 from .diff_manager import DiffManager
 from .diff_types import DiffResult, DiffType
 
@@ -35,11 +38,19 @@ class DiffInterface(ttk.Frame):
         ttk.Radiobutton(toolbar, text="Unified", variable=self.view_mode,
                        value="unified", command=self._refresh_diff_display).pack(side='left')
         
+        # Diff algorithm, chosen per comparison
+        ttk.Label(toolbar, text="Algorithm:").pack(side='left', padx=(15, 0))
+        self.algorithm = tk.StringVar(value=self.diff_manager.algorithm)
+        ttk.Combobox(toolbar, textvariable=self.algorithm, values=list(ALGORITHMS),
+                     state='readonly', width=10).pack(side='left', padx=5)
+        
         # Action buttons
         btn_frame = ttk.Frame(toolbar)
         btn_frame.pack(side='right')
         
         ttk.Button(btn_frame, text="Compare", command=self._perform_diff).pack(side='left', padx=2)
+        ttk.Button(btn_frame, text="Files...", command=self._compare_files).pack(side='left', padx=2)
+        ttk.Button(btn_frame, text="Slot vs File...", command=self._compare_slot_with_file).pack(side='left', padx=2)
         ttk.Button(btn_frame, text="Clear", command=self._clear_all).pack(side='left', padx=2)
         ttk.Button(btn_frame, text="Save Result", command=self._save_result).pack(side='left', padx=2)
         
@@ -202,11 +213,7 @@ class DiffInterface(ttk.Frame):
         slot_listbox.pack(side='left', fill='both', expand=True)
         slot_scroll.pack(side='right', fill='y')
         
-        # Populate slots
-        for i in range(10):
-            content = self.clipboard_manager.get_slot_content(i)
-            preview = content[:50] + "..." if content and len(content) > 50 else content or "(empty)"
-            slot_listbox.insert('end', f"Slot {i}: {preview}")
+        self._populate_slot_listbox(slot_listbox)
         
         def load_selected():
             selection = slot_listbox.curselection()
@@ -223,10 +230,18 @@ class DiffInterface(ttk.Frame):
         ttk.Button(slot_dialog, text="Load", command=load_selected).pack(pady=5)
         ttk.Button(slot_dialog, text="Cancel", command=slot_dialog.destroy).pack()
     
+    def _populate_slot_listbox(self, slot_listbox: tk.Listbox):
+        """Fill a listbox with one line per slot; the line index is the slot id"""
+        for i in range(self.clipboard_manager.num_slots):
+            preview = self.clipboard_manager.get_slot_preview(i) or "(empty)"
+            name = self.clipboard_manager.get_slot_name(i)
+            label = f"Slot {i} ({name})" if name else f"Slot {i}"
+            slot_listbox.insert('end', f"{label}: {preview}")
+    
     def _paste_content(self, panel: str):
         """Paste content from system clipboard"""
         try:
-            content = pyperclip.paste()
+            content = clipboard.paste()
             target_text = self.left_text if panel == 'left' else self.right_text
             target_text.delete('1.0', 'end')
             target_text.insert('1.0', content)
@@ -260,7 +275,10 @@ class DiffInterface(ttk.Frame):
         
         try:
             self._update_status("Calculating differences...")
-            self.current_diff_result = self.diff_manager.calculate_diff(text1, text2)
+            algorithm = self.algorithm.get()
+            started = time.perf_counter()
+            self.current_diff_result = self.diff_manager.calculate_diff(text1, text2, algorithm=algorithm)
+            elapsed_ms = (time.perf_counter() - started) * 1000
             
             # Update stats
             stats_text = self.diff_manager.get_diff_stats(self.current_diff_result)
@@ -272,12 +290,106 @@ class DiffInterface(ttk.Frame):
             # Switch to result tab
             self.notebook.select(self.result_tab)
             
-            self._update_status("Diff comparison completed")
+            self._update_status(f"Diff comparison completed ({algorithm}, {elapsed_ms:.0f} ms)")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to calculate diff: {str(e)}")
             self._update_status("Diff calculation failed")
     
+    def _compare_files(self):
+        """Diff two files of any size without loading them into the text panels"""
+        path1 = filedialog.askopenfilename(parent=self, title="First file")
+        if not path1:
+            return
+        path2 = filedialog.askopenfilename(parent=self, title="Second file")
+        if not path2:
+            return
+        algorithm = self.algorithm.get()
+        self._run_file_diff(lambda: self.diff_manager.diff_files(path1, path2, algorithm=algorithm),
+                            f"{path1} vs {path2}", algorithm)
+    
+    def _compare_slot_with_file(self):
+        """Diff a slot's content against a file"""
+        if not self.clipboard_manager:
+            messagebox.showwarning("Warning", "Clipboard manager not available")
+            return
+        
+        slot_dialog = tk.Toplevel(self)
+        slot_dialog.title("Select Slot")
+        slot_dialog.geometry("300x400")
+        slot_dialog.transient(self)
+        slot_dialog.grab_set()
+        
+        ttk.Label(slot_dialog, text="Select a slot to compare:", 
+                 font=('Arial', 11, 'bold')).pack(pady=10)
+        
+        listbox_frame = ttk.Frame(slot_dialog)
+        listbox_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        slot_listbox = tk.Listbox(listbox_frame, font=('Consolas', 9))
+        slot_scroll = ttk.Scrollbar(listbox_frame, orient='vertical', 
+                                   command=slot_listbox.yview)
+        
+        slot_listbox.configure(yscrollcommand=slot_scroll.set)
+        slot_listbox.pack(side='left', fill='both', expand=True)
+        slot_scroll.pack(side='right', fill='y')
+        
+        self._populate_slot_listbox(slot_listbox)
+        
+        def choose_file():
+            selection = slot_listbox.curselection()
+            if not selection:
+                return
+            slot_id = selection[0]
+            slot_dialog.destroy()
+            content = self.clipboard_manager.get_slot_content(slot_id)
+            if not content:
+                messagebox.showwarning("Warning", f"Slot {slot_id} is empty")
+                return
+            path = filedialog.askopenfilename(parent=self, title=f"Compare slot {slot_id} with")
+            if not path:
+                return
+            algorithm = self.algorithm.get()
+            self._run_file_diff(
+                lambda: self.diff_manager.diff_text_with_file(content, path, algorithm=algorithm,
+                                                              label=f"Slot {slot_id}"),
+                f"slot {slot_id} vs {path}", algorithm)
+        
+        ttk.Button(slot_dialog, text="Choose File...", command=choose_file).pack(pady=5)
+        ttk.Button(slot_dialog, text="Cancel", command=slot_dialog.destroy).pack()
+    
+    def _run_file_diff(self, task: Callable, description: str, algorithm: str):
+        """Run a file diff on a worker thread and show the result when it finishes"""
+        outcome = {}
+        started = time.perf_counter()
+        
+        def work():
+            try:
+                outcome["result"] = task()
+            except Exception as e:
+                outcome["error"] = e
+        
+        worker = threading.Thread(target=work, name="file-diff", daemon=True)
+        worker.start()
+        self._update_status(f"Comparing {description}...")
+        
+        def poll():
+            if worker.is_alive():
+                self.after(50, poll)
+                return
+            if "error" in outcome:
+                messagebox.showerror("Error", f"Failed to compare files: {outcome['error']}")
+                self._update_status("File comparison failed")
+                return
+            self.current_diff_result = outcome["result"]
+            self.stats_var.set(self.diff_manager.get_diff_stats(self.current_diff_result))
+            self._refresh_diff_display()
+            self.notebook.select(self.result_tab)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._update_status(f"Compared {description} ({algorithm}, {elapsed_ms:.0f} ms)")
+        
+        self.after(50, poll)
+    
     def _refresh_diff_display(self):
         """Refresh the diff display based on current view mode"""
         if not self.current_diff_result:
@@ -347,20 +459,32 @@ class DiffInterface(ttk.Frame):
         # Create slot selection dialog
         slot_dialog = tk.Toplevel(self)
         slot_dialog.title("Save to Slot")
-        slot_dialog.geometry("300x200")
+        slot_dialog.geometry("300x400")
         slot_dialog.transient(self)
         slot_dialog.grab_set()
         
         ttk.Label(slot_dialog, text="Select slot to save diff result:", 
                  font=('Arial', 11, 'bold')).pack(pady=10)
         
-        slot_var = tk.IntVar(value=0)
-        for i in range(10):
-            ttk.Radiobutton(slot_dialog, text=f"Slot {i}", 
-                           variable=slot_var, value=i).pack(anchor='w', padx=20)
+        listbox_frame = ttk.Frame(slot_dialog)
+        listbox_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        slot_listbox = tk.Listbox(listbox_frame, font=('Consolas', 9))
+        slot_scroll = ttk.Scrollbar(listbox_frame, orient='vertical', 
+                                   command=slot_listbox.yview)
+        
+        slot_listbox.configure(yscrollcommand=slot_scroll.set)
+        slot_listbox.pack(side='left', fill='both', expand=True)
+        slot_scroll.pack(side='right', fill='y')
+        
+        self._populate_slot_listbox(slot_listbox)
+        slot_listbox.selection_set(0)
         
         def save_to_slot():
-            slot_id = slot_var.get()
+            selection = slot_listbox.curselection()
+            if not selection:
+                return
+            slot_id = selection[0]
             success = self.clipboard_manager.store_in_slot(slot_id, result_content)
             if success:
                 self._update_status(f"Diff result saved to slot {slot_id}")
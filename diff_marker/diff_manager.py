@@ -1,47 +1,56 @@
-import difflib
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from shared.action_profiler import profiled
+from .algorithms import DEFAULT_ALGORITHM, Opcode, get_opcodes, group_opcodes, unified_diff, unified_hunks
 from .diff_types import DiffResult, DiffLine, DiffType
+from .file_diff import LineIndex, line_opcodes, map_file
 
 class DiffManager:
-    def __init__(self):
-        self.max_text_size = 1000000  # 1MB limit
+    def __init__(self, algorithm: str = DEFAULT_ALGORITHM, max_rows: int = 50000):
+        # Texts longer than this are diffed by line hash and shown as hunks with context only
+        self.full_view_chars = 1000000
+        self.algorithm = algorithm  # default for calculate_diff; see algorithms.ALGORITHMS
+        self.max_rows = max_rows  # side-by-side rows kept for hunk views; later hunks are counted, not shown
         
-    def calculate_diff(self, text1: str, text2: str, context_lines: int = 3) -> DiffResult:
-        """Calculate differences between two texts"""
+    @profiled("calculate_diff")
+    def calculate_diff(self, text1: str, text2: str, context_lines: int = 3,
+                       algorithm: Optional[str] = None) -> DiffResult:
+        """Calculate differences between two texts with the given (or the default) algorithm"""
         
-        # Validate input size
-        if len(text1) > self.max_text_size or len(text2) > self.max_text_size:
-            raise ValueError(f"Text size exceeds maximum limit of {self.max_text_size} characters")
+        if len(text1) > self.full_view_chars or len(text2) > self.full_view_chars:
+            return self._diff_indexes(LineIndex(text1.encode('utf-8', 'surrogatepass')),
+                                      LineIndex(text2.encode('utf-8', 'surrogatepass')),
+                                      'Text 1', 'Text 2', context_lines, algorithm)
         
         # Split into lines
         lines1 = text1.splitlines(keepends=True)
         lines2 = text2.splitlines(keepends=True)
         
+        # One line comparison feeds both views
+        opcodes = get_opcodes(lines1, lines2, algorithm or self.algorithm)
+        
         # Generate unified diff
-        unified_diff = '\n'.join(difflib.unified_diff(
-            lines1, lines2,
+        unified = '\n'.join(unified_diff(
+            lines1, lines2, opcodes,
             fromfile='Text 1',
             tofile='Text 2',
             n=context_lines
         ))
         
         # Generate side-by-side diff data
-        diff_lines = self._generate_side_by_side_diff(lines1, lines2)
+        diff_lines = self._generate_side_by_side_diff(lines1, lines2, opcodes)
         
         return DiffResult(
             lines=diff_lines,
             stats={},  # Will be calculated in __post_init__
-            unified_diff=unified_diff
+            unified_diff=unified
         )
     
-    def _generate_side_by_side_diff(self, lines1: List[str], lines2: List[str]) -> List[DiffLine]:
+    def _generate_side_by_side_diff(self, lines1: List[str], lines2: List[str],
+                                    opcodes: List[Opcode]) -> List[DiffLine]:
         """Generate side-by-side diff representation"""
         diff_lines = []
         
-        # Use SequenceMatcher for detailed comparison
-        matcher = difflib.SequenceMatcher(None, lines1, lines2)
-        
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in opcodes:
             if tag == 'equal':
                 # Lines are identical
                 for i in range(i1, i2):
@@ -92,6 +101,73 @@ class DiffManager:
         
         return diff_lines
     
+    @profiled("diff_files")
+    def diff_files(self, path1: str, path2: str, context_lines: int = 3,
+                   algorithm: Optional[str] = None) -> DiffResult:
+        """Diff two files of any size through memory maps; the result holds only the hunks"""
+        with map_file(path1) as buffer1, map_file(path2) as buffer2:
+            return self._diff_indexes(LineIndex(buffer1), LineIndex(buffer2),
+                                      path1, path2, context_lines, algorithm)
+    
+    @profiled("diff_files")
+    def diff_text_with_file(self, text: str, path: str, context_lines: int = 3,
+                            algorithm: Optional[str] = None, label: str = 'Slot') -> DiffResult:
+        """Diff a text (such as a slot's content) against a file, as diff_files does"""
+        with map_file(path) as buffer:
+            return self._diff_indexes(LineIndex(text.encode('utf-8', 'surrogatepass')), LineIndex(buffer),
+                                      label, path, context_lines, algorithm)
+    
+    def _diff_indexes(self, left: LineIndex, right: LineIndex, left_name: str, right_name: str,
+                      context_lines: int, algorithm: Optional[str]) -> DiffResult:
+        """Hunks-only result for indexed inputs; lines are decoded only for the rows kept"""
+        opcodes = line_opcodes(left, right, algorithm or self.algorithm)
+        
+        stats = {'additions': 0, 'deletions': 0, 'modifications': 0, 'total_lines': 0}
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == 'insert':
+                stats['additions'] += j2 - j1
+            elif tag == 'delete':
+                stats['deletions'] += i2 - i1
+            elif tag == 'replace':
+                stats['modifications'] += max(i2 - i1, j2 - j1)
+            stats['total_lines'] += max(i2 - i1, j2 - j1)
+        
+        groups = group_opcodes(opcodes, context_lines)
+        shown = []
+        diff_lines: List[DiffLine] = []
+        complete = 0
+        for group in groups:
+            budget = self.max_rows - len(diff_lines)
+            if budget <= 0:
+                break
+            if diff_lines:
+                # Mark the unchanged stretch between hunks
+                diff_lines.append(DiffLine(None, None, "...", "...", DiffType.EQUAL))
+            clipped = self._clip_group(group, budget)
+            diff_lines.extend(self._generate_side_by_side_diff(left, right, clipped))
+            shown.append(clipped)
+            if clipped == group:
+                complete += 1
+        stats['hidden_hunks'] = len(groups) - complete
+        
+        unified = '\n'.join(unified_hunks(left, right, shown, fromfile=left_name, tofile=right_name))
+        if stats['hidden_hunks']:
+            unified += f"\n... {stats['hidden_hunks']} hunks not shown in full ({self.max_rows} row limit)"
+        return DiffResult(lines=diff_lines, stats=stats, unified_diff=unified)
+    
+    @staticmethod
+    def _clip_group(group: List[Opcode], rows: int) -> List[Opcode]:
+        """The first rows side-by-side rows of a hunk"""
+        clipped = []
+        for tag, i1, i2, j1, j2 in group:
+            size = max(i2 - i1, j2 - j1)
+            if size >= rows:
+                clipped.append((tag, i1, min(i2, i1 + rows), j1, min(j2, j1 + rows)))
+                break
+            clipped.append((tag, i1, i2, j1, j2))
+            rows -= size
+        return clipped
+    
     def format_unified_diff(self, diff_result: DiffResult) -> str:
         """Return formatted unified diff"""
         return diff_result.unified_diff
@@ -99,5 +175,8 @@ class DiffManager:
     def get_diff_stats(self, diff_result: DiffResult) -> str:
         """Return formatted diff statistics"""
         stats = diff_result.stats
-        return (f"Changes: +{stats['additions']} -{stats['deletions']} "
-                f"~{stats['modifications']} (Total: {stats['total_lines']} lines)")
\ No newline at end of file
+        text = (f"Changes: +{stats['additions']} -{stats['deletions']} "
+                f"~{stats['modifications']} (Total: {stats['total_lines']} lines)")
+        if stats.get('hidden_hunks'):
+            text += f", {stats['hidden_hunks']} hunks not shown in full"
+        return text
\ No newline at end of file
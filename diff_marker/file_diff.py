@@ -0,0 +1,138 @@
+"""
+Line-hash diffing for inputs too large to hold as lists of lines
+Files are memory-mapped; only the lines shown in the result are decoded.
+"""
+import io
+import mmap
+import os
+from array import array
+from contextlib import contextmanager
+from typing import Iterator, List, Union
+
+from .algorithms import Opcode, get_opcodes
+
+Buffer = Union[bytes, mmap.mmap]
+
+# Hash slices compared at a time while skipping runs of equal lines
+_CHUNK = 4096
+
+# Lines diffed at a time around a mismatch, growing up to MAX_WINDOW until the inputs resync
+WINDOW = 1 << 14
+MAX_WINDOW = 1 << 20
+
+# An equal run at least this long inside a window is trusted as a resync point
+SYNC_LINES = 16
+
+
+class LineIndex:
+    """Read-only sequence of the lines in a buffer, backed by offsets and hashes
+
+    offsets[i]:offsets[i + 1] is line i including its newline, and hashes[i]
+    is hash() of those bytes. Diffing compares the hashes; indexing or
+    slicing decodes just the lines asked for, so a file costs 16 bytes per
+    line rather than a str per line.
+    """
+
+    def __init__(self, buffer: Buffer, encoding: str = "utf-8"):
+        self.buffer = buffer
+        self.encoding = encoding
+        self.offsets = array('Q', [0])
+        self.hashes = array('q')
+        reader = buffer if isinstance(buffer, mmap.mmap) else io.BytesIO(buffer)
+        reader.seek(0)
+        position = 0
+        add_offset, add_hash = self.offsets.append, self.hashes.append
+        for line in iter(reader.readline, b""):
+            position += len(line)
+            add_offset(position)
+            add_hash(hash(line))
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode(self.encoding, "replace")
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Buffer]:
+    """Read-only memory map of path (empty bytes for an empty file, which cannot be mapped)"""
+    with open(os.path.expanduser(path), "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _equal_run(a: array, b: array, i: int, j: int) -> int:
+    """Number of equal hashes in a[i:] and b[j:] before the first difference"""
+    limit = min(len(a) - i, len(b) - j)
+    k = 0
+    while k < limit:
+        step = min(limit - k, _CHUNK)
+        if a[i + k:i + k + step] != b[j + k:j + k + step]:
+            while a[i + k] == b[j + k]:
+                k += 1
+            return k
+        k += step
+    return limit
+
+
+def line_opcodes(left: LineIndex, right: LineIndex, algorithm: str, window: int = WINDOW) -> List[Opcode]:
+    """Opcodes between two indexed inputs, in memory bounded by the window size
+
+    Runs of equal lines are skipped by comparing hash arrays in chunks. At a
+    difference, the algorithm diffs the next window lines of each side; the
+    edits before the last equal run of SYNC_LINES or more are kept and the
+    walk resumes at that run, since the window edge may have cut it short.
+    A window with no such run is doubled (a long insertion or rewrite), up to
+    MAX_WINDOW, after which its edits are kept as they are. Inputs that fit
+    in one window get exactly the algorithm's result.
+    """
+    a, b = left.hashes, right.hashes
+    n, m = len(a), len(b)
+    opcodes: List[Opcode] = []
+
+    def add(tag: str, i1: int, i2: int, j1: int, j2: int):
+        if opcodes and tag == "equal" and opcodes[-1][0] == "equal":
+            _, p1, _, q1, _ = opcodes.pop()
+            i1, j1 = p1, q1
+        opcodes.append((tag, i1, i2, j1, j2))
+
+    i = j = 0
+    while i < n or j < m:
+        run = _equal_run(a, b, i, j)
+        if run:
+            add("equal", i, i + run, j, j + run)
+            i, j = i + run, j + run
+            continue
+        if i == n or j == m:
+            # One side is used up: the rest of the other is a plain insertion or deletion
+            add("insert" if i == n else "delete", i, n, j, m)
+            break
+        size = window
+        while True:
+            a_hi, b_hi = min(n, i + size), min(m, j + size)
+            window_ops = get_opcodes(a[i:a_hi], b[j:b_hi], algorithm)
+            final = a_hi == n and b_hi == m
+            cut = len(window_ops)
+            if not final:
+                cut = next((k for k in range(len(window_ops) - 1, 0, -1)
+                            if window_ops[k][0] == "equal" and window_ops[k][2] - window_ops[k][1] >= SYNC_LINES),
+                           None)
+                if cut is None and size < MAX_WINDOW:
+                    size *= 2
+                    continue
+                if cut is None:
+                    cut = len(window_ops)
+            for tag, i1, i2, j1, j2 in window_ops[:cut]:
+                add(tag, i + i1, i + i2, j + j1, j + j2)
+            if cut < len(window_ops):
+                i, j = i + window_ops[cut][1], j + window_ops[cut][3]
+            else:
+                i, j = a_hi, b_hi
+            break
+    return opcodes
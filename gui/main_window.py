@@ -1,15 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, Any, Callable, Optional
+import queue
 import threading
-from diff_marker.diff_interface import DiffInterface
+from shared.startup_profiler import timed_import
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def describe_memory(memory) -> str:
+    """Short residency note for a BlobInfo: heap cost, or where the payload sits instead"""
+    if memory.location == "memory":
+        return format_bytes(memory.resident_bytes)
+    if memory.location == "compressed":
+        return f"{format_bytes(memory.resident_bytes)} {memory.codec}"
+    return f"{format_bytes(memory.stored_bytes)} on disk"
 
 class SlotDisplay(ttk.Frame):
     def __init__(self, parent, slot_id: int, on_select: Callable):
         super().__init__(parent)
         self.slot_id = slot_id
         self.on_select = on_select
-        self.content = ""
+        self.length = 0
         self.preview = ""
         
         self._create_widgets()
@@ -45,8 +61,15 @@ class SlotDisplay(ttk.Frame):
         
         self.preview_text.bind('<Button-3>', self._show_context_menu)
     
-    def update_content(self, content: str, preview: str):
-        self.content = content
+    def set_slot(self, slot_id: int, name: Optional[str] = None):
+        """Rebind this display to another slot when the slot page changes"""
+        self.slot_id = slot_id
+        label = f"Slot {slot_id}" if not name else f"Slot {slot_id} ({name})"
+        self.slot_label.config(text=label)
+    
+    def update_content(self, length: int, preview: str, memory=None):
+        """length and preview come from the slot snapshot; memory is the slot's BlobInfo, shown when given"""
+        self.length = length
         self.preview = preview
         
         # Update preview display
@@ -56,31 +79,90 @@ class SlotDisplay(ttk.Frame):
         self.preview_text.config(state='disabled')
         
         # Update status
-        if content:
-            self.status_label.config(text=f"{len(content)} chars", foreground='blue')
+        if length:
+            status = f"{length} chars"
+            if memory is not None:
+                status += f" · {describe_memory(memory)}"
+            self.status_label.config(text=status, foreground='blue')
             self.preview_text.config(bg='#f0f8ff')
         else:
             self.status_label.config(text="Empty", foreground='gray')
             self.preview_text.config(bg='white')
     
     def _on_click(self, event):
-        if self.content:
+        if self.length:
             self.on_select(self.slot_id)
     
     def _show_context_menu(self, event):
-        if self.content:
+        if self.length:
             self.context_menu.post(event.x_root, event.y_root)
     
     def _copy_to_clipboard(self):
-        if self.content:
+        if self.length:
             self.on_select(self.slot_id)
     
     def _clear_slot(self):
         # This should call back to the main manager
         pass
 
+class StatsWindow(tk.Toplevel):
+    """Per-action, per-stage latency table and clip memory totals, refreshed while open"""
+    
+    COLUMNS = ("action", "stage", "count", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    
+    def __init__(self, parent, provider: Callable, refresh_ms: int = 1000,
+                 memory_provider: Optional[Callable] = None):
+        super().__init__(parent)
+        self.title("MultiClip Stats")
+        self.geometry("640x360")
+        self.provider = provider
+        self.memory_provider = memory_provider
+        self.refresh_ms = refresh_ms
+        self._refresh_job = None
+        
+        self.memory_label = ttk.Label(self, text="", anchor='w')
+        self.memory_label.pack(side='bottom', fill='x', padx=5, pady=(0, 5))
+        
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='headings')
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column.replace("_ms", " (ms)"))
+            self.tree.column(column, width=80 if column.endswith("_ms") or column == "count" else 130,
+                             anchor='e' if column.endswith("_ms") or column == "count" else 'w')
+        self.tree.pack(fill='both', expand=True, padx=5, pady=5)
+        self._refresh()
+    
+    def _refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.provider():
+            self.tree.insert('', 'end', values=(
+                row["action"], row["stage"], row["count"],
+                *(f"{row[column]:.1f}" for column in self.COLUMNS[3:])
+            ))
+        if self.memory_provider is not None:
+            stats = self.memory_provider()
+            budget = stats["memory_budget"]
+            self.memory_label.config(text=(
+                f"Clip memory: {format_bytes(stats['resident_bytes'])}"
+                f"{' of ' + format_bytes(budget) if budget else ''}, "
+                f"{stats['evicted_blobs']} evicted ({format_bytes(stats['evicted_bytes'])} on disk), "
+                f"{stats['spilled_blobs']} spilled, {stats['evictions']} evictions, {stats['faults']} faults"))
+        self._refresh_job = self.after(self.refresh_ms, self._refresh)
+    
+    def destroy(self):
+        # Stop the refresh loop, or it fires on a destroyed window (and keeps this one alive)
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
+
 class MainWindow:
-    def __init__(self):
+    """Main Tk window
+    
+    Widgets may only be touched on the Tk thread. Other threads use
+    queue_slot_updates() and call_soon(); the queue is drained once per frame.
+    """
+    
+    def __init__(self, num_slots: int = 10, page_size: int = 10, frame_ms: int = 16):
         self.root = tk.Tk()
         self.root.title("MultiClip System")
         self.root.geometry("900x700")
@@ -89,18 +171,32 @@ class MainWindow:
         self.slot_select_callback: Optional[Callable] = None
         self.mode_change_callback: Optional[Callable] = None
         self.orderly_callback: Optional[Callable] = None
-        
+        self.slots_applied_callback: Optional[Callable] = None
+        self.stats_provider: Optional[Callable] = None
+        self.stats_window: Optional[StatsWindow] = None
+        
+        # Slot displays are reused across pages; slot_displays maps the visible slot ids
+        self.num_slots = num_slots
+        self.page_size = max(1, min(page_size, num_slots))
+        self.slot_page = 0
+        self.slot_widgets = []
         self.slot_displays: Dict[int, SlotDisplay] = {}
         self.current_mode = "Multiclip"
         
         # Add clipboard manager reference
         self.clipboard_manager = None
         
+        # Cross-thread UI work, drained on the Tk thread every frame
+        self.frame_ms = frame_ms
+        self._ui_queue: queue.Queue = queue.Queue()
+        
         self._create_ui()
+        self.root.after(self.frame_ms, self._drain_ui_queue)
     
     def set_clipboard_manager(self, clipboard_manager):
         """Set the clipboard manager reference"""
         self.clipboard_manager = clipboard_manager
+        self._show_slot_page(self.slot_page)
     
     def _create_ui(self):
         # Main menu
@@ -114,6 +210,10 @@ class MainWindow:
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         
+        view_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="View", menu=view_menu)
+        view_menu.add_command(label="Stats", command=self._open_stats)
+        
         # Top toolbar
         toolbar = ttk.Frame(self.root)
         toolbar.pack(fill='x', padx=5, pady=5)
@@ -144,31 +244,49 @@ class MainWindow:
         left_panel = ttk.LabelFrame(content_frame, text="Clipboard Slots", padding=5)
         left_panel.pack(side='left', fill='both', expand=True, padx=(0, 5))
         
+        # Page navigation for large slot counts
+        nav_frame = ttk.Frame(left_panel)
+        nav_frame.pack(fill='x', pady=(0, 5))
+        
+        ttk.Button(nav_frame, text="< Prev", 
+                  command=lambda: self._show_slot_page(self.slot_page - 1)).pack(side='left')
+        ttk.Button(nav_frame, text="Next >", 
+                  command=lambda: self._show_slot_page(self.slot_page + 1)).pack(side='left', padx=5)
+        
+        self.slot_page_label = ttk.Label(nav_frame, text="", font=('Arial', 9))
+        self.slot_page_label.pack(side='left', padx=5)
+        
         # Create slot displays in grid
         slots_frame = ttk.Frame(left_panel)
         slots_frame.pack(fill='both', expand=True)
         
-        for i in range(10):
-            row = i // 2
-            col = i % 2
-            
+        for i in range(self.page_size):
             slot_display = SlotDisplay(slots_frame, i, self._on_slot_select)
-            slot_display.grid(row=row, column=col, sticky='nsew', 
-                             padx=2, pady=2)
-            
-            self.slot_displays[i] = slot_display
+            self.slot_widgets.append(slot_display)
         
         # Configure grid weights
-        for i in range(5):  # 5 rows
+        for i in range((self.page_size + 1) // 2):
             slots_frame.grid_rowconfigure(i, weight=1)
         for i in range(2):  # 2 columns
             slots_frame.grid_columnconfigure(i, weight=1)
         
+        self._show_slot_page(0)
+        
         # Right panel - mode-specific controls
         self.right_panel = ttk.LabelFrame(content_frame, text="Controls", padding=5)
         self.right_panel.pack(side='right', fill='both', padx=(5, 0))
         
-        self._create_mode_panels()
+        # Mode panels are built the first time their mode is shown
+        self.mode_panels: Dict[str, ttk.Frame] = {}
+        self._panel_builders = {
+            "Multiclip": self._create_multiclip_panel,
+            "Orderly": self._create_orderly_panel,
+            "Snippers": self._create_snippers_panel,
+            "Diff-Marker": self._create_diff_marker_panel,
+        }
+        self.diff_interface = None
+        self._orderly_state = ("Inactive", False)
+        self._show_mode_panel("Multiclip")
         
         # Bottom status bar
         status_frame = ttk.Frame(self.root)
@@ -178,8 +296,7 @@ class MainWindow:
                                       relief='sunken', anchor='w')
         self.bottom_status.pack(fill='x')
     
-    def _create_mode_panels(self):
-        # Multiclip panel
+    def _create_multiclip_panel(self) -> ttk.Frame:
         self.multiclip_panel = ttk.Frame(self.right_panel)
         
         ttk.Label(self.multiclip_panel, text="Multiclip Mode", 
@@ -197,8 +314,9 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
         
         ttk.Label(self.multiclip_panel, text=help_text, 
                  font=('Arial', 9), justify='left').pack(pady=5)
-        
-        # Orderly panel
+        return self.multiclip_panel
+    
+    def _create_orderly_panel(self) -> ttk.Frame:
         self.orderly_panel = ttk.Frame(self.right_panel)
         
         ttk.Label(self.orderly_panel, text="Orderly Mode", 
@@ -218,7 +336,10 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
         ttk.Button(btn_frame, text="Reset Sequence",
                   command=self._reset_orderly).pack(pady=2)
         
-        # Snippers panel
+        self._apply_orderly_status()
+        return self.orderly_panel
+    
+    def _create_snippers_panel(self) -> ttk.Frame:
         self.snippers_panel = ttk.Frame(self.right_panel)
         
         ttk.Label(self.snippers_panel, text="Snippers Mode", 
@@ -229,41 +350,72 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
         
         ttk.Button(self.snippers_panel, text="Save New Snippet",
                   command=self._open_snippers_save).pack(pady=5)
-        
-        # NEW: Diff-Marker panel
+        return self.snippers_panel
+    
+    def _create_diff_marker_panel(self) -> ttk.Frame:
         self.diff_marker_panel = ttk.Frame(self.right_panel)
         
         ttk.Label(self.diff_marker_panel, text="Diff-Marker Mode", 
                  font=('Arial', 12, 'bold')).pack(pady=10)
         
-        # Create the diff interface
+        # Create the diff interface (its module is only imported when this mode is first used)
+        DiffInterface = timed_import("diff_marker.diff_interface").DiffInterface
         self.diff_interface = DiffInterface(self.diff_marker_panel, self.clipboard_manager)
         self.diff_interface.pack(fill='both', expand=True)
         
         # Set up status callback
         self.diff_interface.set_status_callback(self.update_status)
-        
-        # Show initial panel
-        self._show_mode_panel("Multiclip")
+        return self.diff_marker_panel
+    
+    def _show_slot_page(self, page: int):
+        """Rebind the reusable slot displays to the slots on the given page"""
+        last_page = (self.num_slots - 1) // self.page_size
+        self.slot_page = max(0, min(page, last_page))
+        first_slot = self.slot_page * self.page_size
+        
+        self.slot_displays = {}
+        snapshots = self.clipboard_manager.snapshot(
+            range(first_slot, first_slot + self.page_size), with_content=False) if self.clipboard_manager else {}
+        for i, slot_display in enumerate(self.slot_widgets):
+            slot_id = first_slot + i
+            if slot_id >= self.num_slots:
+                slot_display.grid_remove()
+                continue
+            
+            name = self.clipboard_manager.get_slot_name(slot_id) if self.clipboard_manager else None
+            slot_display.set_slot(slot_id, name)
+            slot = snapshots.get(slot_id)
+            if slot:
+                slot_display.update_content(slot.length, slot.preview, slot.memory)
+            else:
+                slot_display.update_content(0, "")
+            slot_display.grid(row=i // 2, column=i % 2, sticky='nsew', padx=2, pady=2)
+            self.slot_displays[slot_id] = slot_display
+        
+        last_slot = min(first_slot + self.page_size, self.num_slots) - 1
+        self.slot_page_label.config(
+            text=f"Slots {first_slot + 1}-{last_slot + 1} of {self.num_slots}")
+    
+    def _get_mode_panel(self, mode: str) -> Optional[ttk.Frame]:
+        panel = self.mode_panels.get(mode)
+        if panel is None and mode in self._panel_builders:
+            panel = self._panel_builders[mode]()
+            self.mode_panels[mode] = panel
+        return panel
     
     def _show_mode_panel(self, mode: str):
-        # Hide all panels
-        for panel in [self.multiclip_panel, self.orderly_panel, 
-                     self.snippers_panel, self.diff_marker_panel]:
+        # Hide all panels built so far
+        for panel in self.mode_panels.values():
             panel.pack_forget()
         
-        # Show selected panel
-        if mode == "Multiclip":
-            self.multiclip_panel.pack(fill='both', expand=True)
-        elif mode == "Orderly":
-            self.orderly_panel.pack(fill='both', expand=True)
-        elif mode == "Snippers":
-            self.snippers_panel.pack(fill='both', expand=True)
-        elif mode == "Diff-Marker":
+        # Show selected panel, building it on first use
+        panel = self._get_mode_panel(mode)
+        if panel is None:
+            return
+        if mode == "Diff-Marker" and self.clipboard_manager:
             # Update clipboard manager reference if needed
-            if self.clipboard_manager:
-                self.diff_interface.clipboard_manager = self.clipboard_manager
-            self.diff_marker_panel.pack(fill='both', expand=True)
+            self.diff_interface.clipboard_manager = self.clipboard_manager
+        panel.pack(fill='both', expand=True)
     
     def _on_mode_change(self):
         new_mode = self.mode_var.get()
@@ -299,6 +451,14 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
         # Implement state loading
         pass
     
+    def _open_stats(self):
+        if self.stats_provider is None:
+            return
+        if self.stats_window is None or not self.stats_window.winfo_exists():
+            memory_provider = self.clipboard_manager.blob_store.stats if self.clipboard_manager else None
+            self.stats_window = StatsWindow(self.root, self.stats_provider, memory_provider=memory_provider)
+        self.stats_window.lift()
+    
     def _open_snippers_view(self):
         # Launch snippers view window
         pass
@@ -307,10 +467,52 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
         # Launch snippers save window
         pass
     
+    def _drain_ui_queue(self):
+        """Apply everything queued since the last frame, redrawing each changed slot once"""
+        dirty_slots = set()
+        calls: Dict[Callable, tuple] = {}
+        while True:
+            try:
+                kind, payload = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "slots":
+                dirty_slots.update(payload)
+            else:
+                # Only the latest call to each callback matters (e.g. status text)
+                callback, args = payload
+                calls.pop(callback, None)
+                calls[callback] = args
+        
+        visible = [slot_id for slot_id in dirty_slots if slot_id in self.slot_displays]
+        if visible and self.clipboard_manager:
+            snapshots = self.clipboard_manager.snapshot(visible, with_content=False)
+            for slot_id in visible:
+                slot = snapshots.get(slot_id)
+                self.slot_displays[slot_id].update_content(slot.length if slot else 0,
+                                                          slot.preview if slot else "",
+                                                          slot.memory if slot else None)
+        if dirty_slots and self.slots_applied_callback:
+            self.slots_applied_callback(dirty_slots)
+        for callback, args in calls.items():
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"UI update error: {e}")
+        self.root.after(self.frame_ms, self._drain_ui_queue)
+    
     # Public interface methods
+    def queue_slot_updates(self, slot_ids):
+        """Thread-safe: redraw these slots from a fresh snapshot on the next frame"""
+        self._ui_queue.put(("slots", list(slot_ids)))
+    
+    def call_soon(self, callback: Callable, *args):
+        """Thread-safe: run a widget update on the Tk thread on the next frame"""
+        self._ui_queue.put(("call", (callback, args)))
+    
     def update_slot(self, slot_id: int, content: str, preview: str):
         if slot_id in self.slot_displays:
-            self.slot_displays[slot_id].update_content(content, preview)
+            self.slot_displays[slot_id].update_content(len(content), preview)
     
     def update_status(self, status: str, color: str = 'black'):
         self.status_label.config(text=status, foreground=color)
@@ -319,6 +521,12 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
         self.bottom_status.config(text=status)
     
     def update_orderly_status(self, status: str, active: bool):
+        self._orderly_state = (status, active)
+        if "Orderly" in self.mode_panels:
+            self._apply_orderly_status()
+    
+    def _apply_orderly_status(self):
+        status, active = self._orderly_state
         self.orderly_status.config(text=status, 
                                   foreground='green' if active else 'gray')
         self.orderly_toggle_btn.config(text="Deactivate Orderly" if active else "Activate Orderly")
@@ -329,6 +537,14 @@ Ctrl+Alt+0-9: Transfer to clipboard"""
     def set_mode_change_callback(self, callback: Callable):
         self.mode_change_callback = callback
     
+    def set_slots_applied_callback(self, callback: Callable):
+        """Called on the Tk thread with the slot ids redrawn in each frame"""
+        self.slots_applied_callback = callback
+    
+    def set_stats_provider(self, provider: Callable):
+        """provider() returns latency rows (see Metrics.summary) for the Stats view"""
+        self.stats_provider = provider
+    
     def set_orderly_callback(self, callback: Callable):
         self.orderly_callback = callback
     
@@ -0,0 +1,119 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional
+
+from shared.fuzzy_matcher import Candidate, FuzzyMatcher
+
+KIND_TAGS = {"slot": "[slot]", "history": "[hist]", "snippet": "[snip]"}
+
+
+class QuickPalette:
+    """Fuzzy-finder popup over slots, history and snippets
+
+    The Toplevel is built once at startup and only withdrawn/deiconified, so
+    opening it costs a candidate refresh, not widget construction. Every
+    keystroke matches within budget_ms; a scan that runs out of time is
+    continued on the next idle tick. Must be used on the Tk thread.
+    """
+
+    def __init__(self, root: tk.Tk, candidate_provider: Callable[[], List[Candidate]],
+                 on_choose: Callable[[Candidate], None], limit: int = 50, budget_ms: float = 8.0):
+        self.candidate_provider = candidate_provider
+        self.on_choose = on_choose
+        self.limit = limit
+        self.budget_ms = budget_ms
+        self.matcher = FuzzyMatcher()
+        self.results: List[Candidate] = []
+        self._query: Optional[str] = None
+        self._pending = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("MultiClip Quick Paste")
+        self.window.geometry("640x360")
+        self.window.attributes('-topmost', True)
+        self.window.withdraw()
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+        self._create_widgets()
+
+    def _create_widgets(self):
+        self.query_var = tk.StringVar()
+        self.entry = ttk.Entry(self.window, textvariable=self.query_var, font=('Consolas', 11))
+        self.entry.pack(fill='x', padx=5, pady=5)
+
+        self.listbox = tk.Listbox(self.window, font=('Consolas', 9), activestyle='none')
+        self.listbox.pack(fill='both', expand=True, padx=5)
+        self.listbox.bind('<Double-Button-1>', lambda event: self._choose())
+
+        self.status_label = ttk.Label(self.window, text="", font=('Arial', 8), foreground='gray')
+        self.status_label.pack(fill='x', padx=5, pady=2)
+
+        self.entry.bind('<KeyRelease>', self._on_key)
+        self.entry.bind('<Up>', lambda event: self._move(-1))
+        self.entry.bind('<Down>', lambda event: self._move(1))
+        self.entry.bind('<Return>', lambda event: self._choose())
+        self.entry.bind('<Escape>', lambda event: self.hide())
+
+    def show(self):
+        """Show the palette; candidates are refreshed once the window is up"""
+        self.query_var.set("")
+        self._query = None
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_force()
+        self.window.after_idle(self._load_candidates)
+
+    def hide(self):
+        self._cancel_pending()
+        self.window.withdraw()
+
+    def _load_candidates(self):
+        self.matcher.set_candidates(self.candidate_provider())
+        self._refresh()
+
+    def _cancel_pending(self):
+        if self._pending is not None:
+            self.window.after_cancel(self._pending)
+            self._pending = None
+
+    def _on_key(self, event):
+        if self.query_var.get() != self._query:
+            self._refresh()
+
+    def _refresh(self):
+        self._cancel_pending()
+        self._query = self.query_var.get()
+        self.results = self.matcher.match(self._query, self.limit, self.budget_ms)
+
+        self.listbox.delete(0, 'end')
+        for candidate in self.results:
+            label = " ".join(candidate.label[:120].split())
+            self.listbox.insert('end', f"{KIND_TAGS.get(candidate.kind, '')} {label}")
+        if self.results:
+            self.listbox.selection_set(0)
+
+        if self.matcher.complete:
+            self.status_label.config(text=f"{len(self.results)} shown of {len(self.matcher)}")
+        else:
+            self.status_label.config(text="Searching...")
+            self._pending = self.window.after(1, self._refresh)
+
+    def _move(self, step: int):
+        if not self.results:
+            return "break"
+        selection = self.listbox.curselection()
+        index = selection[0] + step if selection else 0
+        index = max(0, min(index, len(self.results) - 1))
+        self.listbox.selection_clear(0, 'end')
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def _choose(self):
+        selection = self.listbox.curselection()
+        if not selection:
+            return "break"
+        candidate = self.results[selection[0]]
+        # Hide first so focus returns to the target window before the paste
+        self.hide()
+        self.on_choose(candidate)
+        return "break"
@@ -29,8 +29,12 @@ case "$1" in
         echo "Disabling MultiClip service from starting at boot..."
         sudo systemctl disable multiclip.service
         ;;
+    ctl)
+        shift
+        exec python3 "$(dirname "$0")/multiclipctl.py" "$@"
+        ;;
     *)
-        echo "Usage: $0 {start|stop|restart|status|logs|enable|disable}"
+        echo "Usage: $0 {start|stop|restart|status|logs|enable|disable|ctl}"
         echo ""
         echo "Commands:"
         echo "  start   - Start the MultiClip service"
@@ -40,6 +44,7 @@ case "$1" in
         echo "  logs    - Show live service logs"
         echo "  enable  - Enable auto-start at boot"
         echo "  disable - Disable auto-start at boot"
+        echo "  ctl     - Talk to the running daemon (get/set/list/search/batch)"
         exit 1
         ;;
 esac
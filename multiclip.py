@@ -1,65 +1,240 @@
-import pyperclip
-import keyboard
-import json
-import os
-import pyautogui
-import subprocess
 import time
-import tkinter as tk
-from tkinter import ttk
+_LAUNCHED_AT = time.perf_counter()
+
+import argparse
+import signal
+import sys
 import threading
-from gui.main_window import MainWindow
-from shared.clipboard_manager import ClipboardManager
+from shared.startup_profiler import get_profiler, timed_import
+
+# keyboard, pyautogui and the Tk GUI are imported on first use (see --profile-startup)
+get_profiler().start = _LAUNCHED_AT
+with get_profiler().stage("import shared modules"):
+    from shared import action_profiler
+    from shared.action_executor import ActionExecutor
+    from shared.blob_store import BlobStore
+    from shared.clipboard_manager import ClipboardManager
+    from shared.clipboard_watcher import create_backend as create_watcher_backend
+    from shared.config_manager import ConfigManager
+    from shared.control_server import ControlServer
+    from shared.fuzzy_matcher import Candidate, FrecencyTracker
+    from shared.metrics import Metrics
+    from shared.notifier import Notifier, create_backend as create_notification_backend
+    from shared.persistence_worker import PersistenceWorker
+    from shared.slot_journal import SlotJournal
+    from shared import clipboard_backend as clipboard
+
+HOTKEYS_LIVE_BUDGET_MS = 150
 
 class MultiClipSystem:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless
+        self._stop_event = threading.Event()
+        self.hotkeys_ready = threading.Event()
+        profiler = get_profiler()
+        
         # Paths
         self.dict_file = "/home/flintx/multiclip/clipboard_dict.json"
         self.icon_path = "/home/flintx/multiclip/chargers.png"
         
         # Initialize managers
-        self.clipboard_manager = ClipboardManager(num_slots=10)
-        self.clipboard_slots = self.load_dictionary()
+        with profiler.stage("config and slot store"):
+            self._init_slot_store()
+        
+        with profiler.stage("background workers"):
+            self._init_workers()
+        
+        # Synthetic keystroke timing: confirm via clipboard change events instead of fixed sleeps
+        self._pyautogui = None
+        self.pyautogui_pause = self.config_manager.get("behavior.pyautogui_pause_ms", 0) / 1000.0
+        self.copy_timeout = self.config_manager.get("behavior.copy_timeout_ms", 500) / 1000.0
+        self.paste_timeout = self.config_manager.get("behavior.paste_timeout_ms", 200) / 1000.0
+        self.paste_confirm_estimate = self.paste_timeout / 4
         
         # Mode management
         self.current_mode = "MultiClip"
         self.orderly_active = False
         self.orderly_index = 1
         
+        # Quick-paste palette: built with the main window, ranked by frecency
+        self.quick_palette = None
+        self.snippets_manager = None
+        self.frecency = FrecencyTracker()
+        self.frecency.load_dict(self.config_manager.load_state().get("frecency", {}))
+        
         # Drag and drop state
         self.drag_source = None
         self.drag_data = None
         
-        # Setup UI
-        self.main_window = MainWindow()
-        self.main_window.set_clipboard_manager(self.clipboard_manager)
-        self._setup_callbacks()
+        # ClipboardManager owns slot data; persistence and UI follow its changes
+        self.main_window = None
+        self.clipboard_manager.subscribe(self._on_slots_changed)
+        
+        # Hotkeys go live before the watcher, control socket and window are set up
         self.register_hotkeys()
         
-        # Load existing clipboard data into manager
-        self._sync_clipboard_data()
+        with profiler.stage("clipboard watcher"):
+            # The change watcher confirms synthetic copies; history recording is optional
+            self.clipboard_manager.record_history = self.config_manager.get("behavior.monitor_clipboard", True)
+            self.clipboard_manager.start_monitoring(
+                create_watcher_backend(self.config_manager.get("behavior.clipboard_watcher"))
+            )
+        
+        with profiler.stage("control socket"):
+            self._init_control_server()
+        
+        # Setup UI (the headless daemon has none)
+        if not headless:
+            with profiler.stage("main window"):
+                self._init_main_window()
+        profiler.mark("initialized")
+    
+    def _init_slot_store(self):
+        self.config_manager = ConfigManager()
+        self.blob_store = BlobStore(
+            spill_dir=self.config_manager.get("storage.blob_dir"),
+            spill_threshold=self.config_manager.get("storage.spill_threshold_kb", 1024) * 1024,
+            compress_threshold=self.config_manager.get("storage.compress_threshold_kb", 64) * 1024,
+            codec=self.config_manager.get("storage.codec", "zlib"),
+            cache_entries=self.config_manager.get("storage.decompress_cache_entries", 4),
+            memory_budget=self._memory_budget()
+        )
+        self.clipboard_manager = ClipboardManager(
+            num_slots=self.config_manager.get("slots.count", 10),
+            max_history=self.config_manager.get("behavior.max_clipboard_history", 100),
+            blob_store=self.blob_store
+        )
+        for name, slot_id in self.config_manager.get("slots.names", {}).items():
+            self.clipboard_manager.name_slot(int(slot_id), name)
+        self.slot_store = self._create_slot_store()
+        self.load_dictionary()
+    
+    def _memory_budget(self):
+        """storage.memory_budget_mb in bytes; 0 or null keeps every payload in memory"""
+        budget_mb = self.config_manager.get("storage.memory_budget_mb", 256)
+        return int(budget_mb * 1024 * 1024) if budget_mb else None
+    
+    def _create_slot_store(self):
+        """JSON snapshot plus journal by default; storage.backend "sqlite" selects SQLiteStore"""
+        compress_threshold = self.config_manager.get("storage.compress_threshold_kb", 64) * 1024
+        codec = self.config_manager.get("storage.codec", "zlib")
+        journal = SlotJournal(self.dict_file, snapshot_source=self._slot_snapshot,
+                              compress_threshold=compress_threshold, codec=codec)
+        if self.config_manager.get("storage.backend", "json") != "sqlite":
+            return journal
+        
+        SQLiteStore = timed_import("shared.sqlite_store").SQLiteStore
+        store = SQLiteStore(
+            self.config_manager.get("storage.sqlite_path", "~/.multiclip/multiclip.db"),
+            compress_threshold=compress_threshold, codec=codec,
+            index_max_chars=self.config_manager.get("storage.index_max_chars_kb", 64) * 1024
+        )
+        if store.migrate_from_json(journal, str(self.config_manager.state_file)):
+            print(f"Migrated slots and state from {self.dict_file} to {store.path}")
+        self.config_manager.set_state_store(store)
+        return store
+    
+    def _init_workers(self):
+        # Disk writes happen on the persistence worker, never on the hotkey thread
+        self.persistence = PersistenceWorker(
+            debounce_ms=self.config_manager.get("behavior.persist_debounce_ms", 250)
+        )
+        self.persistence.register("slots", self._write_slots)
+        
+        # Stage latencies for every hotkey action, optionally exported for Prometheus
+        self.metrics = Metrics()
+        self.metrics_file = self.config_manager.get("metrics.prometheus_file")
+        if self.metrics_file:
+            self.persistence.register("metrics", lambda keys: self.metrics.write_prometheus(self.metrics_file))
+        self.config_manager.set_persistence_worker(self.persistence)
+        self.persistence.start()
+        
+        # Toasts are delivered off the action path and coalesced into summaries
+        self.notifier = Notifier(
+            backend=create_notification_backend(self.config_manager.get("notifications.backend")),
+            icon_path=self.icon_path,
+            coalesce_ms=self.config_manager.get("notifications.coalesce_ms", 300),
+            min_interval_ms=self.config_manager.get("notifications.min_interval_ms", 1000),
+            timeout_ms=self.config_manager.get("notifications.timeout_ms", 3000)
+        )
+        self.notifier.start()
         
+        # Hotkey actions run on executor workers, never on the keyboard hook thread
+        self.executor = ActionExecutor(
+            num_workers=self.config_manager.get("behavior.action_workers", 1),
+            max_queue=self.config_manager.get("behavior.action_queue_size", 32),
+            overrun_ms=self.config_manager.get("behavior.action_overrun_ms", 1000)
+        )
+        self.executor.start()
+    
+    def _init_control_server(self):
+        # Scripts and editor plugins talk to the slot store over the control socket
+        self.control_server = None
+        if self.config_manager.get("control.enabled", True):
+            self.control_server = ControlServer(
+                self.clipboard_manager, self.config_manager.get("control.socket_path")
+            )
+            try:
+                self.control_server.start()
+            except OSError as e:
+                print(f"Control socket unavailable: {e}")
+                self.control_server = None
+    
+    def _init_main_window(self):
+        MainWindow = timed_import("gui.main_window").MainWindow
+        main_window = MainWindow(
+            num_slots=self.clipboard_manager.num_slots,
+            page_size=self.config_manager.get("slots.page_size", 10)
+        )
+        main_window.set_clipboard_manager(self.clipboard_manager)
+        main_window.set_stats_provider(self.metrics.summary)
+        main_window.set_slots_applied_callback(lambda slot_ids: self.metrics.resolve("ui_updated", slot_ids))
+        self.main_window = main_window
+        self._setup_callbacks()
+        self._refresh_slot_displays(list(self.clipboard_manager.slots))
+        
+        QuickPalette = timed_import("gui.quick_palette").QuickPalette
+        self.quick_palette = QuickPalette(main_window.root, self._palette_candidates,
+                                          self._on_palette_choice)
+    
+    def _get_pyautogui(self):
+        """pyautogui is slow to import; it is loaded on first use or preloaded once hotkeys are live"""
+        if self._pyautogui is None:
+            pyautogui = timed_import("pyautogui")
+            pyautogui.PAUSE = self.pyautogui_pause
+            self._pyautogui = pyautogui
+        return self._pyautogui
+    
     def _setup_callbacks(self):
         """Setup callbacks between UI and system"""
         self.main_window.set_slot_select_callback(self._on_slot_select)
         self.main_window.set_mode_change_callback(self._on_mode_change)
         self.main_window.set_orderly_callback(self._on_orderly_action)
     
-    def _sync_clipboard_data(self):
-        """Sync existing clipboard data with the clipboard manager"""
-        for i in range(10):
-            slot_key = f"slot_{i+1}"
-            if slot_key in self.clipboard_slots:
-                content = self.clipboard_slots[slot_key]
-                self.clipboard_manager.store_in_slot(i, content)
-                preview = content[:50] + "..." if len(content) > 50 else content
-                self.main_window.update_slot(i, content, preview)
+    @staticmethod
+    def _slot_key(slot_id: int) -> str:
+        """Persisted key for a 0-based slot id"""
+        return f"slot_{slot_id + 1}"
+    
+    @staticmethod
+    def _slot_id(slot_key: str) -> int:
+        """0-based slot id for a persisted key"""
+        return int(slot_key.split("_")[-1]) - 1
+    
+    def _on_slots_changed(self, slot_ids):
+        """Persist and redraw slots changed in the clipboard manager"""
+        self.persistence.mark_dirty_many("slots", [self._slot_key(slot_id) for slot_id in slot_ids])
+        self._refresh_slot_displays(slot_ids)
+    
+    def _refresh_slot_displays(self, slot_ids):
+        if self.main_window is not None:
+            self.main_window.queue_slot_updates(slot_ids)
     
     def _on_slot_select(self, slot_id: int):
         """Handle slot selection from UI"""
         content = self.clipboard_manager.get_slot_content(slot_id)
         if content:
-            pyperclip.copy(content)
+            clipboard.copy(content)
             self.show_toast("Slot Copied", f"Slot {slot_id} copied to clipboard")
     
     def _on_mode_change(self, new_mode: str):
@@ -67,166 +242,387 @@ class MultiClipSystem:
         self.current_mode = new_mode
         if new_mode == "Orderly":
             self.orderly_active = True
-            self.orderly_index = 1
+            self._reset_orderly_index()
             self.show_toast("Orderly Mode", "Sequential copying activated")
         else:
             self.orderly_active = False
             if new_mode != "Diff-Marker":  # Don't show toast for diff marker
                 self.show_toast(f"{new_mode} Mode", f"{new_mode} mode activated")
     
+    def _reset_orderly_index(self):
+        # Same lock as the orderly copy that reads and advances the index
+        with self.clipboard_manager.transaction():
+            self.orderly_index = 1
+    
     def _on_orderly_action(self, action: str):
         """Handle orderly mode actions"""
         if action == "toggle":
             self.orderly_active = not self.orderly_active
             if self.orderly_active:
-                self.orderly_index = 1
+                self._reset_orderly_index()
                 self.show_toast("Orderly Mode", "Sequential copying activated")
             else:
                 self.show_toast("Orderly Mode", "Sequential copying deactivated")
             
-            self.main_window.update_orderly_status(
-                "Active" if self.orderly_active else "Inactive",
-                self.orderly_active
-            )
+            if self.main_window:
+                self.main_window.update_orderly_status(
+                    "Active" if self.orderly_active else "Inactive",
+                    self.orderly_active
+                )
         elif action == "reset":
-            self.orderly_index = 1
+            self._reset_orderly_index()
             self.show_toast("Orderly Mode", "Sequence reset to slot 1")
     
     def load_dictionary(self):
-        """Load clipboard slots from file"""
-        if os.path.exists(self.dict_file):
-            with open(self.dict_file, "r") as file:
-                return json.load(file)
+        """Load clipboard slots from the slot store (JSON journal or SQLite) into the clipboard manager"""
+        if not self.slot_store.exists():
+            return
+        with self.clipboard_manager.transaction():
+            for slot_key, content in self.slot_store.load().items():
+                try:
+                    slot_id = self._slot_id(slot_key)
+                except ValueError:
+                    continue
+                if content:
+                    self.clipboard_manager.store_in_slot(slot_id, content)
+    
+    def _slot_snapshot(self):
+        """Non-empty slot contents keyed the way clipboard_dict.json stores them"""
+        return {self._slot_key(slot_id): slot.content
+                for slot_id, slot in self.clipboard_manager.snapshot().items()
+                if slot.content}
+    
+    def save_dictionary(self, slot_key=None):
+        """Queue one changed slot for the journal, or compact everything when no slot is given"""
+        if slot_key is not None:
+            self.persistence.mark_dirty("slots", slot_key)
         else:
-            return {f"slot_{i}": "" for i in range(1, 16)}
+            self.slot_store.compact(self._slot_snapshot())
     
-    def save_dictionary(self):
-        """Save clipboard slots to file"""
-        with open(self.dict_file, "w") as file:
-            json.dump(self.clipboard_slots, file, indent=4)
+    def _write_slots(self, slot_keys):
+        """Persistence worker callback: journal the latest content of each dirty slot"""
+        self.slot_store.append_many(
+            {slot_key: self.clipboard_manager.get_slot_content(self._slot_id(slot_key))
+             for slot_key in slot_keys}
+        )
+        self.metrics.resolve("persisted", slot_keys)
+        self._metrics_changed()
     
     def show_toast(self, title, message):
-        """Show system notification with custom icon"""
-        try:
-            subprocess.run([
-                "notify-send", 
-                "-i", self.icon_path, 
-                title, 
-                message, 
-                "-t", "3000"
-            ], check=False)
-        except Exception as e:
-            print(f"Toast notification error: {e}")
+        """Queue a system notification; delivery and coalescing happen on the notifier thread"""
+        self.notifier.notify(title, message)
+    
+    def _wait_for_clipboard_change(self, after_sequence, timeout):
+        """Wait for the watcher to report a clipboard change newer than after_sequence"""
+        watcher = self.clipboard_manager.watcher
+        if watcher is None:
+            time.sleep(timeout)
+            return None
+        return watcher.wait_for_change(after_sequence, timeout)
+    
+    def _clipboard_sequence(self):
+        watcher = self.clipboard_manager.watcher
+        return watcher.sequence if watcher else 0
+    
+    def _start_trace(self, action, pressed_at):
+        """Trace an action from its hotkey press; the first stage is the time it spent queued"""
+        trace = self.metrics.trace(action, pressed_at)
+        trace.mark("queued")
+        return trace
+    
+    def _store_traced(self, trace, slot_id, content):
+        """Store into a slot, timing the journal write and redraw that follow asynchronously"""
+        self.metrics.expect("persisted", self._slot_key(slot_id), trace.action)
+        if self.main_window is not None:
+            self.metrics.expect("ui_updated", slot_id, trace.action)
+        self.clipboard_manager.store_in_slot(slot_id, content)
+        trace.mark("slot_stored")
     
-    def add_to_slot(self, slot_num):
+    def _finish_trace(self, trace, slot_num):
+        """Record the action total and show it in the status bar"""
+        elapsed_ms = trace.finish()
+        self._metrics_changed()
+        if self.main_window:
+            self.main_window.call_soon(self.main_window.update_bottom_status,
+                                       f"{trace.action} slot {slot_num}: {elapsed_ms:.0f} ms")
+    
+    def _metrics_changed(self):
+        if self.metrics_file:
+            self.persistence.mark_dirty("metrics")
+    
+    def add_to_slot(self, slot_num, pressed_at=None):
         """Copy selected content to clipboard slot"""
+        trace = self._start_trace("add_to_slot", pressed_at)
         try:
-            # Use your working method: simulate Ctrl+C first
-            pyautogui.hotkey("ctrl", "c")
-            time.sleep(0.1)  # Give it time to copy
+            # Simulate Ctrl+C, then wait for the clipboard owner change it causes
+            before = self._clipboard_sequence()
+            self._get_pyautogui().hotkey("ctrl", "c")
+            trace.mark("copy_sent")
+            change = self._wait_for_clipboard_change(before, self.copy_timeout)
             
-            # Get the copied content
-            clipboard_content = pyperclip.paste()
+            if change is not None:
+                clipboard_content = change.content
+            else:
+                # Timed out: the app may have copied identical content without a new owner
+                clipboard_content = clipboard.paste()
+            trace.mark("clipboard_confirmed")
             
             if self.orderly_active:
-                # Orderly mode: use sequential slot
-                actual_slot = self.orderly_index - 1  # Convert to 0-based
-                slot_key = f"slot_{self.orderly_index}"
-                
-                self.clipboard_slots[slot_key] = clipboard_content
-                self.clipboard_manager.store_in_slot(actual_slot, clipboard_content)
-                self.save_dictionary()
-                
-                # Update UI
-                preview = clipboard_content[:50] + "..." if len(clipboard_content) > 50 else clipboard_content
-                self.main_window.update_slot(actual_slot, clipboard_content, preview)
+                # Orderly mode: use sequential slot. Copies for different slots run on
+                # different workers, so claim the slot and advance under the manager lock
+                with self.clipboard_manager.transaction():
+                    slot_num = self.orderly_index
+                    self._store_traced(trace, slot_num - 1, clipboard_content)
+                    
+                    # Move to next slot
+                    self.orderly_index = slot_num % self.clipboard_manager.num_slots + 1
                 
-                self.show_toast("Orderly Copy", f"Slot {self.orderly_index} updated")
-                
-                # Move to next slot
-                self.orderly_index += 1
-                if self.orderly_index > 10:
-                    self.orderly_index = 1
+                self.show_toast("Orderly Copy", f"Slot {slot_num} updated")
             else:
                 # Normal multiclip mode
-                actual_slot = slot_num - 1  # Convert to 0-based
-                slot_key = f"slot_{slot_num}"
-                
-                self.clipboard_slots[slot_key] = clipboard_content
-                self.clipboard_manager.store_in_slot(actual_slot, clipboard_content)
-                self.save_dictionary()
-                
-                # Update UI
-                preview = clipboard_content[:50] + "..." if len(clipboard_content) > 50 else clipboard_content
-                self.main_window.update_slot(actual_slot, clipboard_content, preview)
+                self._store_traced(trace, slot_num - 1, clipboard_content)
                 
                 self.show_toast("Slot Updated", f"Slot {slot_num} updated")
+            trace.mark("toast_sent")
+            self._finish_trace(trace, slot_num)
             
         except Exception as e:
             self.show_toast("Copy Error", str(e))
     
-    def paste_from_slot(self, slot_num):
+    def _paste_content(self, content, trace=None):
+        """Put content on the clipboard and send Ctrl+V once the new owner is visible"""
+        # The confirm timeout adapts to how quickly recent pastes were confirmed
+        before = self._clipboard_sequence()
+        started = time.perf_counter()
+        clipboard.copy(content)
+        timeout = min(self.paste_timeout, max(0.005, 3 * self.paste_confirm_estimate))
+        change = self._wait_for_clipboard_change(before, timeout)
+        confirm_time = time.perf_counter() - started if change else self.paste_timeout
+        self.paste_confirm_estimate = 0.8 * self.paste_confirm_estimate + 0.2 * confirm_time
+        if trace:
+            trace.mark("clipboard_confirmed")
+        
+        self._get_pyautogui().hotkey("ctrl", "v")
+        if trace:
+            trace.mark("paste_sent")
+    
+    def paste_from_slot(self, slot_num, pressed_at=None):
         """Paste content from clipboard slot"""
+        trace = self._start_trace("paste_from_slot", pressed_at)
         try:
             actual_slot = slot_num - 1  # Convert to 0-based
             content = self.clipboard_manager.get_slot_content(actual_slot)
+            trace.mark("slot_read")
             
             if content:
-                pyperclip.copy(content)
-                time.sleep(0.1)
-                pyautogui.hotkey("ctrl", "v")
-                
+                self._paste_content(content, trace)
                 self.show_toast("Slot Pasted", f"Slot {slot_num} content pasted")
+                trace.mark("toast_sent")
+                self._finish_trace(trace, slot_num)
             else:
                 self.show_toast("Slot Empty", f"No content in slot {slot_num}")
                 
         except Exception as e:
             self.show_toast("Paste Error", str(e))
     
-    def transfer_to_default(self, slot_num):
+    def transfer_to_default(self, slot_num, pressed_at=None):
         """Transfer slot content to default clipboard"""
+        trace = self._start_trace("transfer_to_default", pressed_at)
         try:
             actual_slot = slot_num - 1  # Convert to 0-based
             content = self.clipboard_manager.get_slot_content(actual_slot)
+            trace.mark("slot_read")
             
             if content:
-                pyperclip.copy(content)
+                clipboard.copy(content)
+                trace.mark("clipboard_set")
                 self.show_toast("Slot Transferred", f"Slot {slot_num} transferred to clipboard")
+                trace.mark("toast_sent")
+                self._finish_trace(trace, slot_num)
             else:
                 self.show_toast("Slot Empty", f"No content in slot {slot_num}")
                 
         except Exception as e:
             self.show_toast("Transfer Error", str(e))
     
+    def _get_snippets_manager(self):
+        """Snippets are only needed by the palette, so they are loaded on first open"""
+        if self.snippets_manager is None:
+            SnippetsManager = timed_import("shared.snippets_manager").SnippetsManager
+            self.snippets_manager = SnippetsManager()
+            if self.config_manager.snippets_file.exists():
+                self.snippets_manager.load_from_dict(self.config_manager.load_snippets())
+        return self.snippets_manager
+    
+    def _palette_candidates(self):
+        """Slots, history and snippets, scored by palette use plus their own recency
+        
+        Labels are previews, so opening the palette reads no clip content back.
+        """
+        now = time.time()
+        score = lambda kind, ref: self.frecency.score((kind, ref), now)
+        decay = self.frecency.weight
+        candidates = []
+        for slot in self.clipboard_manager.snapshot(with_content=False).values():
+            if slot.length:
+                label = f"{slot.name}: {slot.preview}" if slot.name else slot.preview
+                candidates.append(Candidate("slot", slot.slot_id, label,
+                                            score("slot", slot.slot_id)
+                                            + decay(now - slot.timestamp.timestamp())))
+        for entry in self.clipboard_manager.history_snapshot(with_content=False):
+            candidates.append(Candidate("history", entry.content_hash, entry.preview,
+                                        score("history", entry.content_hash)
+                                        + entry.count * decay(now - entry.timestamp)))
+        
+        def walk(category):
+            for cmd in category.commands:
+                used = cmd.usage_count * decay(now - cmd.last_used.timestamp()) if cmd.last_used else 0.0
+                label = f"{cmd.content}  # {cmd.description}" if cmd.description else cmd.content
+                candidates.append(Candidate("snippet", cmd.id, label, score("snippet", cmd.id) + used))
+            for subcategory in category.subcategories:
+                walk(subcategory)
+        for category in self._get_snippets_manager().root_categories:
+            walk(category)
+        return candidates
+    
+    def _on_palette_choice(self, candidate):
+        """Tk thread: record the use in memory; saving, reading content and pasting happen elsewhere"""
+        content = None
+        if candidate.kind == "snippet":
+            found = self._get_snippets_manager().find_command(candidate.ref)
+            if found is None:
+                return
+            cmd = found[0]
+            cmd.use()
+            content = cmd.content
+            self.config_manager.save_snippets(self.snippets_manager.to_dict())
+        self.frecency.record((candidate.kind, candidate.ref))
+        self.config_manager.update_state({"frecency": self.frecency.to_dict()})
+        self.executor.submit("quick_paste", self._paste_palette_choice, candidate, content,
+                             time.perf_counter(), key="quick_paste")
+    
+    def _palette_content(self, candidate):
+        if candidate.kind == "slot":
+            return self.clipboard_manager.get_slot_content(candidate.ref)
+        try:
+            return self.blob_store.get(candidate.ref)
+        except KeyError:
+            # Dropped from history since the palette opened
+            return None
+    
+    def _paste_palette_choice(self, candidate, content=None, chosen_at=None):
+        trace = self._start_trace("quick_paste", chosen_at)
+        try:
+            if content is None:
+                content = self._palette_content(candidate)
+            if not content:
+                return
+            self._paste_content(content, trace)
+            trace.finish()
+            self._metrics_changed()
+        except Exception as e:
+            self.show_toast("Paste Error", str(e))
+    
+    def _request_palette(self):
+        """Hook-thread entry point: open the palette on the Tk thread"""
+        if self.quick_palette is not None:
+            self.main_window.call_soon(self.quick_palette.show)
+    
+    def _dispatch(self, name, action, slot_num):
+        """Hook-thread entry point: enqueue the action and return immediately"""
+        self.executor.submit(name, action, slot_num, time.perf_counter(), key=slot_num)
+    
     def register_hotkeys(self):
         """Register all hotkeys"""
         def hotkey_thread():
             try:
+                keyboard = timed_import("keyboard")
+                
                 # Copy hotkeys (Ctrl + 1-9)
                 for i in range(1, 10):
-                    keyboard.add_hotkey(f"ctrl+{i}", self.add_to_slot, args=[i])
+                    keyboard.add_hotkey(f"ctrl+{i}", self._dispatch,
+                                        args=["add_to_slot", self.add_to_slot, i])
                 
                 # Paste hotkeys (Ctrl + Shift + 1-9)
                 for i in range(1, 10):
-                    keyboard.add_hotkey(f"ctrl+shift+{i}", self.paste_from_slot, args=[i])
+                    keyboard.add_hotkey(f"ctrl+shift+{i}", self._dispatch,
+                                        args=["paste_from_slot", self.paste_from_slot, i])
                 
                 # Transfer hotkeys (Ctrl + Alt + 1-9)
                 for i in range(1, 10):
-                    keyboard.add_hotkey(f"ctrl+alt+{i}", self.transfer_to_default, args=[i])
+                    keyboard.add_hotkey(f"ctrl+alt+{i}", self._dispatch,
+                                        args=["transfer_to_default", self.transfer_to_default, i])
+                
+                # Quick-paste palette (needs the main window)
+                if not self.headless:
+                    keyboard.add_hotkey(self.config_manager.get_hotkey("quick_palette") or "ctrl+shift+space",
+                                        self._request_palette)
                 
+                get_profiler().mark("hotkeys live")
                 print("All hotkeys registered successfully!")
                 
             except Exception as e:
                 print(f"Hotkey registration error: {e}")
+            finally:
+                self.hotkeys_ready.set()
+            
+            # Load pyautogui now so the first copy/paste hotkey does not pay for the import
+            try:
+                self._get_pyautogui()
+            except Exception as e:
+                print(f"pyautogui unavailable: {e}")
         
         # Start hotkeys in background thread
         threading.Thread(target=hotkey_thread, daemon=True).start()
     
     def run(self):
-        """Start the application"""
-        self.show_toast("MultiClip Started", "System ready with Diff-Marker integration!")
-        self.main_window.run()
+        """Start the application; headless mode blocks until SIGINT/SIGTERM"""
+        if self.headless:
+            self.show_toast("MultiClip Started", "Daemon ready on the control socket")
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: self._stop_event.set())
+            while not self._stop_event.wait(1):
+                pass
+        else:
+            self.show_toast("MultiClip Started", "System ready with Diff-Marker integration!")
+            self.main_window.run()
+        self.shutdown()
+    
+    def shutdown(self):
+        """Stop background services and write final state"""
+        if self.control_server:
+            self.control_server.stop()
+        self.executor.stop()
+        self.notifier.stop()
+        self.clipboard_manager.stop_monitoring()
+        self.persistence.stop()
+        self.save_dictionary()
+        self.slot_store.close()
+        self.blob_store.close()
 
 if __name__ == "__main__":
-    app = MultiClipSystem()
+    parser = argparse.ArgumentParser(description="MultiClip clipboard manager")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run without the main window; control via multiclipctl.py")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import and construction times once hotkeys are live")
+    parser.add_argument("--profile", metavar="ACTIONS",
+                        help="capture cProfile and tracemalloc diffs for these comma-separated actions "
+                             "(e.g. add_to_slot,paste_from_slot,calculate_diff,snippet_search or all)")
+    parser.add_argument("--profile-dir", default=action_profiler.DEFAULT_PROFILE_DIR,
+                        help="where captures are written; the newest 50 are kept")
+    parser.add_argument("--profile-report", action="store_true",
+                        help="summarize the captures in --profile-dir and exit")
+    args = parser.parse_args()
+    
+    if args.profile_report:
+        print(action_profiler.report(args.profile_dir))
+        sys.exit(0)
+    if args.profile:
+        action_profiler.install(action_profiler.ActionProfiler(args.profile.split(","), args.profile_dir))
+    
+    app = MultiClipSystem(headless=args.daemon)
+    if args.profile_startup:
+        app.hotkeys_ready.wait(timeout=5)
+        print(get_profiler().report({"hotkeys live": HOTKEYS_LIVE_BUDGET_MS}), file=sys.stderr)
     app.run()
\ No newline at end of file
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Command-line client for a running MultiClip daemon
+Reads and writes slots over the control socket without synthetic keystrokes.
+"""
+import argparse
+import json
+import sys
+
+from shared.control_client import ControlClient, ControlClientError
+
+
+def _slot_ref(value):
+    """Slot numbers are 1-based like the hotkeys; anything else is a slot name"""
+    return int(value) if value.isdigit() else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control a running MultiClip daemon")
+    parser.add_argument("--socket", help="control socket path (default ~/.multiclip/control.sock)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    get_parser = commands.add_parser("get", help="print a slot's content")
+    get_parser.add_argument("slot", type=_slot_ref)
+
+    set_parser = commands.add_parser("set", help="store content in a slot (stdin if omitted)")
+    set_parser.add_argument("slot", type=_slot_ref)
+    set_parser.add_argument("content", nargs="?")
+
+    list_parser = commands.add_parser("list", help="list slots with previews")
+    list_parser.add_argument("--all", action="store_true", help="include empty slots")
+
+    search_parser = commands.add_parser("search", help="search slots and clipboard history")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.add_argument("--slots-only", action="store_true")
+    search_parser.add_argument("--tokens", action="store_true", help="match whole words instead of a substring")
+
+    commands.add_parser("stats", help="show blob store and search index statistics")
+
+    commands.add_parser("batch", help="send JSON requests from stdin (one per line) as one batch")
+
+    args = parser.parse_args()
+
+    try:
+        with ControlClient(args.socket) as client:
+            if args.command == "get":
+                sys.stdout.write(client.get(args.slot))
+            elif args.command == "set":
+                content = args.content if args.content is not None else sys.stdin.read()
+                client.set(args.slot, content)
+            elif args.command == "list":
+                for slot in client.list(all_slots=args.all):
+                    name = f" [{slot['name']}]" if slot["name"] else ""
+                    print(f"{slot['slot']:>4}{name}: {slot['preview']}")
+            elif args.command == "search":
+                for match in client.search(args.query, args.limit, not args.slots_only, args.tokens):
+                    where = f"slot {match['slot']}" if match["source"] == "slot" else "history"
+                    print(f"{where:<10} {match['preview']}")
+            elif args.command == "stats":
+                print(json.dumps(client.request("stats"), indent=2))
+            elif args.command == "batch":
+                requests = [json.loads(line) for line in sys.stdin if line.strip()]
+                for result in client.batch(requests):
+                    print(json.dumps(result))
+    except (OSError, ControlClientError) as e:
+        print(f"multiclipctl: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,7 @@ class OrderlyManager:
     def __init__(self, clipboard_manager: ClipboardManager):
         self.clipboard_manager = clipboard_manager
         self.state = OrderlyState()
+        self.state.max_slots = clipboard_manager.num_slots
         self.status_callback: Optional[Callable] = None
         self.completion_callback: Optional[Callable] = None
     
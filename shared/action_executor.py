@@ -0,0 +1,84 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from shared.action_profiler import profile
+
+
+class ActionExecutor:
+    """Runs hotkey actions on worker threads instead of the keyboard hook thread
+
+    submit() only enqueues, so the hook thread returns in microseconds.
+    Actions sharing a key (e.g. a slot number) always go to the same worker
+    queue and therefore run in submission order. When a queue is full the
+    action is dropped and counted rather than blocking the hook; actions that
+    finish later than overrun_ms after submission are counted as overruns.
+    """
+
+    def __init__(self, num_workers: int = 1, max_queue: int = 32, overrun_ms: int = 1000):
+        self.num_workers = max(1, num_workers)
+        self.overrun = overrun_ms / 1000.0
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=max_queue)
+                                           for _ in range(self.num_workers)]
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "dropped": 0,
+            "overrun": 0,
+        }
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def submit(self, name: str, action: Callable, *args: Any, key: Optional[Hashable] = None) -> bool:
+        """Queue an action; returns False if it was dropped because the queue is full"""
+        worker_queue = self._queues[hash(key) % self.num_workers if key is not None else 0]
+        try:
+            worker_queue.put_nowait((name, action, args, time.monotonic()))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def start(self):
+        if not self._threads:
+            for worker_queue in self._queues:
+                thread = threading.Thread(target=self._run, args=(worker_queue,), daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """Finish queued actions, then stop the workers"""
+        for worker_queue in self._queues:
+            worker_queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["queued"] = sum(worker_queue.qsize() for worker_queue in self._queues)
+        return stats
+
+    def _run(self, worker_queue: queue.Queue):
+        while True:
+            item = worker_queue.get()
+            if item is None:
+                return
+            name, action, args, submitted_at = item
+            try:
+                with profile(name):
+                    action(*args)
+                self._count("completed")
+            except Exception as e:
+                self._count("failed")
+                print(f"Action {name} failed: {e}")
+            if time.monotonic() - submitted_at > self.overrun:
+                self._count("overrun")
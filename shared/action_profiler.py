@@ -0,0 +1,217 @@
+"""
+Opt-in per-action profiling: cProfile stats plus tracemalloc allocation diffs
+Enabled with `multiclip.py --profile add_to_slot,calculate_diff,snippet_search`;
+summarize captures with `multiclip.py --profile-report`.
+"""
+import functools
+import io
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+# cProfile, pstats, tracemalloc and argparse are imported on first use: this
+# module is imported at startup whether or not profiling is enabled
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+DEFAULT_PROFILE_DIR = "~/.multiclip/profiles"
+ALLOC_SUFFIX = ".alloc.json"
+
+
+class ActionProfiler:
+    """Captures one cProfile run and one tracemalloc diff per selected action
+
+    Captures are written to output_dir as <time>-<seq>-<action>.prof (pstats
+    format) plus a matching .alloc.json with the top allocation sites by
+    growth, and only the newest keep captures are retained. tracemalloc runs
+    only while a capture is in progress (if it was already tracing, its
+    traces are cleared instead), so the snapshot taken at the end holds just
+    what was allocated during the action and is still alive, and nothing
+    pays for tracing between captures. cProfile only
+    sees the calling thread and one capture runs at a time, so an action that
+    starts while another is being captured runs unprofiled (counted in
+    skipped) instead of waiting.
+    """
+
+    def __init__(self, actions: Iterable[str], output_dir: str = DEFAULT_PROFILE_DIR,
+                 keep: int = 50, top_allocations: int = 25, traceback_frames: int = 1):
+        self.actions = set(actions)
+        self.output_dir = Path(output_dir).expanduser()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.keep = keep
+        self.top_allocations = top_allocations
+        self.traceback_frames = traceback_frames
+        self.captured = 0
+        self.skipped = 0
+        self._busy = threading.Lock()
+        self._sequence = 0
+
+    def wants(self, action: str) -> bool:
+        return "all" in self.actions or action in self.actions
+
+    @contextmanager
+    def capture(self, action: str):
+        if not self.wants(action) or not self._busy.acquire(blocking=False):
+            if self.wants(action):
+                self.skipped += 1
+            yield
+            return
+        import cProfile
+        import tracemalloc
+        started_tracing = not tracemalloc.is_tracing()
+        try:
+            if started_tracing:
+                tracemalloc.start(self.traceback_frames)
+            else:
+                tracemalloc.clear_traces()
+                tracemalloc.reset_peak()
+            profile = cProfile.Profile()
+            started = time.perf_counter()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+                self._write(action, profile, snapshot, peak, elapsed_ms)
+        finally:
+            if started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._busy.release()
+
+    def _write(self, action: str, profile: "cProfile.Profile", snapshot: "tracemalloc.Snapshot",
+               peak_bytes: int, elapsed_ms: float):
+        import tracemalloc
+        self._sequence += 1
+        stem = self.output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{self._sequence:04d}-{action}"
+        try:
+            profile.dump_stats(f"{stem}.prof")
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            allocations = [{
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size": stat.size,
+                "count": stat.count,
+            } for stat in snapshot.filter_traces(ignore).statistics("lineno")[:self.top_allocations]]
+            with open(f"{stem}{ALLOC_SUFFIX}", "w") as f:
+                json.dump({"action": action, "elapsed_ms": elapsed_ms, "peak_bytes": peak_bytes,
+                           "allocations": allocations}, f, indent=1)
+            self.captured += 1
+            self._rotate()
+        except OSError as e:
+            print(f"Profile capture for {action} not written: {e}")
+
+    def _rotate(self):
+        captures = sorted(self.output_dir.glob("*.prof"))
+        for old in captures[:max(0, len(captures) - self.keep)]:
+            for path in (old, old.with_suffix(ALLOC_SUFFIX)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+_profiler: Optional[ActionProfiler] = None
+
+
+def install(profiler: Optional[ActionProfiler]):
+    """Make profiler the process-wide one used by profile() and @profiled"""
+    global _profiler
+    _profiler = profiler
+
+
+def get_action_profiler() -> Optional[ActionProfiler]:
+    return _profiler
+
+
+def profile(action: str):
+    """Context manager capturing action if profiling is on; a no-op context otherwise"""
+    profiler = _profiler
+    if profiler is None:
+        return nullcontext()
+    return profiler.capture(action)
+
+
+def profiled(action: str) -> Callable:
+    """Decorator form of profile(); costs one global lookup when profiling is off"""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return fn(*args, **kwargs)
+            with _profiler.capture(action):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def report(directory: str = DEFAULT_PROFILE_DIR, top: int = 15,
+           action: Optional[str] = None) -> str:
+    """Aggregate captures per action: top functions by cumulative time and top allocation sites"""
+    import pstats
+    directory = Path(directory).expanduser()
+    by_action: Dict[str, List[Path]] = {}
+    for path in sorted(directory.glob("*.prof")):
+        name = path.stem.split("-", 3)[3]
+        if action is None or name == action:
+            by_action.setdefault(name, []).append(path)
+    if not by_action:
+        return f"No profile captures in {directory}"
+
+    sections = []
+    for name, paths in sorted(by_action.items()):
+        elapsed: List[float] = []
+        peaks: List[int] = []
+        growth: Dict[str, List[int]] = {}
+        for path in paths:
+            try:
+                with open(path.with_suffix(ALLOC_SUFFIX)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            elapsed.append(data["elapsed_ms"])
+            peaks.append(data.get("peak_bytes", 0))
+            for entry in data["allocations"]:
+                totals = growth.setdefault(entry["location"], [0, 0])
+                totals[0] += entry["size"]
+                totals[1] += entry["count"]
+
+        header = f"== {name}: {len(paths)} captures"
+        if elapsed:
+            header += (f", mean {sum(elapsed) / len(elapsed):.1f} ms, max {max(elapsed):.1f} ms, "
+                       f"peak traced memory {max(peaks) / 1024:.0f} KiB")
+        lines = [header, "", "top functions by cumulative time:"]
+
+        output = io.StringIO()
+        stats = pstats.Stats(*(str(path) for path in paths), stream=output)
+        stats.files = []  # skip the per-file header lines
+        stats.sort_stats("cumulative").print_stats(top)
+        lines.extend(output.getvalue().strip("\n").splitlines())
+
+        lines.extend(["", "top allocation sites by growth (summed over captures):"])
+        ranked = sorted(growth.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        for location, (size, count) in ranked:
+            lines.append(f"  {size / 1024:10.1f} KiB {count:+8d} blocks  {location}")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize per-action profile captures")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_PROFILE_DIR)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--action", help="only this action")
+    args = parser.parse_args()
+    print(report(args.directory, args.top, args.action))
+
+
+if __name__ == "__main__":
+    main()
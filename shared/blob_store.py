@@ -0,0 +1,488 @@
+import hashlib
+import mmap
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from shared.compression import compress, decompress, decompress_prefix
+
+
+def content_hash(content: str) -> int:
+    """64-bit content hash used to address and deduplicate clipboard payloads"""
+    digest = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class _SpilledBlob:
+    """A payload written to disk and read back through a read-only memory map"""
+
+    def __init__(self, path: Path, data: bytes, codec: str = "none"):
+        self.path = path
+        self.codec = codec
+        with open(path, "wb") as f:
+            f.write(data)
+        self.size = len(data)
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self) -> str:
+        # Decompress and decode straight from the map; slicing it would copy the whole file first
+        with memoryview(self._map) as view:
+            return str(decompress(view, self.codec), "utf-8", "surrogatepass")
+
+    def read_prefix(self, max_bytes: int) -> bytes:
+        with memoryview(self._map) as view:
+            return decompress_prefix(view, self.codec, max_bytes)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class _EvictedBlob:
+    """A payload pushed out of memory by the budget, read back from its file when needed
+
+    Unlike spilled blobs these are small and numerous, so no descriptor or map
+    is held between reads. was_compressed records whether it came from the
+    compressed tier, so fault-in can put the payload back without recompressing.
+    """
+
+    def __init__(self, path: Path, data: bytes, codec: str, was_compressed: bool):
+        self.path = path
+        self.codec = codec
+        self.was_compressed = was_compressed
+        with open(path, "wb") as f:
+            f.write(data)
+        self.size = len(data)
+
+    def read_payload(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def read(self) -> str:
+        return decompress(self.read_payload(), self.codec).decode("utf-8", "surrogatepass")
+
+    def close(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class BlobInfo(NamedTuple):
+    """Where one payload is held and what it costs"""
+    location: str  # "memory", "compressed", "spilled" or "evicted"
+    resident_bytes: int  # heap bytes, including a cached decompressed copy
+    stored_bytes: int  # characters when held as text, bytes when compressed or on disk
+    codec: Optional[str]
+    refs: int
+
+
+class BlobStore:
+    """Content-addressed, reference-counted store for clipboard payloads
+
+    Slots and history entries hold the 64-bit key returned by put() instead
+    of their own copy of the text, so the same clip stored in several places
+    is kept once. Payloads of compress_threshold characters or more are held
+    compressed with codec (each entry records the codec it ended up with) and
+    decompressed on read, keeping the last few results in a small LRU cache.
+    Payloads still at or above spill_threshold bytes after compression are
+    written to spill_dir and served from a memory map rather than the heap.
+
+    With a memory_budget (bytes), heap-resident payloads of evict_threshold
+    bytes or more and cached copies are kept in least-recently-used order.
+    When they add up to more than the budget, cached copies are dropped first
+    and then the least recently used entries are evicted to files in
+    spill_dir; get() faults an evicted entry back in and makes it the most
+    recently used. Smaller payloads are only counted: tracking and evicting
+    them would cost more than they hold. peek() is read-only: it never
+    changes recency, fills the cache or faults anything in, for bulk readers
+    such as snapshots and the search index. If an eviction cannot be
+    written the entry stays resident, the budget is kept, and eviction is
+    retried on a later put once a backoff (starting at evict_retry_ms and
+    doubling per failure up to a minute) has passed.
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None, spill_threshold: int = 1024 * 1024,
+                 compress_threshold: Optional[int] = 64 * 1024, codec: str = "zlib",
+                 cache_entries: int = 4, memory_budget: Optional[int] = None,
+                 evict_threshold: int = 4096, evict_retry_ms: int = 1000):
+        self.spill_dir = Path(spill_dir or "~/.multiclip/blobs").expanduser()
+        self.spill_threshold = spill_threshold
+        self.compress_threshold = compress_threshold
+        self.codec = codec
+        self.cache_entries = cache_entries
+        self.memory_budget = memory_budget
+        self.evict_threshold = evict_threshold
+        self.evict_retry = evict_retry_ms / 1000.0
+        self._evict_backoff = 0.0
+        self._evict_retry_at: Optional[float] = None
+        self._memory: Dict[int, str] = {}
+        self._compressed: Dict[int, Tuple[str, bytes]] = {}
+        self._spilled: Dict[int, _SpilledBlob] = {}
+        self._evicted: Dict[int, _EvictedBlob] = {}
+        self._cache: "OrderedDict[int, str]" = OrderedDict()
+        # Heap cost of each evictable memory/compressed entry, least recently used first
+        self._resident: "OrderedDict[int, int]" = OrderedDict()
+        self._resident_bytes = 0
+        # Heap cost of entries under evict_threshold, which are not tracked individually
+        self._small_bytes = 0
+        self._cache_bytes = 0
+        self.evictions = 0
+        self.faults = 0
+        self._listeners: List[Tuple[Callable[[int, str], None], Callable[[int], None]]] = []
+        self._refs: Dict[int, int] = {}
+        self._lock = threading.RLock()
+        self._spill_dir_ready = False
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._refs
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def add_listener(self, on_added: Callable[[int, str], None], on_removed: Callable[[int], None]):
+        """Be told when content first enters the store and when its last reference goes"""
+        self._listeners.append((on_added, on_removed))
+
+    def put(self, content: str, key: Optional[int] = None) -> int:
+        """Store content (or add a reference to it) and return its key"""
+        if key is None:
+            key = content_hash(content)
+        with self._lock:
+            # Count the reference only once the content is held, so a failed store leaves no phantom ref
+            refs = self._refs.get(key, 0)
+            stored = False
+            if refs == 0:
+                self._store(key, content)
+                stored = True
+            elif key in self._resident:
+                self._resident.move_to_end(key)
+            elif key in self._evicted:
+                # Stored again while evicted: the caller just handed us the text, no need to read it back
+                self._store(key, content)
+                self._evicted.pop(key).close()
+                stored = True
+            self._refs[key] = refs + 1
+            if stored:
+                self._enforce_budget(key)
+        if refs == 0:
+            for on_added, _ in self._listeners:
+                on_added(key, content)
+        return key
+
+    def _store(self, key: int, content: str):
+        compressible = self.compress_threshold is not None and len(content) >= self.compress_threshold
+        spillable = self.spill_threshold is not None and len(content) >= self.spill_threshold
+        if not (compressible or spillable):
+            self._keep_in_memory(key, content)
+            return
+        data = content.encode("utf-8", "surrogatepass")
+        codec, payload = compress(data, self.codec) if compressible else ("none", data)
+        if self.spill_threshold is not None and len(payload) >= self.spill_threshold:
+            self._spilled[key] = _SpilledBlob(self._spill_path(key), payload, codec)
+        elif codec != "none":
+            self._keep_compressed(key, codec, payload)
+        else:
+            self._keep_in_memory(key, content)
+
+    def _keep_in_memory(self, key: int, content: str):
+        self._memory[key] = content
+        self._track(key, sys.getsizeof(content))
+
+    def _keep_compressed(self, key: int, codec: str, payload: bytes):
+        self._compressed[key] = (codec, payload)
+        self._track(key, sys.getsizeof(payload))
+
+    def _heap_size(self, key: int) -> int:
+        content = self._memory.get(key)
+        if content is not None:
+            return sys.getsizeof(content)
+        compressed = self._compressed.get(key)
+        return sys.getsizeof(compressed[1]) if compressed is not None else 0
+
+    def _track(self, key: int, size: int):
+        if size < self.evict_threshold:
+            self._small_bytes += size
+            return
+        self._resident[key] = size
+        self._resident_bytes += size
+
+    def _untrack(self, key: int):
+        """Stop accounting for key; call before removing it from _memory/_compressed"""
+        size = self._resident.pop(key, None)
+        if size is not None:
+            self._resident_bytes -= size
+        else:
+            self._small_bytes -= self._heap_size(key)
+        cached = self._cache.pop(key, None)
+        if cached is not None:
+            self._cache_bytes -= sys.getsizeof(cached)
+
+    def _enforce_budget(self, keep: int):
+        """Drop cached copies, then evict least recently used entries, until within budget
+
+        keep (the entry just stored or faulted in) is never evicted, so one
+        entry larger than the whole budget stays resident until it is replaced.
+        Caller holds the lock.
+        """
+        if self.memory_budget is None:
+            return
+        evict = self._evict_retry_at is None or time.monotonic() >= self._evict_retry_at
+        while self._resident_bytes + self._cache_bytes > self.memory_budget:
+            if self._cache:
+                _, cached = self._cache.popitem(last=False)
+                self._cache_bytes -= sys.getsizeof(cached)
+                continue
+            victim = next((key for key in self._resident if key != keep), None)
+            if victim is None or not evict or not self._evict(victim):
+                return
+
+    def _evict(self, key: int) -> bool:
+        """Move key to a file in spill_dir; on failure leave it resident and back off"""
+        compressed = self._compressed.get(key)
+        if compressed is not None:
+            codec, payload = compressed
+        else:
+            codec, payload = compress(self._memory[key].encode("utf-8", "surrogatepass"), self.codec)
+        try:
+            evicted = _EvictedBlob(self._spill_path(key), payload, codec, compressed is not None)
+        except OSError as e:
+            # Disk full or unwritable: keep the entry where it is and try again later
+            self._evict_backoff = min(60.0, self._evict_backoff * 2 if self._evict_backoff else self.evict_retry)
+            self._evict_retry_at = time.monotonic() + self._evict_backoff
+            print(f"Could not evict clipboard payload to {self.spill_dir}, "
+                  f"retrying in {self._evict_backoff:.0f}s: {e}")
+            return False
+        self._untrack(key)
+        self._compressed.pop(key, None)
+        self._memory.pop(key, None)
+        self._evicted[key] = evicted
+        self._evict_backoff = 0.0
+        self._evict_retry_at = None
+        self.evictions += 1
+        return True
+
+    def _fault_in(self, key: int, evicted: _EvictedBlob) -> str:
+        """Bring an evicted entry back into memory as the most recently used (caller holds the lock)"""
+        payload = evicted.read_payload()
+        content = decompress(payload, evicted.codec).decode("utf-8", "surrogatepass")
+        del self._evicted[key]
+        evicted.close()
+        if evicted.was_compressed:
+            self._keep_compressed(key, evicted.codec, payload)
+            self._remember(key, content)
+        else:
+            self._keep_in_memory(key, content)
+        self.faults += 1
+        self._enforce_budget(key)
+        return content
+
+    def _spill_path(self, key: int) -> Path:
+        if not self._spill_dir_ready:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._remove_stale_spills()
+            self._spill_dir_ready = True
+        return self.spill_dir / f"{key:016x}.{os.getpid()}.blob"
+
+    def _remove_stale_spills(self):
+        """Delete spill files left behind by processes that no longer exist"""
+        for path in self.spill_dir.glob("*.blob"):
+            try:
+                pid = int(path.suffixes[-2].lstrip("."))
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                path.unlink()
+            except (ValueError, IndexError, PermissionError):
+                continue
+
+    def get(self, key: int, touch: bool = True) -> str:
+        """Content for key; with touch (the default) it becomes the most recently used"""
+        with self._lock:
+            if touch and key in self._resident:
+                self._resident.move_to_end(key)
+            content = self._memory.get(key)
+            if content is None:
+                content = self._cache.get(key)
+                if content is not None and touch:
+                    self._cache.move_to_end(key)
+            if content is not None:
+                return content
+            compressed = self._compressed.get(key)
+            if compressed is None:
+                evicted = self._evicted.get(key)
+                if evicted is not None:
+                    return self._fault_in(key, evicted) if touch else evicted.read()
+                spilled = self._spilled.get(key)
+                if spilled is None:
+                    raise KeyError(key)
+                content = spilled.read()
+                if touch and spilled.codec != "none":
+                    self._remember(key, content)
+                return content
+
+        # Decompress outside the lock; the payload bytes are immutable
+        codec, payload = compressed
+        content = decompress(payload, codec).decode("utf-8", "surrogatepass")
+        if touch:
+            with self._lock:
+                if key in self._compressed:
+                    self._remember(key, content)
+        return content
+
+    def preview(self, key: int, chars: int = 50) -> str:
+        """The first chars characters of key's content, decompressing or reading only what that needs
+
+        Read-only like peek(): nothing is cached, faulted in or made recently used.
+        """
+        with self._lock:
+            content = self._memory.get(key)
+            if content is None:
+                content = self._cache.get(key)
+            if content is not None:
+                return content[:chars]
+            compressed = self._compressed.get(key)
+            spilled = self._spilled.get(key)
+            evicted = self._evicted.get(key)
+            if compressed is None and spilled is None and evicted is None:
+                raise KeyError(key)
+            # Files are read under the lock, since release() may delete them
+            if spilled is not None:
+                data = spilled.read_prefix(chars * 4)
+            elif evicted is not None:
+                data = decompress_prefix(evicted.read_payload(), evicted.codec, chars * 4)
+        if compressed is not None:
+            data = decompress_prefix(compressed[1], compressed[0], chars * 4)
+        # The byte cut may split a character; drop the partial one
+        return data.decode("utf-8", "ignore")[:chars]
+
+    def peek(self, key: int) -> str:
+        """Content for key without making it recently used, caching it or faulting it back in"""
+        return self.get(key, touch=False)
+
+    def _remember(self, key: int, content: str):
+        """Keep a decompressed payload in the LRU cache (caller holds the lock)"""
+        if self.cache_entries <= 0:
+            return
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._cache_bytes -= sys.getsizeof(previous)
+        self._cache[key] = content
+        self._cache_bytes += sys.getsizeof(content)
+        while len(self._cache) > self.cache_entries:
+            _, dropped = self._cache.popitem(last=False)
+            self._cache_bytes -= sys.getsizeof(dropped)
+        self._enforce_budget(key)
+
+    def codec_of(self, key: int) -> Optional[str]:
+        """Codec an entry is stored with, or None if it is held as plain text"""
+        with self._lock:
+            if key in self._compressed:
+                return self._compressed[key][0]
+            if key in self._spilled:
+                return self._spilled[key].codec
+            if key in self._evicted:
+                return self._evicted[key].codec
+            return None
+
+    def info(self, key: int) -> Optional[BlobInfo]:
+        """Memory accounting for one entry, or None if it is not stored"""
+        with self._lock:
+            refs = self._refs.get(key)
+            if refs is None:
+                return None
+            cached = self._cache.get(key)
+            cached_bytes = sys.getsizeof(cached) if cached is not None else 0
+            if key in self._memory:
+                content = self._memory[key]
+                return BlobInfo("memory", sys.getsizeof(content), len(content), None, refs)
+            if key in self._compressed:
+                codec, payload = self._compressed[key]
+                return BlobInfo("compressed", sys.getsizeof(payload) + cached_bytes, len(payload),
+                                codec, refs)
+            blob = self._spilled.get(key)
+            location = "spilled"
+            if blob is None:
+                blob = self._evicted[key]
+                location = "evicted"
+            return BlobInfo(location, cached_bytes, blob.size, blob.codec, refs)
+
+    def acquire(self, key: int):
+        """Add a reference to content that is already stored"""
+        with self._lock:
+            if key not in self._refs:
+                raise KeyError(key)
+            self._refs[key] += 1
+
+    def release(self, key: int):
+        """Drop one reference; content is freed when none remain"""
+        with self._lock:
+            refs = self._refs.get(key)
+            if refs is None:
+                return
+            if refs > 1:
+                self._refs[key] = refs - 1
+                return
+            del self._refs[key]
+            self._untrack(key)
+            self._memory.pop(key, None)
+            self._compressed.pop(key, None)
+            spilled = self._spilled.pop(key, None) or self._evicted.pop(key, None)
+        if spilled is not None:
+            spilled.close()
+        for _, on_removed in self._listeners:
+            on_removed(key)
+
+    def refcount(self, key: int) -> int:
+        return self._refs.get(key, 0)
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        with self._lock:
+            return {
+                "resident_bytes": self._resident_bytes + self._small_bytes + self._cache_bytes,
+                "memory_budget": self.memory_budget,
+                "blobs": len(self._refs),
+                "memory_blobs": len(self._memory),
+                "memory_chars": sum(len(content) for content in self._memory.values()),
+                "compressed_blobs": len(self._compressed),
+                "compressed_bytes": sum(len(payload) for _, payload in self._compressed.values()),
+                "cached_blobs": len(self._cache),
+                "spilled_blobs": len(self._spilled),
+                "spilled_bytes": sum(blob.size for blob in self._spilled.values()),
+                "evicted_blobs": len(self._evicted),
+                "evicted_bytes": sum(blob.size for blob in self._evicted.values()),
+                "evictions": self.evictions,
+                "faults": self.faults,
+            }
+
+    def close(self):
+        with self._lock:
+            on_disk = list(self._spilled.items()) + list(self._evicted.items())
+            self._spilled, self._evicted = {}, {}
+            for key, _ in on_disk:
+                self._refs.pop(key, None)
+            self._cache.clear()
+            self._cache_bytes = 0
+        for _, blob in on_disk:
+            blob.close()
+
+
+_default_store: Optional[BlobStore] = None
+_default_lock = threading.Lock()
+
+
+def default_blob_store() -> BlobStore:
+    """Process-wide store shared by slots and history that were not given one"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = BlobStore()
+        return _default_store
@@ -0,0 +1,289 @@
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+
+class ClipboardBackend:
+    """Base class for clipboard read/write access"""
+    name = "base"
+
+    def copy(self, text: str):
+        raise NotImplementedError
+
+    def paste(self) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyperclipBackend(ClipboardBackend):
+    """pyperclip, which starts an xclip/xsel process for every call"""
+    name = "pyperclip"
+
+    def __init__(self):
+        import pyperclip
+        self._pyperclip = pyperclip
+
+    def copy(self, text: str):
+        self._pyperclip.copy(text)
+
+    def paste(self) -> str:
+        return self._pyperclip.paste()
+
+
+class MemoryClipboardBackend(ClipboardBackend):
+    """Process-local clipboard for headless runs and benchmarks"""
+    name = "memory"
+
+    def __init__(self, content: str = ""):
+        self._content = content
+        self._lock = threading.Lock()
+
+    def copy(self, text: str):
+        with self._lock:
+            self._content = text
+
+    def paste(self) -> str:
+        with self._lock:
+            return self._content
+
+
+_HELPER_SOURCE = r'''
+import json
+import sys
+import tkinter as tk
+
+root = tk.Tk()
+root.withdraw()
+
+def handle(fileobj, mask):
+    line = sys.stdin.readline()
+    if not line:
+        root.destroy()
+        return
+    try:
+        request = json.loads(line)
+        if request["op"] == "copy":
+            root.clipboard_clear()
+            root.clipboard_append(request["text"])
+            response = {"ok": True}
+        elif request["op"] == "paste":
+            try:
+                text = root.clipboard_get()
+            except tk.TclError:
+                text = ""
+            response = {"ok": True, "text": text}
+        else:
+            response = {"ok": False, "error": "unknown op " + str(request["op"])}
+    except Exception as e:
+        response = {"ok": False, "error": str(e)}
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+
+root.tk.createfilehandler(sys.stdin, tk.READABLE, handle)
+sys.stdout.write("ready\n")
+sys.stdout.flush()
+root.mainloop()
+'''
+
+
+class TkHelperBackend(ClipboardBackend):
+    """Serves reads and writes from one long-lived Tk helper process over a pipe
+
+    The helper owns the selection while it runs, so copied content stays
+    available to other applications without a per-copy xclip process.
+    Replies are read from the raw pipe with a deadline of timeout seconds;
+    a helper that hangs or dies is killed, reaped and started again.
+    """
+    name = "tk-helper"
+
+    def __init__(self, timeout: float = 2.0, start_timeout: float = 10.0):
+        if not os.environ.get("DISPLAY"):
+            raise OSError("No X display for clipboard helper")
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._pending = bytearray()
+        self._start()
+
+    def _start(self):
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+        self._process = subprocess.Popen(
+            [sys.executable, "-c", _HELPER_SOURCE],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env
+        )
+        self._pending = bytearray()
+        try:
+            ready = self._read_line(self.start_timeout)
+        except OSError:
+            ready = ""
+        if ready.strip() != "ready":
+            self._discard()
+            raise OSError("Clipboard helper failed to start")
+
+    def _read_line(self, timeout: float) -> str:
+        """Next line from the helper, or TimeoutError once timeout seconds pass without one
+
+        Reads the pipe's file descriptor directly: select() on a buffered file
+        object cannot see data already pulled into its buffer.
+        """
+        deadline = time.monotonic() + timeout
+        fd = self._process.stdout.fileno()
+        buffer = self._pending
+        scanned = 0
+        while True:
+            end = buffer.find(b"\n", scanned)
+            if end >= 0:
+                break
+            scanned = len(buffer)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError("Clipboard helper did not respond")
+            chunk = os.read(fd, 64 * 1024)
+            if not chunk:
+                raise BrokenPipeError("Clipboard helper exited")
+            buffer += chunk
+        line = bytes(buffer[:end])
+        self._pending = buffer[end + 1:]
+        return line.decode("utf-8")
+
+    def _discard(self):
+        """Kill and reap the helper so a hung or broken one never lingers as a zombie"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.kill()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        for pipe in (process.stdin, process.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def _request(self, request: dict) -> dict:
+        with self._lock:
+            for attempt in range(2):
+                if self._process is None or self._process.poll() is not None:
+                    self._discard()
+                    self._start()
+                try:
+                    self._process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+                    self._process.stdin.flush()
+                    line = self._read_line(self.timeout)
+                    break
+                except OSError:
+                    # Includes BrokenPipeError and TimeoutError: replace the helper and retry once
+                    self._discard()
+                    if attempt:
+                        raise
+
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "clipboard helper error"))
+        return response
+
+    def copy(self, text: str):
+        self._request({"op": "copy", "text": text})
+
+    def paste(self) -> str:
+        return self._request({"op": "paste"})["text"]
+
+    def close(self):
+        with self._lock:
+            if self._process and self._process.poll() is None:
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=1)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._discard()
+
+
+class FallbackClipboardBackend(ClipboardBackend):
+    """Uses the primary backend and drops to the fallback if it fails"""
+
+    def __init__(self, primary: ClipboardBackend, fallback_factory=PyperclipBackend):
+        self.primary = primary
+        self.fallback_factory = fallback_factory
+        self._fallback: Optional[ClipboardBackend] = None
+        self.name = primary.name
+
+    def _get_fallback(self) -> ClipboardBackend:
+        if self._fallback is None:
+            self._fallback = self.fallback_factory()
+        return self._fallback
+
+    def copy(self, text: str):
+        try:
+            self.primary.copy(text)
+        except Exception as e:
+            print(f"Clipboard backend {self.primary.name} failed, using fallback: {e}")
+            self._get_fallback().copy(text)
+
+    def paste(self) -> str:
+        try:
+            return self.primary.paste()
+        except Exception as e:
+            print(f"Clipboard backend {self.primary.name} failed, using fallback: {e}")
+            return self._get_fallback().paste()
+
+    def close(self):
+        self.primary.close()
+        if self._fallback:
+            self._fallback.close()
+
+
+BACKENDS = {
+    "tk-helper": TkHelperBackend,
+    "pyperclip": PyperclipBackend,
+    "memory": MemoryClipboardBackend,
+}
+
+_default_backend: Optional[ClipboardBackend] = None
+_default_lock = threading.Lock()
+
+
+def create_backend(preferred: Optional[str] = None) -> ClipboardBackend:
+    """Build a backend, preferring the persistent helper with pyperclip as fallback"""
+    if preferred in ("pyperclip", "memory"):
+        return BACKENDS[preferred]()
+    try:
+        return FallbackClipboardBackend(TkHelperBackend())
+    except Exception as e:
+        print(f"Persistent clipboard helper unavailable, using pyperclip: {e}")
+        return PyperclipBackend()
+
+
+def set_clipboard_backend(backend: ClipboardBackend):
+    global _default_backend
+    with _default_lock:
+        _default_backend = backend
+
+
+def get_clipboard() -> ClipboardBackend:
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            _default_backend = create_backend(os.environ.get("MULTICLIP_CLIPBOARD_BACKEND"))
+        return _default_backend
+
+
+def copy(text: str):
+    get_clipboard().copy(text)
+
+
+def paste() -> str:
+    return get_clipboard().paste()
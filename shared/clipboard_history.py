@@ -0,0 +1,193 @@
+import time
+from array import array
+from typing import Iterator, List, NamedTuple, Optional
+from shared.blob_store import BlobStore, content_hash, default_blob_store
+
+
+class HistoryEntry(NamedTuple):
+    content_hash: int
+    content: str  # "" when read without content
+    timestamp: float
+    count: int
+    preview: str = ""
+
+
+PREVIEW_CHARS = 50
+
+
+class ClipboardHistory:
+    """Bounded, deduplicated clipboard history
+
+    Entries live in a ring of parallel typed arrays (hash, timestamp, copy
+    count) and are found by hash through an open-addressing table of ring
+    slots, so per-entry metadata costs a few dozen bytes instead of several
+    Python objects. Content is held by reference in a BlobStore keyed by the
+    same hash. Re-copying known content tombstones its old ring slot (count
+    0) and re-appends it at the head; eviction advances the tail past
+    tombstones and releases the blob. Both are amortized O(1).
+    """
+
+    def __init__(self, max_entries: int = 100, blob_store: Optional[BlobStore] = None):
+        self.max_entries = max(1, max_entries)
+        self.blob_store = blob_store if blob_store is not None else default_blob_store()
+        self._allocate(max(self.max_entries + self.max_entries // 4, 16))
+        table_size = 16
+        while table_size < 2 * self.max_entries:
+            table_size *= 2
+        self._table = array('I', bytes(4 * table_size))
+        self._mask = table_size - 1
+        self._size = 0
+
+    def _allocate(self, capacity: int):
+        self._capacity = capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._times = array('d', bytes(8 * capacity))
+        self._counts = array('I', bytes(4 * capacity))
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, hash_value: int) -> bool:
+        return self._find(hash_value) >= 0
+
+    def _find(self, hash_value: int) -> int:
+        """Return the table index holding hash_value, or -1"""
+        i = hash_value & self._mask
+        while True:
+            ref = self._table[i]
+            if ref == 0:
+                return -1
+            if self._hashes[ref - 1] == hash_value:
+                return i
+            i = (i + 1) & self._mask
+
+    def _insert(self, hash_value: int, slot: int):
+        i = hash_value & self._mask
+        while self._table[i]:
+            i = (i + 1) & self._mask
+        self._table[i] = slot + 1
+
+    def _delete(self, i: int):
+        # Backward-shift deletion keeps probe chains intact without tombstones
+        table, mask = self._table, self._mask
+        table[i] = 0
+        j = i
+        while True:
+            j = (j + 1) & mask
+            ref = table[j]
+            if ref == 0:
+                return
+            home = self._hashes[ref - 1] & mask
+            if (i < j and (home <= i or home > j)) or (i > j and home <= i and home > j):
+                table[i] = ref
+                table[j] = 0
+                i = j
+
+    def add(self, content: str, timestamp: Optional[float] = None) -> Optional[int]:
+        """Record content as the most recent entry and return its hash"""
+        if not content:
+            return None
+
+        timestamp = time.time() if timestamp is None else timestamp
+        hash_value = content_hash(content)
+        count = 1
+
+        i = self._find(hash_value)
+        if i >= 0:
+            old_slot = self._table[i] - 1
+            count = self._counts[old_slot] + 1
+            self._counts[old_slot] = 0
+            self._delete(i)
+            self._size -= 1
+        else:
+            self.blob_store.put(content, hash_value)
+
+        if self._head - self._tail >= self._capacity:
+            self._compact()
+
+        slot = self._head % self._capacity
+        self._hashes[slot] = hash_value
+        self._times[slot] = timestamp
+        self._counts[slot] = count
+        self._insert(hash_value, slot)
+        self._head += 1
+        self._size += 1
+
+        while self._size > self.max_entries:
+            self._evict_oldest()
+        self._skip_tombstones()
+        return hash_value
+
+    def _skip_tombstones(self):
+        while self._tail < self._head and self._counts[self._tail % self._capacity] == 0:
+            self._tail += 1
+
+    def _evict_oldest(self):
+        self._skip_tombstones()
+        slot = self._tail % self._capacity
+        hash_value = self._hashes[slot]
+        self._delete(self._find(hash_value))
+        self._counts[slot] = 0
+        self.blob_store.release(hash_value)
+        self._tail += 1
+        self._size -= 1
+
+    def _compact(self):
+        live = list(self._iter_slots(newest_first=False))
+        old_hashes, old_times, old_counts = self._hashes, self._times, self._counts
+        self._allocate(self._capacity)
+        self._table = array('I', bytes(4 * len(self._table)))
+        for slot, old_slot in enumerate(live):
+            self._hashes[slot] = old_hashes[old_slot]
+            self._times[slot] = old_times[old_slot]
+            self._counts[slot] = old_counts[old_slot]
+            self._insert(old_hashes[old_slot], slot)
+        self._head = len(live)
+
+    def _iter_slots(self, newest_first: bool = True) -> Iterator[int]:
+        positions = range(self._head - 1, self._tail - 1, -1) if newest_first else range(self._tail, self._head)
+        for position in positions:
+            slot = position % self._capacity
+            if self._counts[slot]:
+                yield slot
+
+    def _entry(self, slot: int, touch: bool = True, with_content: bool = True) -> HistoryEntry:
+        hash_value = self._hashes[slot]
+        if with_content:
+            content = self.blob_store.get(hash_value, touch)
+            preview = content[:PREVIEW_CHARS]
+        else:
+            content, preview = "", self.blob_store.preview(hash_value, PREVIEW_CHARS)
+        return HistoryEntry(hash_value, content, self._times[slot], self._counts[slot], preview)
+
+    def get(self, hash_value: int) -> Optional[HistoryEntry]:
+        i = self._find(hash_value)
+        if i < 0:
+            return None
+        return self._entry(self._table[i] - 1)
+
+    def latest(self, limit: Optional[int] = None, with_content: bool = True) -> List[HistoryEntry]:
+        """Return entries newest first, without counting as a use of their content
+
+        with_content=False leaves content empty and only reads each preview.
+        """
+        entries = []
+        for slot in self._iter_slots():
+            if limit is not None and len(entries) >= limit:
+                break
+            entries.append(self._entry(slot, touch=False, with_content=with_content))
+        return entries
+
+    def clear(self):
+        for slot in self._iter_slots():
+            self.blob_store.release(self._hashes[slot])
+        self._allocate(self._capacity)
+        self._table = array('I', bytes(4 * len(self._table)))
+        self._size = 0
+
+    def metadata_bytes(self) -> int:
+        """Memory held by history bookkeeping, excluding content in the blob store"""
+        arrays = (self._hashes, self._times, self._counts, self._table)
+        return sum(len(a) * a.itemsize for a in arrays)
@@ -1,107 +1,395 @@
-import pyperclip
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, Any
 import threading
-import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Any, Tuple, Union
+from shared import clipboard_backend as clipboard
+from shared.blob_store import BlobInfo, BlobStore, default_blob_store
+from shared.clipboard_history import ClipboardHistory, HistoryEntry
+from shared.clipboard_watcher import ClipboardChange, ClipboardWatcher, WatcherBackend
+from shared.text_index import TextIndex
 
 class ClipboardSlot:
-    def __init__(self, slot_id: int, content: str = "", content_type: str = "text"):
+    def __init__(self, slot_id: int, content: str = "", content_type: str = "text",
+                 blob_store: Optional[BlobStore] = None, name: Optional[str] = None):
         self.id = slot_id
-        self.content = content
+        self.name = name
+        self.blob_store = blob_store if blob_store is not None else default_blob_store()
+        self.blob_key: Optional[int] = None
+        self.length = 0
         self.timestamp = datetime.now()
         self.content_type = content_type
-        self.preview = self._generate_preview()
+        self._set_content(content)
+    
+    @property
+    def content(self) -> str:
+        if self.blob_key is None:
+            return ""
+        return self.blob_store.get(self.blob_key)
+    
+    def peek_content(self) -> str:
+        """Content without counting as a use under the blob store's memory budget"""
+        if self.blob_key is None:
+            return ""
+        return self.blob_store.peek(self.blob_key)
+    
+    def memory_usage(self) -> Optional[BlobInfo]:
+        return self.blob_store.info(self.blob_key) if self.blob_key is not None else None
+    
+    def _set_content(self, content: str):
+        # Take the new reference before dropping the old one so identical content is never freed
+        old_key = self.blob_key
+        self.blob_key = self.blob_store.put(content) if content else None
+        if old_key is not None:
+            self.blob_store.release(old_key)
+        self.length = len(content)
+        self.preview = self._generate_preview(content)
     
-    def _generate_preview(self) -> str:
-        if len(self.content) <= 50:
-            return self.content
-        return self.content[:47] + "..."
+    @staticmethod
+    def _generate_preview(content: str) -> str:
+        if len(content) <= 50:
+            return content
+        return content[:47] + "..."
+    
+    def _adopt(self, blob_key: Optional[int], length: int, preview: str):
+        """Take over an already-held reference to blob_key in place of the current content"""
+        old_key = self.blob_key
+        self.blob_key, self.length, self.preview = blob_key, length, preview
+        if old_key is not None:
+            self.blob_store.release(old_key)
     
     def update_content(self, content: str, content_type: str = "text"):
-        self.content = content
         self.content_type = content_type
         self.timestamp = datetime.now()
-        self.preview = self._generate_preview()
+        self._set_content(content)
+    
+    def release(self):
+        """Drop this slot's reference to its content"""
+        self._set_content("")
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
-            "content": self.content,
+            "name": self.name,
+            "content": self.peek_content(),
             "timestamp": self.timestamp.isoformat(),
             "content_type": self.content_type,
             "preview": self.preview
         }
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        slot = cls(data["id"], data["content"], data["content_type"])
+    def from_dict(cls, data: Dict[str, Any], blob_store: Optional[BlobStore] = None):
+        slot = cls(data["id"], data["content"], data["content_type"], blob_store, data.get("name"))
         slot.timestamp = datetime.fromisoformat(data["timestamp"])
         return slot
 
+SlotRef = Union[int, str]
+
+class SlotSnapshot(NamedTuple):
+    """Immutable view of one slot, safe to hand to other threads"""
+    slot_id: int
+    name: Optional[str]
+    content: str
+    preview: str
+    length: int
+    content_type: str
+    timestamp: datetime
+    memory: Optional[BlobInfo] = None
+
+class SearchHit(NamedTuple):
+    """Content matching a search, with the slots and history entry that hold it"""
+    content_hash: int
+    slot_ids: Tuple[int, ...]
+    in_history: bool
+    preview: str
+    timestamp: float
+
 class ClipboardManager:
-    def __init__(self, num_slots: int = 10):
+    """Owns slot data; writers hold the manager lock, readers get snapshots
+    
+    Subscribers are called after the lock is released, on the writer's thread.
+    """
+    
+    def __init__(self, num_slots: int = 10, max_history: int = 100,
+                 blob_store: Optional[BlobStore] = None):
+        self._lock = threading.RLock()
+        # Slots are created on first write, so thousands of configured slots cost nothing until used
         self.slots: Dict[int, ClipboardSlot] = {}
         self.num_slots = num_slots
+        self._slot_ids_by_name: Dict[str, int] = {}
+        self._slot_names: Dict[int, str] = {}
+        self.blob_store = blob_store if blob_store is not None else default_blob_store()
+        self.history = ClipboardHistory(max_history, self.blob_store)
+        # Full-text index follows content as it enters and leaves the blob store
+        self.index = TextIndex(self.blob_store.peek)
+        self.blob_store.add_listener(self.index.add, self.index.remove)
         self.current_clipboard = ""
         self.monitoring = False
-        self.monitor_thread = None
-        self._initialize_slots()
+        self.record_history = True
+        self.watcher: Optional[ClipboardWatcher] = None
+        self._clipboard_listeners: List[Callable[[ClipboardChange], None]] = []
+        self._subscribers: List[Callable[[List[int]], None]] = []
+        # Open transaction state: nesting depth and, per touched slot, a held reference to its
+        # pre-transaction blob (None if the slot did not exist)
+        self._txn_depth = 0
+        self._txn_undo: Dict[int, Optional[Tuple[Optional[int], int, str, str, datetime]]] = {}
+    
+    def _get_or_create_slot(self, slot_id: int) -> ClipboardSlot:
+        slot = self.slots.get(slot_id)
+        if slot is None:
+            slot = ClipboardSlot(slot_id, blob_store=self.blob_store,
+                                 name=self._slot_names.get(slot_id))
+            self.slots[slot_id] = slot
+        return slot
     
-    def _initialize_slots(self):
-        for i in range(self.num_slots):
-            self.slots[i] = ClipboardSlot(i)
+    def resolve_slot(self, slot_ref: SlotRef) -> Optional[int]:
+        """Map a slot id or slot name to a valid slot id"""
+        if isinstance(slot_ref, str):
+            return self._slot_ids_by_name.get(slot_ref)
+        if 0 <= slot_ref < self.num_slots:
+            return slot_ref
+        return None
     
-    def store_in_slot(self, slot_id: int, content: str, content_type: str = "text") -> bool:
-        if 0 <= slot_id < self.num_slots:
-            self.slots[slot_id].update_content(content, content_type)
+    def name_slot(self, slot_id: int, name: Optional[str]) -> bool:
+        """Attach a name to a slot, or remove it with None"""
+        with self._lock:
+            if self.resolve_slot(slot_id) is None:
+                return False
+            if name and self._slot_ids_by_name.get(name, slot_id) != slot_id:
+                return False
+            old_name = self._slot_names.pop(slot_id, None)
+            if old_name:
+                del self._slot_ids_by_name[old_name]
+            if name:
+                self._slot_names[slot_id] = name
+                self._slot_ids_by_name[name] = slot_id
+            if slot_id in self.slots:
+                self.slots[slot_id].name = name or None
             return True
-        return False
     
-    def get_slot_content(self, slot_id: int) -> Optional[str]:
-        if 0 <= slot_id < self.num_slots:
-            return self.slots[slot_id].content
-        return None
+    def get_slot_name(self, slot_id: int) -> Optional[str]:
+        return self._slot_names.get(slot_id)
     
-    def get_slot_preview(self, slot_id: int) -> Optional[str]:
-        if 0 <= slot_id < self.num_slots:
-            return self.slots[slot_id].preview
-        return None
+    def subscribe(self, callback: Callable[[List[int]], None]):
+        """Register a callback invoked with the ids of slots that changed"""
+        self._subscribers.append(callback)
     
-    def copy_to_slot(self, slot_id: int) -> bool:
+    def unsubscribe(self, callback: Callable[[List[int]], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    def _notify(self, slot_ids: List[int]):
+        for callback in list(self._subscribers):
+            try:
+                callback(slot_ids)
+            except Exception as e:
+                print(f"Slot subscriber error: {e}")
+    
+    @contextmanager
+    def transaction(self):
+        """Apply many slot changes as one: subscribers are notified once, with every changed slot
+        
+        If the block raises, touched slots are restored and nobody is notified.
+        Nested transactions join the outermost one. The manager lock is held for
+        the whole block, so other writers wait and readers never see half of it.
+        """
+        changed: List[int] = []
+        with self._lock:
+            self._txn_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._txn_depth == 1:
+                    self._rollback()
+                raise
+            finally:
+                self._txn_depth -= 1
+            if self._txn_depth == 0 and self._txn_undo:
+                changed = list(self._txn_undo)
+                self._commit()
+        if changed:
+            self._notify(changed)
+    
+    def _commit(self):
+        undo, self._txn_undo = self._txn_undo, {}
+        for previous in undo.values():
+            if previous is not None and previous[0] is not None:
+                self.blob_store.release(previous[0])
+    
+    def _rollback(self):
+        undo, self._txn_undo = self._txn_undo, {}
+        for slot_id, previous in undo.items():
+            if previous is None:
+                self.slots.pop(slot_id).release()
+                continue
+            # The reference held since _apply goes back to the slot; no content is read or stored
+            blob_key, length, preview, content_type, timestamp = previous
+            slot = self.slots[slot_id]
+            slot._adopt(blob_key, length, preview)
+            slot.content_type = content_type
+            slot.timestamp = timestamp
+    
+    def _apply(self, slot_id: int, content: str, content_type: str):
+        """Change one slot inside the open transaction (caller holds the lock)"""
+        if slot_id not in self._txn_undo:
+            slot = self.slots.get(slot_id)
+            if slot is None:
+                self._txn_undo[slot_id] = None
+            else:
+                # Hold the old blob so a rollback can restore it without copying the content
+                if slot.blob_key is not None:
+                    self.blob_store.acquire(slot.blob_key)
+                self._txn_undo[slot_id] = (slot.blob_key, slot.length, slot.preview,
+                                           slot.content_type, slot.timestamp)
+        slot = self._get_or_create_slot(slot_id)
+        slot.update_content(content, content_type)
+        if slot.blob_key is not None:
+            self.index.touch(slot.blob_key)
+    
+    def store_in_slot(self, slot_ref: SlotRef, content: str, content_type: str = "text") -> bool:
+        slot_id = self.resolve_slot(slot_ref)
+        if slot_id is None:
+            return False
+        with self.transaction():
+            self._apply(slot_id, content, content_type)
+        return True
+    
+    def store_many(self, items: Union[Dict[SlotRef, str], Iterable[Tuple[SlotRef, str]]],
+                   content_type: str = "text") -> bool:
+        """Store several slots in one transaction; nothing is stored if any slot is invalid"""
+        pairs = list(items.items() if isinstance(items, dict) else items)
+        slot_ids = [self.resolve_slot(slot_ref) for slot_ref, _ in pairs]
+        if any(slot_id is None for slot_id in slot_ids):
+            return False
+        with self.transaction():
+            for slot_id, (_, content) in zip(slot_ids, pairs):
+                self._apply(slot_id, content, content_type)
+        return True
+    
+    def get_many(self, slot_refs: Iterable[SlotRef]) -> List[Optional[str]]:
+        """Contents for several slots in order, None for refs that do not name a slot"""
+        with self._lock:
+            return [self.get_slot_content(slot_ref) for slot_ref in slot_refs]
+    
+    def get_slot_content(self, slot_ref: SlotRef) -> Optional[str]:
+        slot_id = self.resolve_slot(slot_ref)
+        if slot_id is None:
+            return None
+        with self._lock:
+            slot = self.slots.get(slot_id)
+            return slot.content if slot else ""
+    
+    def get_slot_preview(self, slot_ref: SlotRef) -> Optional[str]:
+        slot_id = self.resolve_slot(slot_ref)
+        if slot_id is None:
+            return None
+        with self._lock:
+            slot = self.slots.get(slot_id)
+            return slot.preview if slot else ""
+    
+    def snapshot(self, slot_ids: Optional[Iterable[int]] = None,
+                 with_content: bool = True) -> Dict[int, SlotSnapshot]:
+        """Immutable views of the given slots (all existing slots by default)
+        
+        Slots that were never written are omitted. Pass with_content=False to skip
+        reading payloads when only previews and sizes are needed. Reading for a
+        snapshot does not count as a use of the content, so views do not keep
+        payloads in memory under the blob store's budget.
+        """
+        with self._lock:
+            ids = list(self.slots) if slot_ids is None else slot_ids
+            snapshots = {}
+            for slot_id in ids:
+                slot = self.slots.get(slot_id)
+                if slot is None:
+                    continue
+                snapshots[slot_id] = SlotSnapshot(
+                    slot_id, slot.name, slot.peek_content() if with_content else "",
+                    slot.preview, slot.length, slot.content_type, slot.timestamp, slot.memory_usage()
+                )
+            return snapshots
+    
+    def history_snapshot(self, limit: Optional[int] = None, with_content: bool = True) -> List[HistoryEntry]:
+        """Newest-first history entries, copied out under the manager lock
+        
+        Pass with_content=False when previews are enough: large entries are then
+        not decompressed or read back from disk.
+        """
+        with self._lock:
+            return self.history.latest(limit, with_content)
+    
+    def search(self, query: str, limit: Optional[int] = 20, tokens: bool = False) -> List[SearchHit]:
+        """Find slot and history content containing query (or all its word tokens), newest first"""
+        hits = []
+        # Over-fetch a little: keys held only by other owners of a shared blob store are skipped
+        keys = self.index.search(query, None if limit is None else limit * 2, tokens)
+        with self._lock:
+            slots_by_key: Dict[int, List[int]] = {}
+            for slot_id, slot in self.slots.items():
+                if slot.blob_key is not None:
+                    slots_by_key.setdefault(slot.blob_key, []).append(slot_id)
+            for key in keys:
+                entry = self.history.get(key)
+                slot_ids = tuple(sorted(slots_by_key.get(key, ())))
+                if entry is None and not slot_ids:
+                    continue
+                if entry is not None:
+                    preview, timestamp = entry.preview, entry.timestamp
+                else:
+                    slot = self.slots[slot_ids[0]]
+                    preview, timestamp = slot.preview, slot.timestamp.timestamp()
+                hits.append(SearchHit(key, slot_ids, entry is not None, preview, timestamp))
+                if limit is not None and len(hits) >= limit:
+                    break
+        return hits
+    
+    def rebuild_index(self):
+        """Rebuild the full-text index from current slot and history content"""
+        with self._lock:
+            # Oldest use first, so the rebuilt index keeps recency order
+            used: Dict[int, float] = {}
+            for slot in self.slots.values():
+                if slot.blob_key is not None:
+                    used[slot.blob_key] = max(used.get(slot.blob_key, 0.0), slot.timestamp.timestamp())
+            for entry in self.history.latest():
+                used[entry.content_hash] = max(used.get(entry.content_hash, 0.0), entry.timestamp)
+            keys = sorted(used, key=used.get)
+            self.index.rebuild((key, self.blob_store.peek(key)) for key in keys)
+    
+    def copy_to_slot(self, slot_id: SlotRef) -> bool:
         try:
-            content = pyperclip.paste()
+            content = clipboard.paste()
             return self.store_in_slot(slot_id, content)
         except Exception:
             return False
     
-    def paste_from_slot(self, slot_id: int) -> bool:
+    def paste_from_slot(self, slot_id: SlotRef) -> bool:
         content = self.get_slot_content(slot_id)
         if content is not None:
             try:
-                pyperclip.copy(content)
+                clipboard.copy(content)
                 return True
             except Exception:
                 return False
         return False
     
     def get_all_slots_status(self) -> Dict[int, Dict[str, Any]]:
-        return {slot_id: slot.to_dict() for slot_id, slot in self.slots.items()}
+        with self._lock:
+            return {slot_id: slot.to_dict() for slot_id, slot in self.slots.items()}
     
-    def clear_slot(self, slot_id: int) -> bool:
-        if 0 <= slot_id < self.num_slots:
-            self.slots[slot_id].update_content("")
-            return True
-        return False
+    def clear_slot(self, slot_id: SlotRef) -> bool:
+        return self.store_in_slot(slot_id, "")
     
     def clear_all_slots(self):
-        for slot_id in range(self.num_slots):
-            self.clear_slot(slot_id)
+        with self.transaction():
+            for slot_id in list(self.slots):
+                self._apply(slot_id, "", "text")
     
     def save_state(self, filepath: str) -> bool:
         try:
             state = {
-                "slots": {str(slot_id): slot.to_dict() for slot_id, slot in self.slots.items()},
+                "slots": {str(slot_id): slot_data
+                          for slot_id, slot_data in self.get_all_slots_status().items()},
                 "timestamp": datetime.now().isoformat()
             }
             with open(filepath, 'w') as f:
@@ -115,32 +403,44 @@ class ClipboardManager:
             with open(filepath, 'r') as f:
                 state = json.load(f)
             
-            for slot_id_str, slot_data in state["slots"].items():
-                slot_id = int(slot_id_str)
-                if 0 <= slot_id < self.num_slots:
-                    self.slots[slot_id] = ClipboardSlot.from_dict(slot_data)
+            changed = []
+            with self._lock:
+                for slot_id_str, slot_data in state["slots"].items():
+                    slot_id = int(slot_id_str)
+                    if 0 <= slot_id < self.num_slots:
+                        if slot_id in self.slots:
+                            self.slots[slot_id].release()
+                        self.slots[slot_id] = ClipboardSlot.from_dict(slot_data, self.blob_store)
+                        if self.slots[slot_id].name:
+                            self.name_slot(slot_id, self.slots[slot_id].name)
+                        changed.append(slot_id)
+            self._notify(changed)
             return True
         except Exception:
             return False
     
-    def start_monitoring(self):
+    def add_clipboard_listener(self, callback: Callable[[ClipboardChange], None]):
+        self._clipboard_listeners.append(callback)
+    
+    def start_monitoring(self, backend: Optional[WatcherBackend] = None):
         if not self.monitoring:
             self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitor_clipboard, daemon=True)
-            self.monitor_thread.start()
+            self.watcher = ClipboardWatcher(backend)
+            self.watcher.add_listener(self._on_clipboard_change)
+            self.watcher.start()
     
     def stop_monitoring(self):
         self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
     
-    def _monitor_clipboard(self):
-        while self.monitoring:
-            try:
-                current = pyperclip.paste()
-                if current != self.current_clipboard:
-                    self.current_clipboard = current
-                    # Trigger clipboard change event if needed
-                time.sleep(0.1)
-            except Exception:
-                pass
+    def _on_clipboard_change(self, change: ClipboardChange):
+        self.current_clipboard = change.content
+        if self.record_history:
+            with self._lock:
+                key = self.history.add(change.content, change.timestamp)
+                if key is not None:
+                    self.index.touch(key)
+        for listener in list(self._clipboard_listeners):
+            listener(change)
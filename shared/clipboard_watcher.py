@@ -0,0 +1,323 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+
+@dataclass
+class ClipboardChange:
+    sequence: int
+    content: str
+    timestamp: float
+
+
+def _default_reader() -> str:
+    from shared import clipboard_backend
+    return clipboard_backend.paste()
+
+
+class WatcherBackend:
+    """Base class for clipboard change sources"""
+    name = "base"
+
+    def __init__(self, reader: Optional[Callable[[], str]] = None):
+        self.reader = reader or _default_reader
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Block until the selection changes or timeout expires"""
+        raise NotImplementedError
+
+    def read(self) -> str:
+        return self.reader()
+
+    def close(self):
+        pass
+
+
+class _XEvent(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_int), ("pad", ctypes.c_long * 24)]
+
+
+class XFixesBackend(WatcherBackend):
+    """Selection owner notifications from the X server via libXfixes"""
+    name = "xfixes"
+
+    SET_SELECTION_OWNER_NOTIFY_MASK = 1 << 0
+    SELECTION_WINDOW_DESTROY_NOTIFY_MASK = 1 << 1
+    SELECTION_CLIENT_CLOSE_NOTIFY_MASK = 1 << 2
+    SELECTION_NOTIFY = 0
+
+    def __init__(self, selection: str = "CLIPBOARD", reader: Optional[Callable[[], str]] = None):
+        super().__init__(reader)
+        x11_path = ctypes.util.find_library("X11")
+        xfixes_path = ctypes.util.find_library("Xfixes")
+        if not x11_path or not xfixes_path:
+            raise OSError("libX11/libXfixes not available")
+
+        self._xlib = ctypes.CDLL(x11_path)
+        self._xfixes = ctypes.CDLL(xfixes_path)
+        self._xlib.XOpenDisplay.restype = ctypes.c_void_p
+        self._xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._xlib.XInternAtom.restype = ctypes.c_ulong
+        self._xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        self._xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        self._xlib.XPending.argtypes = [ctypes.c_void_p]
+        self._xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        self._xlib.XFlush.argtypes = [ctypes.c_void_p]
+        self._xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self._xfixes.XFixesQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)
+        ]
+        self._xfixes.XFixesSelectSelectionInput.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong
+        ]
+
+        self._display = self._xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError("Cannot open X display")
+
+        event_base = ctypes.c_int()
+        error_base = ctypes.c_int()
+        if not self._xfixes.XFixesQueryExtension(self._display, ctypes.byref(event_base),
+                                                 ctypes.byref(error_base)):
+            self._xlib.XCloseDisplay(self._display)
+            raise OSError("XFixes extension not available")
+        self._notify_type = event_base.value + self.SELECTION_NOTIFY
+
+        root = self._xlib.XDefaultRootWindow(self._display)
+        atom = self._xlib.XInternAtom(self._display, selection.encode(), 0)
+        mask = (self.SET_SELECTION_OWNER_NOTIFY_MASK |
+                self.SELECTION_WINDOW_DESTROY_NOTIFY_MASK |
+                self.SELECTION_CLIENT_CLOSE_NOTIFY_MASK)
+        self._xfixes.XFixesSelectSelectionInput(self._display, root, atom, mask)
+        self._xlib.XFlush(self._display)
+        self._fd = self._xlib.XConnectionNumber(self._display)
+
+    def _drain_events(self) -> bool:
+        changed = False
+        event = _XEvent()
+        while self._xlib.XPending(self._display) > 0:
+            self._xlib.XNextEvent(self._display, ctypes.byref(event))
+            if event.type == self._notify_type:
+                changed = True
+        return changed
+
+    def wait_for_change(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._drain_events():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+
+    def close(self):
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class WlPasteBackend(WatcherBackend):
+    """Wayland change notifications from a single long-lived `wl-paste --watch`"""
+    name = "wl-paste"
+
+    def __init__(self, reader: Optional[Callable[[], str]] = None):
+        super().__init__(reader)
+        if not shutil.which("wl-paste"):
+            raise OSError("wl-paste not found")
+        self._process = subprocess.Popen(
+            ["wl-paste", "--no-newline", "--watch", "echo"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+    def wait_for_change(self, timeout: float) -> bool:
+        # wl-paste prints one line per change. Read the raw fd: select() cannot see lines
+        # a buffered readline() has already pulled in, and several changes that arrived
+        # together are one change to us since the clipboard is read afterwards anyway
+        fd = self._process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                return False
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                raise OSError("wl-paste watcher exited")
+            if b"\n" in chunk:
+                return True
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait(timeout=1)
+
+
+class PollingBackend(WatcherBackend):
+    """Fallback that polls the clipboard, backing off while it stays idle"""
+    name = "polling"
+
+    def __init__(self, reader: Optional[Callable[[], str]] = None,
+                 min_interval: float = 0.1, max_interval: float = 2.0, backoff: float = 1.5):
+        super().__init__(reader)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._last_content: Optional[str] = None
+        self._stop = threading.Event()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        if self._last_content is None:
+            self._last_content = self.reader()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._stop.wait(min(self.interval, remaining)):
+                return False
+
+            content = self.reader()
+            if content != self._last_content:
+                self._last_content = content
+                self.interval = self.min_interval
+                return True
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def read(self) -> str:
+        if self._last_content is None:
+            self._last_content = self.reader()
+        return self._last_content
+
+    def close(self):
+        self._stop.set()
+
+
+class FakeWatcherBackend(WatcherBackend):
+    """In-memory clipboard for headless runs; call set_content() to simulate a copy"""
+    name = "fake"
+
+    def __init__(self, content: str = ""):
+        super().__init__(reader=lambda: self._content)
+        self._content = content
+        self._pending = 0
+        self._cond = threading.Condition()
+
+    def set_content(self, content: str):
+        with self._cond:
+            self._content = content
+            self._pending += 1
+            self._cond.notify_all()
+
+    def wait_for_change(self, timeout: float) -> bool:
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            if self._pending:
+                self._pending = 0
+                return True
+            return False
+
+
+def create_backend(preferred: Optional[str] = None,
+                   reader: Optional[Callable[[], str]] = None) -> WatcherBackend:
+    """Pick the best available backend, falling back to polling"""
+    if preferred == "fake":
+        return FakeWatcherBackend()
+    if preferred == "polling":
+        return PollingBackend(reader)
+
+    candidates = []
+    if preferred == "wl-paste" or (preferred is None and os.environ.get("WAYLAND_DISPLAY")):
+        candidates.append(WlPasteBackend)
+    if preferred == "xfixes" or (preferred is None and os.environ.get("DISPLAY")):
+        candidates.append(XFixesBackend)
+
+    for backend_cls in candidates:
+        try:
+            return backend_cls(reader=reader)
+        except Exception as e:
+            print(f"Clipboard watcher backend {backend_cls.name} unavailable: {e}")
+    return PollingBackend(reader)
+
+
+class ClipboardWatcher:
+    """Runs a backend on a daemon thread and emits numbered change events"""
+
+    def __init__(self, backend: Optional[WatcherBackend] = None, wait_timeout: float = 0.5):
+        self.backend = backend or create_backend()
+        self.wait_timeout = wait_timeout
+        self.sequence = 0
+        self.last_change: Optional[ClipboardChange] = None
+        self._listeners: List[Callable[[ClipboardChange], None]] = []
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, callback: Callable[[ClipboardChange], None]):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[ClipboardChange], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=self.wait_timeout + 1)
+            self._thread = None
+        self.backend.close()
+
+    def wait_for_change(self, after_sequence: int, timeout: float) -> Optional[ClipboardChange]:
+        """Wait until a change newer than after_sequence is seen"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.sequence > after_sequence, timeout)
+            if self.sequence > after_sequence:
+                return self.last_change
+            return None
+
+    def _run(self):
+        while self._running:
+            try:
+                changed = self.backend.wait_for_change(self.wait_timeout)
+            except Exception:
+                time.sleep(self.wait_timeout)
+                continue
+
+            if not changed or not self._running:
+                continue
+
+            try:
+                content = self.backend.read()
+            except Exception:
+                continue
+
+            with self._cond:
+                self.sequence += 1
+                change = ClipboardChange(self.sequence, content, time.time())
+                self.last_change = change
+                self._cond.notify_all()
+
+            for listener in list(self._listeners):
+                try:
+                    listener(change)
+                except Exception as e:
+                    print(f"Clipboard listener error: {e}")
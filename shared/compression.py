@@ -0,0 +1,112 @@
+import base64
+import lzma
+import time
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# codec name -> (compress, decompress); "none" stores bytes as they are
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (lambda data: data, lambda data: data),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=1), lzma.decompress),
+}
+
+# Compressed output must be at most this fraction of the input to be worth keeping
+MIN_SAVING_RATIO = 0.9
+
+
+def _codec(name: str):
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown compression codec: {name}")
+
+
+def compress(data: bytes, codec: str) -> Tuple[str, bytes]:
+    """Compress data, falling back to "none" when the codec does not pay off
+
+    Returns the codec actually used with the payload, since that is what has
+    to be recorded next to the entry.
+    """
+    if codec == "none":
+        return "none", data
+    payload = _codec(codec)[0](data)
+    if len(payload) > len(data) * MIN_SAVING_RATIO:
+        return "none", data
+    return codec, payload
+
+
+def decompress(payload: bytes, codec: str) -> bytes:
+    return _codec(codec)[1](payload)
+
+
+def decompress_prefix(payload, codec: str, max_bytes: int, step: int = 64 * 1024) -> bytes:
+    """The first max_bytes of the decompressed payload, decompressing no more than needed
+
+    payload may be any bytes-like object (e.g. a memoryview over a memory map).
+    """
+    if codec == "none":
+        return bytes(payload[:max_bytes])
+    if codec == "zlib":
+        decompressor = zlib.decompressobj()
+    elif codec == "lzma":
+        decompressor = lzma.LZMADecompressor()
+    else:
+        return decompress(bytes(payload), codec)[:max_bytes]
+    out = b""
+    for start in range(0, len(payload), step):
+        out += decompressor.decompress(payload[start:start + step], max_bytes - len(out))
+        if len(out) >= max_bytes:
+            break
+    return out
+
+
+def pack_text(content: str, codec: str, threshold: Optional[int]) -> Union[str, Dict[str, object]]:
+    """JSON-safe form of a text for files on disk
+
+    Texts below threshold, or that do not compress, stay plain strings so
+    small entries remain readable; others become a record holding the codec,
+    the base64 payload and the original length.
+    """
+    if threshold is None or len(content) < threshold:
+        return content
+    used, payload = compress(content.encode("utf-8", "surrogatepass"), codec)
+    if used == "none":
+        return content
+    return {"codec": used, "data": base64.b64encode(payload).decode("ascii"),
+            "length": len(content)}
+
+
+def unpack_text(value: Union[str, Dict[str, object]]) -> str:
+    if isinstance(value, str):
+        return value
+    payload = base64.b64decode(value["data"])
+    return decompress(payload, value["codec"]).decode("utf-8", "surrogatepass")
+
+
+def compression_report(samples: Iterable[str], codecs: Optional[List[str]] = None) -> List[Dict[str, float]]:
+    """Ratio and throughput of each codec over a corpus of clipboard texts"""
+    encoded = [sample.encode("utf-8", "surrogatepass") for sample in samples]
+    total_in = sum(len(data) for data in encoded)
+    rows = []
+    for name in codecs or [name for name in CODECS if name != "none"]:
+        compress_fn, decompress_fn = _codec(name)
+        total_out = 0
+        compress_time = decompress_time = 0.0
+        for data in encoded:
+            start = time.perf_counter()
+            payload = compress_fn(data)
+            compress_time += time.perf_counter() - start
+            start = time.perf_counter()
+            decompress_fn(payload)
+            decompress_time += time.perf_counter() - start
+            total_out += len(payload)
+        rows.append({
+            "codec": name,
+            "input_bytes": total_in,
+            "output_bytes": total_out,
+            "ratio": total_in / total_out if total_out else 0.0,
+            "compress_ms": compress_time * 1000,
+            "decompress_ms": decompress_time * 1000,
+        })
+    return rows
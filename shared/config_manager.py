@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -10,9 +11,27 @@ class ConfigManager:
         self.state_file = self.config_dir / "state.json"
         self.snippets_file = self.config_dir / "snippets.json"
         
+        self.persistence = None
+        self.state_store = None
+        self._pending_state: Optional[Dict[str, Any]] = None
+        self._state_updates: Dict[str, Any] = {}
+        self._pending_snippets: Optional[Dict[str, Any]] = None
+        self._state_lock = threading.Lock()
+        
         self._ensure_config_dir()
         self.config = self._load_config()
     
+    def set_persistence_worker(self, worker):
+        """Route config and state saves through a background PersistenceWorker"""
+        self.persistence = worker
+        worker.register("config", lambda keys: self._write_config(self.config))
+        worker.register("state", lambda keys: self._flush_state())
+        worker.register("snippets", lambda keys: self._flush_snippets())
+    
+    def set_state_store(self, store):
+        """Keep state in a store with save_state/load_state (e.g. SQLiteStore) instead of state.json"""
+        self.state_store = store
+    
     def _ensure_config_dir(self):
         self.config_dir.mkdir(parents=True, exist_ok=True)
     
@@ -26,7 +45,8 @@ class ConfigManager:
                 "orderly_copy": "ctrl+c",
                 "orderly_paste": "ctrl+v",
                 "snippers_view": "ctrl+shift+s",
-                "main_gui": "ctrl+shift+m"
+                "main_gui": "ctrl+shift+m",
+                "quick_palette": "ctrl+shift+space"
             },
             "gui": {
                 "window_size": [800, 600],
@@ -39,7 +59,44 @@ class ConfigManager:
                 "auto_save_state": True,
                 "max_clipboard_history": 100,
                 "paste_delay_ms": 50,
-                "monitor_clipboard": True
+                "copy_timeout_ms": 500,
+                "paste_timeout_ms": 200,
+                "pyautogui_pause_ms": 0,
+                "monitor_clipboard": True,
+                "clipboard_watcher": None,
+                "persist_debounce_ms": 250,
+                "action_workers": 1,
+                "action_queue_size": 32,
+                "action_overrun_ms": 1000
+            },
+            "notifications": {
+                "backend": None,
+                "coalesce_ms": 300,
+                "min_interval_ms": 1000,
+                "timeout_ms": 3000
+            },
+            "control": {
+                "enabled": True,
+                "socket_path": "~/.multiclip/control.sock"
+            },
+            "metrics": {
+                "prometheus_file": "~/.multiclip/metrics.prom"
+            },
+            "slots": {
+                "count": 10,
+                "names": {},
+                "page_size": 10
+            },
+            "storage": {
+                "blob_dir": "~/.multiclip/blobs",
+                "spill_threshold_kb": 1024,
+                "compress_threshold_kb": 64,
+                "codec": "zlib",
+                "decompress_cache_entries": 4,
+                "memory_budget_mb": 256,
+                "index_max_chars_kb": 64,
+                "backend": "json",
+                "sqlite_path": "~/.multiclip/multiclip.db"
             },
             "terminal": {
                 "paste_command": "ctrl+shift+v",
@@ -63,6 +120,12 @@ class ConfigManager:
     
     def save_config(self, config: Optional[Dict[str, Any]] = None):
         config_to_save = config or self.config
+        if self.persistence and config_to_save is self.config:
+            self.persistence.mark_dirty("config")
+            return
+        self._write_config(config_to_save)
+    
+    def _write_config(self, config_to_save: Dict[str, Any]):
         try:
             with open(self.config_file, 'w') as f:
                 json.dump(config_to_save, f, indent=2)
@@ -100,6 +163,52 @@ class ConfigManager:
         return hotkey_template
     
     def save_state(self, state_data: Dict[str, Any]):
+        with self._state_lock:
+            self._pending_state = state_data
+            self._state_updates = {}
+        if self.persistence:
+            self.persistence.mark_dirty("state")
+            return
+        self._flush_state()
+    
+    def update_state(self, changes: Dict[str, Any]):
+        """Merge changes into the saved state
+        
+        The merge happens when the state is written (on the persistence worker
+        when there is one), on top of any save still waiting there, so a
+        debounced write is never overwritten by a stale copy read from disk.
+        """
+        with self._state_lock:
+            self._state_updates.update(changes)
+        if self.persistence:
+            self.persistence.mark_dirty("state")
+            return
+        self._flush_state()
+    
+    def _flush_state(self):
+        with self._state_lock:
+            state, self._pending_state = self._pending_state, None
+            updates, self._state_updates = self._state_updates, {}
+        if state is None and not updates:
+            return
+        state = dict(self.load_state() if state is None else state)
+        state.update(updates)
+        try:
+            self._write_state(state)
+        except Exception:
+            # Keep it for the retry unless something newer replaced it meanwhile
+            with self._state_lock:
+                if self._pending_state is None:
+                    self._pending_state = {**state, **self._state_updates}
+                    self._state_updates = {}
+            raise
+    
+    def _write_state(self, state_data: Optional[Dict[str, Any]]):
+        if state_data is None:
+            return
+        if self.state_store is not None:
+            self.state_store.save_state(state_data)
+            return
         try:
             with open(self.state_file, 'w') as f:
                 json.dump(state_data, f, indent=2)
@@ -107,6 +216,8 @@ class ConfigManager:
             print(f"Error saving state: {e}")
     
     def load_state(self) -> Dict[str, Any]:
+        if self.state_store is not None:
+            return self.state_store.load_state()
         if self.state_file.exists():
             try:
                 with open(self.state_file, 'r') as f:
@@ -116,6 +227,20 @@ class ConfigManager:
         return {}
     
     def save_snippets(self, snippets_data: Dict[str, Any]):
+        if self.persistence:
+            with self._state_lock:
+                self._pending_snippets = snippets_data
+            self.persistence.mark_dirty("snippets")
+            return
+        self._write_snippets(snippets_data)
+    
+    def _flush_snippets(self):
+        with self._state_lock:
+            snippets_data, self._pending_snippets = self._pending_snippets, None
+        if snippets_data is not None:
+            self._write_snippets(snippets_data)
+    
+    def _write_snippets(self, snippets_data: Dict[str, Any]):
         try:
             with open(self.snippets_file, 'w') as f:
                 json.dump(snippets_data, f, indent=2)
@@ -123,6 +248,9 @@ class ConfigManager:
             print(f"Error saving snippets: {e}")
     
     def load_snippets(self) -> Dict[str, Any]:
+        with self._state_lock:
+            if self._pending_snippets is not None:
+                return self._pending_snippets
         if self.snippets_file.exists():
             try:
                 with open(self.snippets_file, 'r') as f:
@@ -0,0 +1,64 @@
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from shared.control_server import DEFAULT_SOCKET_PATH
+
+SlotRef = Union[int, str]
+
+
+class ControlClientError(Exception):
+    """The daemon answered a request with an error"""
+
+
+class ControlClient:
+    """Keeps one connection to the MultiClip control socket and issues JSON-line requests"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 5.0):
+        self.socket_path = Path(socket_path or DEFAULT_SOCKET_PATH).expanduser()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(str(self.socket_path))
+        self._reader = self._sock.makefile("rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and return the raw response object"""
+        self._sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("MultiClip daemon closed the connection")
+        return json.loads(line)
+
+    def request(self, op: str, **params: Any) -> Dict[str, Any]:
+        response = self.call({"op": op, **params})
+        if not response.get("ok"):
+            raise ControlClientError(response.get("error", "request failed"))
+        return response
+
+    def get(self, slot: SlotRef) -> str:
+        return self.request("get", slot=slot)["content"]
+
+    def set(self, slot: SlotRef, content: str):
+        self.request("set", slot=slot, content=content)
+
+    def list(self, all_slots: bool = False) -> List[Dict[str, Any]]:
+        return self.request("list", all=all_slots)["slots"]
+
+    def search(self, query: str, limit: int = 20, history: bool = True,
+               tokens: bool = False) -> List[Dict[str, Any]]:
+        return self.request("search", query=query, limit=limit, history=history,
+                            tokens=tokens)["matches"]
+
+    def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.request("batch", requests=requests)["results"]
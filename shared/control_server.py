@@ -0,0 +1,213 @@
+import errno
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_SOCKET_PATH = "~/.multiclip/control.sock"
+
+# Upper bound on the matches one search request may ask for
+MAX_SEARCH_LIMIT = 500
+
+
+class ControlError(Exception):
+    """A request that cannot be served; reported to the client as an error response"""
+
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line in, one JSON response per line out, until the client hangs up"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.control.handle(json.loads(line))
+            except ValueError as e:
+                response = {"ok": False, "error": f"invalid JSON: {e}"}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _ControlSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """Unix-socket control API over a ClipboardManager
+
+    Slots are addressed the way users see them: 1-based numbers matching the
+    hotkeys, or slot names. Operations are get, set, list, search, batch and
+    ping; each request is a JSON object with an "op" key.
+    """
+
+    def __init__(self, clipboard_manager, socket_path: Optional[str] = None):
+        self.clipboard_manager = clipboard_manager
+        self.socket_path = Path(socket_path or DEFAULT_SOCKET_PATH).expanduser()
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._server: Optional[_ControlSocketServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ops = {
+            "ping": self._op_ping,
+            "get": self._op_get,
+            "set": self._op_set,
+            "list": self._op_list,
+            "search": self._op_search,
+            "batch": self._op_batch,
+            "stats": self._op_stats,
+        }
+
+    def start(self):
+        if self._server is not None:
+            return
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+        self._server = _ControlSocketServer(str(self.socket_path), _ControlRequestHandler)
+        self._server.control = self
+        os.chmod(self.socket_path, 0o600)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _remove_stale_socket(self):
+        """Delete a socket file left by an instance that exited; refuse to take over a live one"""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            return
+        finally:
+            probe.close()
+        raise OSError(errno.EADDRINUSE, f"MultiClip is already running on {self.socket_path}")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2)
+        self._server = None
+        self._thread = None
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Serve one decoded request and return the response object"""
+        # Handlers run on one thread per connection
+        with self._count_lock:
+            self.request_count += 1
+        try:
+            if not isinstance(request, dict):
+                raise ControlError("request must be a JSON object")
+            op = self._ops.get(request.get("op"))
+            if op is None:
+                raise ControlError(f"unknown op: {request.get('op')}")
+            result = op(request)
+        except ControlError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            return {"ok": False, "error": f"internal error: {e}"}
+        return {"ok": True, **result}
+
+    def _slot_id(self, request: Dict[str, Any]) -> int:
+        slot_ref = request.get("slot")
+        if isinstance(slot_ref, bool) or not isinstance(slot_ref, (int, str)):
+            raise ControlError("slot must be a slot number or name")
+        slot_id = self.clipboard_manager.resolve_slot(
+            slot_ref - 1 if isinstance(slot_ref, int) else slot_ref
+        )
+        if slot_id is None:
+            raise ControlError(f"no such slot: {slot_ref}")
+        return slot_id
+
+    def _slot_info(self, slot_id: int, slot=None) -> Dict[str, Any]:
+        return {
+            "slot": slot_id + 1,
+            "name": self.clipboard_manager.get_slot_name(slot_id),
+            "preview": slot.preview if slot else "",
+            "length": slot.length if slot else 0,
+        }
+
+    def _op_ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    def _op_get(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        slot_id = self._slot_id(request)
+        return {"slot": slot_id + 1, "content": self.clipboard_manager.get_slot_content(slot_id)}
+
+    def _op_set(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        slot_id = self._slot_id(request)
+        content = request.get("content")
+        if not isinstance(content, str):
+            raise ControlError("content must be a string")
+        self.clipboard_manager.store_in_slot(slot_id, content)
+        return {"slot": slot_id + 1}
+
+    def _op_list(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        snapshots = self.clipboard_manager.snapshot(with_content=False)
+        slot_ids = sorted(snapshots)
+        if request.get("all"):
+            slot_ids = range(self.clipboard_manager.num_slots)
+        return {"slots": [self._slot_info(slot_id, snapshots.get(slot_id)) for slot_id in slot_ids]}
+
+    def _op_search(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        query = request.get("query")
+        if not isinstance(query, str) or not query:
+            raise ControlError("query must be a non-empty string")
+        limit = request.get("limit", 20)
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise ControlError("limit must be a positive integer")
+        limit = min(limit, MAX_SEARCH_LIMIT)
+        include_history = request.get("history", True)
+        tokens = bool(request.get("tokens"))
+
+        # Hits held only by history are dropped when history is off, so fetch extra
+        # then, and widen the fetch while too few survive and the manager had more
+        fetch = limit if include_history else limit * 2
+        while True:
+            hits = self.clipboard_manager.search(query, fetch, tokens)
+            matches = self._search_matches(hits, include_history, limit)
+            if len(matches) >= limit or len(hits) < fetch or fetch >= MAX_SEARCH_LIMIT * 4:
+                return {"matches": matches}
+            fetch *= 4
+
+    def _search_matches(self, hits, include_history: bool, limit: int) -> List[Dict[str, Any]]:
+        matches: List[Dict[str, Any]] = []
+        for hit in hits:
+            if hit.slot_ids:
+                snapshots = self.clipboard_manager.snapshot(hit.slot_ids, with_content=False)
+                for slot_id in hit.slot_ids:
+                    matches.append({"source": "slot", **self._slot_info(slot_id, snapshots.get(slot_id))})
+            elif hit.in_history and include_history:
+                matches.append({
+                    "source": "history",
+                    "hash": f"{hit.content_hash:016x}",
+                    "preview": hit.preview,
+                    "timestamp": hit.timestamp,
+                })
+            if len(matches) >= limit:
+                break
+        return matches[:limit]
+
+    def _op_stats(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"blobs": self.clipboard_manager.blob_store.stats(),
+                "index": self.clipboard_manager.index.stats()}
+
+    def _op_batch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        requests = request.get("requests")
+        if not isinstance(requests, list):
+            raise ControlError("requests must be a list")
+        if any(isinstance(item, dict) and item.get("op") == "batch" for item in requests):
+            raise ControlError("batches cannot be nested")
+        # Sets in a batch are flushed to disk and the UI once, when the batch ends
+        with self.clipboard_manager.transaction():
+            return {"results": [self.handle(item) for item in requests]}
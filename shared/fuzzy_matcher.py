@@ -0,0 +1,153 @@
+import math
+import re
+import time
+from array import array
+from bisect import bisect_right
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class Candidate(NamedTuple):
+    """Something the quick-paste palette can offer"""
+    kind: str          # "slot", "history" or "snippet"
+    ref: Hashable      # slot id, content hash or snippet id
+    label: str         # text shown in the palette
+    score: float       # frecency; higher ranks first
+
+
+class FrecencyTracker:
+    """Exponentially decaying use counts: each use adds 1, halving every half_life seconds"""
+
+    def __init__(self, half_life: float = 3 * 24 * 3600):
+        self.decay = math.log(2) / half_life
+        self._scores: Dict[Hashable, tuple] = {}
+
+    def weight(self, age: float) -> float:
+        """Value now of one use that happened age seconds ago"""
+        return math.exp(-self.decay * max(0.0, age))
+
+    def record(self, identity: Hashable, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self._scores[identity] = (self.score(identity, now) + 1.0, now)
+
+    def score(self, identity: Hashable, now: Optional[float] = None) -> float:
+        entry = self._scores.get(identity)
+        if entry is None:
+            return 0.0
+        value, updated = entry
+        now = time.time() if now is None else now
+        return value * self.weight(now - updated)
+
+    def to_dict(self) -> Dict[str, list]:
+        return {"scores": [[list(identity) if isinstance(identity, tuple) else identity, value, updated]
+                           for identity, (value, updated) in self._scores.items()]}
+
+    def load_dict(self, data: Dict[str, list]):
+        for identity, value, updated in data.get("scores", []):
+            self._scores[tuple(identity) if isinstance(identity, list) else identity] = (value, updated)
+
+
+class FuzzyMatcher:
+    """Subsequence matcher over a fixed candidate list
+
+    Candidates are kept in frecency order, and their lowercase keys are
+    precomputed and joined into one newline-separated buffer. A query scans
+    that buffer in C (str.find for contiguous matches, a regex for scattered
+    ones) a chunk of keys at a time and stops once it has enough results,
+    remembering where it stopped. When the next query extends the previous
+    one, the matches found so far are narrowed and the scan resumes from that
+    point, so typing a word costs about one pass over the buffer in total.
+
+    With a budget, a scan also stops when its time is up and `complete` is
+    left False; calling match() again with the same query continues it.
+    Contiguous matches rank ahead of scattered ones; within each group
+    frecency decides.
+    """
+
+    CHUNK_KEYS = 1024
+
+    def __init__(self, candidates: Iterable[Candidate] = (), key_chars: int = 200):
+        self.key_chars = key_chars
+        self.complete = True
+        self.set_candidates(candidates)
+
+    def set_candidates(self, candidates: Iterable[Candidate]):
+        self.candidates: List[Candidate] = sorted(candidates, key=lambda c: c.score, reverse=True)
+        self._keys = [c.label[:self.key_chars].lower().replace("\n", " ") for c in self.candidates]
+        # Every key follows a newline, so a scan pattern can lead with "\n" and
+        # try each key once from its start
+        self._buffer = "\n" + "\n".join(self._keys)
+        self._starts = array('l')
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+        self._starts.append(len(self._buffer))
+        # Per match kind: (query, indexes found so far, key index the scan resumes at)
+        self._scans: Dict[str, Tuple[str, List[int], int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    @staticmethod
+    def _pattern_body(query: str) -> str:
+        """Each step skips to the next occurrence of its character within the key"""
+        return "".join(f"[^{re.escape(ch)}\\n]*{re.escape(ch)}" for ch in query)
+
+    def _collect(self, kind: str, query: str, want: int, find: Callable[[int, int], int],
+                 test: Callable[[str], bool], deadline: Optional[float]) -> List[int]:
+        """First `want` matching indexes in frecency order, narrowing the previous scan if possible"""
+        previous = self._scans.get(kind)
+        if previous is not None and query.startswith(previous[0]):
+            found = previous[1] if previous[0] == query else [i for i in previous[1] if test(self._keys[i])]
+            resume = previous[2]
+        else:
+            found, resume = [], 0
+
+        starts, total = self._starts, len(self._keys)
+        while len(found) < want and resume < total:
+            end = min(resume + self.CHUNK_KEYS, total)
+            position = find(starts[resume], starts[end])
+            if position < 0:
+                resume = end
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                continue
+            index = bisect_right(starts, position) - 1
+            found.append(index)
+            resume = index + 1
+        self._scans[kind] = (query, found, resume)
+        if len(found) < want and resume < total:
+            self.complete = False
+        return found[:want]
+
+    def match_indexes(self, query: str, limit: int = 50, budget_ms: Optional[float] = None) -> List[int]:
+        self.complete = True
+        query = query.lower().replace("\n", " ")
+        if not query:
+            return list(range(min(limit, len(self.candidates))))
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        buffer = self._buffer
+
+        contiguous = self._collect("contiguous", query, limit,
+                                   lambda start, end: buffer.find(query, start, end),
+                                   lambda key: query in key, deadline)
+        if len(contiguous) >= limit or len(query) == 1 or not self.complete:
+            return contiguous
+
+        body = self._pattern_body(query)
+        scan = re.compile("\n" + body).search
+        test = re.compile(body).match
+
+        def find_scattered(start: int, end: int) -> int:
+            match = scan(buffer, start, end)
+            return -1 if match is None else match.start()
+
+        scattered = self._collect("scattered", query, limit, find_scattered,
+                                  lambda key: test(key) is not None, deadline)
+        seen = set(contiguous)
+        ranked = contiguous + [i for i in scattered if i not in seen]
+        return ranked[:limit]
+
+    def match(self, query: str, limit: int = 50, budget_ms: Optional[float] = None) -> List[Candidate]:
+        """Best candidates for query: contiguous matches first, then by frecency"""
+        return [self.candidates[i] for i in self.match_indexes(query, limit, budget_ms)]
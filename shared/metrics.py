@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Upper bounds in milliseconds; one more bucket catches everything above
+DEFAULT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram: observe() is a bisect and a few increments"""
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = array('Q', [0]) * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+
+class ActionTrace:
+    """Stage timings for one hotkey action, starting when the hook fired
+
+    mark(stage) records the time since the previous mark (or the hook) under
+    that stage; finish() records the whole action as "total".
+    """
+
+    def __init__(self, metrics: "Metrics", action: str, started_at: float):
+        self.metrics = metrics
+        self.action = action
+        self.started_at = started_at
+        self._last = started_at
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        self.metrics.observe(self.action, stage, (now - self._last) * 1000)
+        self._last = now
+
+    def finish(self) -> float:
+        """Record and return the total in milliseconds"""
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        self.metrics.observe(self.action, "total", total_ms)
+        return total_ms
+
+
+class Metrics:
+    """Per-action, per-stage latency histograms
+
+    Synchronous stages are recorded through an ActionTrace on the action's
+    thread. Stages that finish elsewhere (the journal write, the UI redraw)
+    are started with expect(stage, key, action) and completed with
+    resolve(stage, keys) on whichever thread does the work.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._pending: Dict[Tuple[str, Hashable], Tuple[str, float]] = {}
+
+    def observe(self, action: str, stage: str, value_ms: float):
+        with self._lock:
+            histogram = self._histograms.get((action, stage))
+            if histogram is None:
+                histogram = self._histograms[(action, stage)] = Histogram(self.buckets)
+            histogram.observe(value_ms)
+
+    def trace(self, action: str, started_at: Optional[float] = None) -> ActionTrace:
+        return ActionTrace(self, action, time.perf_counter() if started_at is None else started_at)
+
+    def expect(self, stage: str, key: Hashable, action: str):
+        """Start timing an asynchronous stage
+
+        An earlier pending start for the same key is kept, so coalesced work
+        (several stores, one journal write) reports the longest wait.
+        """
+        with self._lock:
+            self._pending.setdefault((stage, key), (action, time.perf_counter()))
+
+    def resolve(self, stage: str, keys: Iterable[Hashable]):
+        now = time.perf_counter()
+        with self._lock:
+            finished = [self._pending.pop((stage, key), None) for key in keys]
+        for entry in finished:
+            if entry is not None:
+                action, started = entry
+                self.observe(action, stage, (now - started) * 1000)
+
+    def summary(self) -> List[Dict[str, object]]:
+        """One row per action and stage with count, mean and estimated percentiles"""
+        with self._lock:
+            rows = []
+            for (action, stage), histogram in sorted(self._histograms.items()):
+                rows.append({
+                    "action": action,
+                    "stage": stage,
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "p50_ms": histogram.quantile(0.5),
+                    "p95_ms": histogram.quantile(0.95),
+                    "p99_ms": histogram.quantile(0.99),
+                    "max_ms": histogram.max,
+                })
+            return rows
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition format (cumulative buckets in seconds)"""
+        lines = [
+            "# HELP multiclip_action_stage_seconds Time spent in each stage of a hotkey action",
+            "# TYPE multiclip_action_stage_seconds histogram",
+        ]
+        with self._lock:
+            for (action, stage), histogram in sorted(self._histograms.items()):
+                labels = f'action="{action}",stage="{stage}"'
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'multiclip_action_stage_seconds_bucket{{{labels},le="{bound / 1000:g}"}} '
+                                 f'{cumulative}')
+                lines.append(f'multiclip_action_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"multiclip_action_stage_seconds_sum{{{labels}}} {histogram.sum / 1000:.6f}")
+                lines.append(f"multiclip_action_stage_seconds_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically replace path, for node_exporter's textfile collector or similar"""
+        path = os.path.expanduser(path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
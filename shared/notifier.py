@@ -0,0 +1,215 @@
+import queue
+import subprocess
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class NotificationError(Exception):
+    """The notification service refused or failed to show a notification"""
+
+
+class NotificationBackend:
+    """Base class for desktop notification delivery"""
+    name = "base"
+
+    def notify(self, title: str, message: str, icon: str, timeout_ms: int,
+               replaces_id: int = 0) -> int:
+        """Show a notification and return its id (0 if the backend has none)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class DBusNotificationBackend(NotificationBackend):
+    """Persistent session-bus connection to org.freedesktop.Notifications (needs jeepney)"""
+    name = "dbus"
+
+    def __init__(self, app_name: str = "MultiClip"):
+        from jeepney import DBusAddress, HeaderFields, MessageType, new_method_call
+        from jeepney.io.blocking import open_dbus_connection
+
+        self.app_name = app_name
+        self._new_method_call = new_method_call
+        self._error_type = MessageType.error
+        self._error_name_field = HeaderFields.error_name
+        self._address = DBusAddress("/org/freedesktop/Notifications",
+                                    bus_name="org.freedesktop.Notifications",
+                                    interface="org.freedesktop.Notifications")
+        self._connection = open_dbus_connection(bus="SESSION")
+
+    def notify(self, title: str, message: str, icon: str, timeout_ms: int,
+               replaces_id: int = 0) -> int:
+        call = self._new_method_call(
+            self._address, "Notify", "susssasa{sv}i",
+            (self.app_name, replaces_id, icon, title, message, [], {}, timeout_ms)
+        )
+        reply = self._connection.send_and_get_reply(call, timeout=1)
+        if reply.header.message_type == self._error_type:
+            error_name = reply.header.fields.get(self._error_name_field, "unknown error")
+            detail = reply.body[0] if reply.body else ""
+            raise NotificationError(f"{error_name}: {detail}" if detail else error_name)
+        return reply.body[0]
+
+    def close(self):
+        self._connection.close()
+
+
+class NotifySendBackend(NotificationBackend):
+    """One notify-send process per notification"""
+    name = "notify-send"
+
+    def notify(self, title: str, message: str, icon: str, timeout_ms: int,
+               replaces_id: int = 0) -> int:
+        subprocess.run(["notify-send", "-i", icon, title, message, "-t", str(timeout_ms)],
+                       check=False)
+        return 0
+
+
+class StandInNotificationDaemon(NotificationBackend):
+    """Local stand-in for the notification daemon that records what it is sent"""
+    name = "stand-in"
+
+    def __init__(self):
+        self.notifications: List[Tuple[int, str, str]] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def notify(self, title: str, message: str, icon: str, timeout_ms: int,
+               replaces_id: int = 0) -> int:
+        with self._lock:
+            notification_id = replaces_id or self._next_id
+            if not replaces_id:
+                self._next_id += 1
+            self.notifications.append((notification_id, title, message))
+            return notification_id
+
+
+def create_backend(preferred: Optional[str] = None) -> NotificationBackend:
+    """Prefer a persistent D-Bus connection, falling back to notify-send"""
+    if preferred == "stand-in":
+        return StandInNotificationDaemon()
+    if preferred == "notify-send":
+        return NotifySendBackend()
+    try:
+        return DBusNotificationBackend()
+    except Exception as e:
+        print(f"D-Bus notifications unavailable, using notify-send: {e}")
+        return NotifySendBackend()
+
+
+class Notifier:
+    """Delivers notifications on a background thread, coalescing bursts
+
+    notify() never blocks. Notifications arriving within coalesce_ms of each
+    other are merged into one summary toast, and toasts are at least
+    min_interval_ms apart. When the backend returns ids, a summary replaces
+    the previous toast while it is still on screen instead of stacking. If
+    sending fails (the notification daemon went away, the bus connection
+    dropped), the worker switches to notify-send and retries once.
+    """
+
+    def __init__(self, backend: Optional[NotificationBackend] = None, icon_path: str = "",
+                 coalesce_ms: int = 300, min_interval_ms: int = 1000, timeout_ms: int = 3000,
+                 max_queue: int = 256):
+        self.backend = backend if backend is not None else create_backend()
+        self.icon_path = icon_path
+        self.coalesce = coalesce_ms / 1000.0
+        self.min_interval = min_interval_ms / 1000.0
+        self.timeout_ms = timeout_ms
+        self.sent_count = 0
+        self.dropped_count = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._last_sent = 0.0
+        self._last_id = 0
+
+    def notify(self, title: str, message: str):
+        try:
+            self._queue.put_nowait((title, message))
+        except queue.Full:
+            self.dropped_count += 1
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.backend.close()
+
+    def _collect_burst(self, first: Tuple[str, str]) -> Tuple[List[Tuple[str, str]], bool]:
+        """Gather notifications until the burst goes quiet and the rate limit allows sending"""
+        burst = [first]
+        deadline = max(time.monotonic() + self.coalesce, self._last_sent + self.min_interval)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return burst, False
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return burst, False
+            if item is None:
+                return burst, True
+            burst.append(item)
+            deadline = max(deadline, time.monotonic() + self.coalesce)
+
+    @staticmethod
+    def _summarize(burst: List[Tuple[str, str]]) -> Tuple[str, str]:
+        if len(burst) == 1:
+            return burst[0]
+        titles = {title for title, _ in burst}
+        title = burst[-1][0] if len(titles) == 1 else "MultiClip"
+        lines = [message for _, message in burst[-5:]]
+        if len(burst) > 5:
+            lines.insert(0, f"... and {len(burst) - 5} earlier")
+        return f"{title} ({len(burst)})", "\n".join(lines)
+
+    def _send(self, burst: List[Tuple[str, str]]):
+        title, message = self._summarize(burst)
+        now = time.monotonic()
+        still_visible = now - self._last_sent < self.timeout_ms / 1000.0
+        replaces_id = self._last_id if len(burst) > 1 and still_visible else 0
+        try:
+            self._last_id = self.backend.notify(title, message, self.icon_path,
+                                                self.timeout_ms, replaces_id)
+            self.sent_count += 1
+        except Exception as e:
+            if isinstance(self.backend, NotifySendBackend):
+                print(f"Toast notification error: {e}")
+            else:
+                print(f"{self.backend.name} notifications failed, switching to notify-send: {e}")
+                self._fall_back()
+                self._send_fallback(title, message)
+        self._last_sent = now
+
+    def _fall_back(self):
+        try:
+            self.backend.close()
+        except Exception:
+            pass
+        self.backend = NotifySendBackend()
+        self._last_id = 0
+
+    def _send_fallback(self, title: str, message: str):
+        try:
+            self.backend.notify(title, message, self.icon_path, self.timeout_ms)
+            self.sent_count += 1
+        except Exception as e:
+            print(f"Toast notification error: {e}")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            burst, stopping = self._collect_burst(item)
+            self._send(burst)
+            if stopping:
+                return
@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+
+class PersistenceWorker:
+    """Background writer that coalesces dirty-state notifications
+
+    Callers register a writer per named piece of state and call
+    mark_dirty() instead of writing. The worker waits out the debounce
+    window measured from the first notification of a burst, then calls
+    each dirty writer once with the set of keys marked since its last run.
+    A writer that raises keeps its keys: they are merged back into the dirty
+    set and retried after a backoff that doubles on each consecutive failure
+    (from retry_ms up to max_retry_ms), so a transient disk error delays a
+    change instead of losing it.
+    """
+
+    def __init__(self, debounce_ms: int = 250, retry_ms: int = 1000, max_retry_ms: int = 60_000):
+        self.debounce = debounce_ms / 1000.0
+        self.retry = retry_ms / 1000.0
+        self.max_retry = max_retry_ms / 1000.0
+        self.write_count = 0
+        self.error_count = 0
+        self.retry_count = 0
+        self._backoff = 0.0
+        self._retry_at: Optional[float] = None
+        self._writers: Dict[str, Callable[[Set], None]] = {}
+        self._dirty: Dict[str, Set] = {}
+        self._dirty_since: Optional[float] = None
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, writer: Callable[[Set], None]):
+        self._writers[name] = writer
+
+    def mark_dirty(self, name: str, key=None):
+        with self._cond:
+            keys = self._dirty.setdefault(name, set())
+            if key is not None:
+                keys.add(key)
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+                self._cond.notify()
+
+    def mark_dirty_many(self, name: str, keys):
+        """Mark several keys under one lock acquisition"""
+        with self._cond:
+            self._dirty.setdefault(name, set()).update(keys)
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+                self._cond.notify()
+    
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the worker and write anything still pending"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """Write all dirty state now on the calling thread"""
+        self._write(self._take_dirty())
+
+    def _take_dirty(self) -> Dict[str, Set]:
+        with self._cond:
+            dirty, self._dirty = self._dirty, {}
+            self._dirty_since = None
+        return dirty
+
+    def _write(self, dirty: Dict[str, Set]):
+        failed: Dict[str, Set] = {}
+        with self._write_lock:
+            for name, keys in dirty.items():
+                writer = self._writers.get(name)
+                if writer is None:
+                    continue
+                try:
+                    writer(keys)
+                    self.write_count += 1
+                except Exception as e:
+                    self.error_count += 1
+                    failed[name] = keys
+                    print(f"Persistence error ({name}), will retry: {e}")
+        if failed:
+            self._requeue(failed)
+        elif dirty:
+            with self._cond:
+                self._backoff = 0.0
+                self._retry_at = None
+
+    def _requeue(self, failed: Dict[str, Set]):
+        """Merge failed writes back into the dirty set and hold writes until the backoff passes"""
+        with self._cond:
+            for name, keys in failed.items():
+                self._dirty.setdefault(name, set()).update(keys)
+            self._backoff = min(self.max_retry, self._backoff * 2 if self._backoff else self.retry)
+            self._retry_at = time.monotonic() + self._backoff
+            self.retry_count += 1
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._dirty_since is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                due = self._dirty_since + self.debounce
+                if self._retry_at is not None:
+                    due = max(due, self._retry_at)
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+            self._write(self._take_dirty())
@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Callable, Dict, Optional
+
+from shared.compression import pack_text, unpack_text
+
+
+class SlotJournal:
+    """Write-ahead journal in front of the slot snapshot file
+
+    Each change appends one JSON line holding only the changed slot, so a
+    hotkey press costs the size of that slot rather than of every slot.
+    Once the journal outgrows the snapshot it is folded into a new snapshot
+    written atomically, which keeps the amortized write cost per change
+    constant. A torn trailing line from a crash is ignored on replay.
+    Contents of compress_threshold characters or more are written as
+    codec-tagged compressed records in both files.
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: Optional[str] = None,
+                 snapshot_source: Optional[Callable[[], Dict[str, str]]] = None,
+                 compact_min_bytes: int = 1024 * 1024, sync: bool = True,
+                 compress_threshold: Optional[int] = 64 * 1024, codec: str = "zlib"):
+        self.snapshot_path = snapshot_path
+        self.compress_threshold = compress_threshold
+        self.codec = codec
+        self.journal_path = journal_path or snapshot_path + ".journal"
+        self.snapshot_source = snapshot_source
+        self.compact_min_bytes = compact_min_bytes
+        self.sync = sync
+        self._journal_file = None
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.journal_path)
+
+    def load(self) -> Dict[str, str]:
+        """Read the snapshot and replay the journal on top of it"""
+        state: Dict[str, str] = {}
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r") as f:
+                    state = {slot_key: unpack_text(value) for slot_key, value in json.load(f).items()}
+                self._snapshot_bytes = os.path.getsize(self.snapshot_path)
+            except (OSError, ValueError) as e:
+                print(f"Error loading slot snapshot: {e}")
+
+        self._journal_bytes = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb+") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Drop the torn tail so later appends start on a clean line
+                        f.truncate(self._journal_bytes)
+                        break
+                    self._journal_bytes += len(line)
+                    if "codec" in record:
+                        state[record["slot"]] = unpack_text(record)
+                    elif record.get("content") is None:
+                        state.pop(record["slot"], None)
+                    else:
+                        state[record["slot"]] = record["content"]
+        return state
+
+    def append(self, slot_key: str, content: Optional[str]):
+        """Record a single slot change; None removes the slot"""
+        self.append_many({slot_key: content})
+
+    def append_many(self, changes: Dict[str, Optional[str]]):
+        """Record several slot changes with a single write and sync"""
+        if not changes:
+            return
+        if self._journal_file is None:
+            self._journal_file = open(self.journal_path, "a")
+        data = "".join(json.dumps(self._record(slot_key, content)) + "\n"
+                       for slot_key, content in changes.items())
+        self._journal_file.write(data)
+        self._journal_file.flush()
+        if self.sync:
+            os.fsync(self._journal_file.fileno())
+        self._journal_bytes += len(data.encode("utf-8"))
+
+        if self.snapshot_source and self.needs_compaction():
+            self.compact(self.snapshot_source())
+
+    def _record(self, slot_key: str, content: Optional[str]) -> Dict[str, object]:
+        packed = content if content is None else pack_text(content, self.codec, self.compress_threshold)
+        if isinstance(packed, dict):
+            return {"slot": slot_key, **packed}
+        return {"slot": slot_key, "content": packed}
+
+    def needs_compaction(self) -> bool:
+        return self._journal_bytes > max(self.compact_min_bytes, self._snapshot_bytes)
+
+    def compact(self, state: Dict[str, str]):
+        """Atomically replace the snapshot with state and truncate the journal"""
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({slot_key: pack_text(content, self.codec, self.compress_threshold)
+                       for slot_key, content in state.items()}, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._snapshot_bytes = os.path.getsize(self.snapshot_path)
+
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        with open(self.journal_path, "w"):
+            pass
+        self._journal_bytes = 0
+
+    def close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
@@ -4,6 +4,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import re
 
+from shared.action_profiler import profiled
+
 class SnippetCommand:
     def __init__(self, content: str, description: str = "", variables: List[str] = None):
         self.id = str(uuid.uuid4())
@@ -249,6 +251,7 @@ class SnippetsManager:
                 return cmd, root_cat
         return None
     
+    @profiled("snippet_search")
     def search_all_commands(self, query: str) -> List[Tuple[SnippetCommand, str]]:
         results = []
         for root_cat in self.root_categories:
@@ -0,0 +1,205 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.compression import compress, decompress
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS slots (
+    id INTEGER PRIMARY KEY,
+    slot_key TEXT NOT NULL UNIQUE,
+    content TEXT,
+    codec TEXT,
+    data BLOB,
+    length INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS slots_fts USING fts5(content, tokenize = 'trigram');
+"""
+
+_UPSERT_SLOT = """
+INSERT INTO slots (slot_key, content, codec, data, length, updated) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (slot_key) DO UPDATE SET content = excluded.content, codec = excluded.codec,
+    data = excluded.data, length = excluded.length, updated = excluded.updated
+RETURNING id
+"""
+_DELETE_SLOT = "DELETE FROM slots WHERE slot_key = ? RETURNING id"
+_DELETE_FTS = "DELETE FROM slots_fts WHERE rowid = ?"
+_INSERT_FTS = "INSERT INTO slots_fts (rowid, content) VALUES (?, ?)"
+_SELECT_SLOTS = "SELECT slot_key, content, codec, data FROM slots"
+_SEARCH = """
+SELECT slots.slot_key FROM slots_fts JOIN slots ON slots.id = slots_fts.rowid
+WHERE slots_fts MATCH ? ORDER BY slots.updated DESC LIMIT ?
+"""
+_SEARCH_SHORT = """
+SELECT slots.slot_key FROM slots_fts JOIN slots ON slots.id = slots_fts.rowid
+WHERE slots_fts.content LIKE ? ESCAPE '\\' ORDER BY slots.updated DESC LIMIT ?
+"""
+
+
+class SQLiteStore:
+    """SQLite alternative to SlotJournal plus state.json
+
+    One connection is kept open for the life of the store, in WAL mode, so
+    each change is a small append to the write-ahead log and readers in other
+    processes (snippers windows, scripts) never block the writer or see a
+    half-written slot. Statements are fixed strings, which sqlite3 prepares
+    once and reuses from the connection's statement cache. Slot contents are
+    indexed with an FTS5 trigram table for substring search; contents of
+    compress_threshold characters or more are stored compressed, and only
+    their first index_max_chars are indexed. The index row is written in the
+    same transaction as its slot row (by hand rather than by triggers, since
+    compressed rows have no plain content column to index), so readers on
+    other connections always find an index that matches the slots.
+
+    Exposes the same load / append_many / compact / close interface as
+    SlotJournal, so MultiClipSystem can use either.
+    """
+
+    def __init__(self, path: str, compress_threshold: Optional[int] = 64 * 1024,
+                 codec: str = "zlib", index_max_chars: int = 64 * 1024, sync: bool = True):
+        self.path = os.path.expanduser(path)
+        self.compress_threshold = compress_threshold
+        self.codec = codec
+        self.index_max_chars = index_max_chars
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(f"PRAGMA synchronous = {'FULL' if sync else 'NORMAL'}")
+        self._conn.execute("PRAGMA busy_timeout = 5000")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('schema_version', ?)",
+                               (str(SCHEMA_VERSION),))
+
+    def exists(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM slots LIMIT 1").fetchone() is not None
+
+    def _encode(self, content: str) -> Tuple[Optional[str], Optional[str], Optional[bytes]]:
+        if self.compress_threshold is None or len(content) < self.compress_threshold:
+            return content, None, None
+        used, payload = compress(content.encode("utf-8", "surrogatepass"), self.codec)
+        if used == "none":
+            return content, None, None
+        return None, used, payload
+
+    @staticmethod
+    def _decode(content: Optional[str], codec: Optional[str], data: Optional[bytes]) -> str:
+        if codec is None:
+            return content
+        return decompress(data, codec).decode("utf-8", "surrogatepass")
+
+    def load(self) -> Dict[str, str]:
+        """All stored slots, keyed like the JSON snapshot ("slot_1", ...)"""
+        with self._lock:
+            rows = self._conn.execute(_SELECT_SLOTS).fetchall()
+        return {slot_key: self._decode(content, codec, data) for slot_key, content, codec, data in rows}
+
+    def append(self, slot_key: str, content: Optional[str]):
+        """Record a single slot change; None removes the slot"""
+        self.append_many({slot_key: content})
+
+    def append_many(self, changes: Dict[str, Optional[str]]):
+        """Write several slot changes in one transaction"""
+        if not changes:
+            return
+        rows = [(slot_key, content, self._encode(content) if content is not None else None)
+                for slot_key, content in changes.items()]
+        with self._lock, self._conn:
+            self._write_rows(rows)
+
+    def _write_rows(self, rows: List[Tuple[str, Optional[str], Any]]):
+        execute = self._conn.execute
+        now = time.time()
+        for slot_key, content, encoded in rows:
+            if content is None:
+                row = execute(_DELETE_SLOT, (slot_key,)).fetchone()
+                if row is not None:
+                    execute(_DELETE_FTS, row)
+                continue
+            (row_id,) = execute(_UPSERT_SLOT, (slot_key, *encoded, len(content), now)).fetchone()
+            execute(_DELETE_FTS, (row_id,))
+            execute(_INSERT_FTS, (row_id, content[:self.index_max_chars]))
+
+    def needs_compaction(self) -> bool:
+        return False
+
+    def compact(self, state: Dict[str, str]):
+        """Replace every slot with state and checkpoint the WAL into the main file"""
+        rows = [(slot_key, content, self._encode(content)) for slot_key, content in state.items()]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM slots")
+                self._conn.execute("DELETE FROM slots_fts")
+                self._write_rows(rows)
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """Slot keys whose content contains query (case-insensitive), most recently updated first"""
+        if not query:
+            return []
+        with self._lock:
+            if len(query) < 3:
+                # The trigram tokenizer cannot MATCH fewer than three characters
+                escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                rows = self._conn.execute(_SEARCH_SHORT, (f"%{escaped}%", limit)).fetchall()
+            else:
+                phrase = '"' + query.replace('"', '""') + '"'
+                rows = self._conn.execute(_SEARCH, (phrase, limit)).fetchall()
+        return [slot_key for (slot_key,) in rows]
+
+    def save_state(self, state_data: Dict[str, Any]):
+        """Replace the stored state.json equivalent"""
+        items = [(key, json.dumps(value)) for key, value in state_data.items()]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state")
+            self._conn.executemany("INSERT INTO state VALUES (?, ?)", items)
+
+    def load_state(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM state").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def migrate_from_json(self, journal, state_file: Optional[str] = None) -> bool:
+        """Import slots from a SlotJournal and state from a state.json, once
+
+        Runs only while the database holds no slots and nothing has been
+        migrated yet. The JSON files are left in place so switching the
+        backend back still finds them.
+        """
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+                return False
+            if self._conn.execute("SELECT 1 FROM slots LIMIT 1").fetchone():
+                return False
+        slots = journal.load() if journal.exists() else {}
+        state = {}
+        if state_file and os.path.exists(state_file):
+            try:
+                with open(state_file, "r") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading state for migration: {e}")
+        rows = [(slot_key, content, self._encode(content)) for slot_key, content in slots.items()]
+        with self._lock, self._conn:
+            self._write_rows(rows)
+            self._conn.executemany("INSERT OR REPLACE INTO state VALUES (?, ?)",
+                                   [(key, json.dumps(value)) for key, value in state.items()])
+            self._conn.execute("INSERT INTO meta VALUES ('migrated_from', ?)", (journal.snapshot_path,))
+        return bool(slots or state)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("PRAGMA optimize")
+                self._conn.close()
+                self._conn = None
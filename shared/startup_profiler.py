@@ -0,0 +1,79 @@
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Records how long each import and construction step of startup takes
+
+    Stages are timed relative to a start time, normally the first line of
+    multiclip.py, so the report shows both each step's duration and when it
+    finished. mark() records a milestone such as "hotkeys live".
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = start if start is not None else time.perf_counter()
+        self.stages: List[Tuple[str, float, float]] = []
+        self.marks: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, label: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.stages.append((label, finished - started, finished - self.start))
+
+    def mark(self, label: str) -> float:
+        elapsed = time.perf_counter() - self.start
+        with self._lock:
+            self.marks.append((label, elapsed))
+        return elapsed
+
+    def get_mark(self, label: str) -> Optional[float]:
+        with self._lock:
+            for name, elapsed in self.marks:
+                if name == label:
+                    return elapsed
+        return None
+
+    def report(self, budgets: Optional[dict] = None) -> str:
+        """Format stages and milestones; budgets maps a mark label to its limit in ms"""
+        budgets = budgets or {}
+        with self._lock:
+            stages = sorted(self.stages, key=lambda stage: stage[2])
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+        lines = ["Startup profile", f"{'stage':<40} {'took ms':>9} {'done at ms':>11}"]
+        for label, duration, finished in stages:
+            lines.append(f"{label:<40} {duration * 1000:9.1f} {finished * 1000:11.1f}")
+        lines.append("")
+        for label, elapsed in marks:
+            line = f"{label:<40} {'':>9} {elapsed * 1000:11.1f}"
+            budget = budgets.get(label)
+            if budget is not None:
+                status = "ok" if elapsed * 1000 <= budget else "OVER BUDGET"
+                line += f"  (budget {budget} ms: {status})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+_profiler = StartupProfiler()
+
+
+def get_profiler() -> StartupProfiler:
+    return _profiler
+
+
+def timed_import(module_name: str):
+    """Import a module on first use, recording the time it took in the startup profile"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with _profiler.stage(f"import {module_name}"):
+        return importlib.import_module(module_name)
@@ -0,0 +1,300 @@
+import re
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _trigrams(text: str) -> Set[str]:
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _tokens(text: str) -> Set[str]:
+    return set(_TOKEN_RE.findall(text))
+
+
+def _chunks(content: str, size: int, overlap: int) -> Iterator[str]:
+    """Lowercased pieces of content, each sharing overlap characters with the one before"""
+    if len(content) <= size:
+        yield content.lower()
+        return
+    for start in range(0, len(content) - overlap, size):
+        yield content[start:start + size + overlap].lower()
+
+
+def _document_terms(content: str, chunk_chars: int) -> Tuple[Set[str], Set[str]]:
+    """Every trigram and word token of content, without lowercasing it all at once"""
+    grams: Set[str] = set()
+    for chunk in _chunks(content, chunk_chars, 2):
+        grams |= _trigrams(chunk)
+    if len(content) <= chunk_chars:
+        return grams, _tokens(content.lower())
+    tokens = {match.group().lower() for match in _TOKEN_RE.finditer(content)}
+    return grams, tokens
+
+
+def _contains(content: str, needle: str, chunk_chars: int) -> bool:
+    return any(needle in chunk for chunk in _chunks(content, chunk_chars, len(needle) - 1))
+
+
+class TextIndex:
+    """Incremental trigram and token index over clipboard payloads
+
+    Documents are blob keys. Each gets a sequential document id, and every
+    lowercase trigram and word token maps to an array of the ids containing
+    it. Removal only marks the id dead; postings are compacted once dead ids
+    outnumber live ones, so store and eviction stay cheap. Queries intersect
+    the shortest postings lists and then verify candidates against the real
+    content (fetched through content_source), so results are exact. Whole
+    documents are indexed, lowercased chunk_chars at a time, so a large clip
+    is only read back when it really contains every query trigram.
+
+    Results are newest first by use, not by first indexing: touch() marks a
+    document as used again (the clipboard manager calls it when content is
+    stored in a slot or copied again), and ranks order the candidates.
+
+    With background=True (the default) add() only queues the document, and a
+    worker thread builds its trigram and token sets, so the caller (a slot
+    write holding the clipboard lock) never pays for tokenizing. Queued
+    documents are matched directly by search() until they are posted.
+    """
+
+    def __init__(self, content_source: Callable[[int], str], chunk_chars: int = 64 * 1024,
+                 background: bool = True):
+        self.content_source = content_source
+        self.chunk_chars = chunk_chars
+        self.background = background
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        # Queued documents: key -> (content, rank)
+        self._pending: "OrderedDict[int, Tuple[str, int]]" = OrderedDict()
+        self._clock = 0
+        self._worker: Optional[threading.Thread] = None
+        self._clear()
+
+    def _clear(self):
+        self._grams: Dict[str, array] = {}
+        self._tokens: Dict[str, array] = {}
+        self._doc_keys = array('Q')
+        self._ranks = array('Q')
+        self._live = bytearray()
+        self._doc_ids: Dict[int, int] = {}
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids) + len(self._pending)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._doc_ids or key in self._pending
+
+    @staticmethod
+    def _post(postings: Dict[str, array], terms: Iterable[str], doc_id: int):
+        for term in terms:
+            ids = postings.get(term)
+            if ids is None:
+                postings[term] = array('I', (doc_id,))
+            else:
+                ids.append(doc_id)
+
+    def add(self, key: int, content: str):
+        """Index content under key; re-adding a known key is a no-op"""
+        if not self.background:
+            self._index(key, content)
+            return
+        with self._lock:
+            if key in self._doc_ids or key in self._pending:
+                return
+            self._pending[key] = (content, self._tick())
+            self._changed.notify_all()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="text-index", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._changed.wait()
+                key, (content, _) = next(iter(self._pending.items()))
+            self._index(key, content, queued=True)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _index(self, key: int, content: str, queued: bool = False):
+        """Tokenize outside the lock, then post under it (unless the key was removed meanwhile)"""
+        grams, tokens = _document_terms(content, self.chunk_chars)
+        with self._lock:
+            if queued:
+                queued_entry = self._pending.get(key)
+                if queued_entry is None or queued_entry[0] is not content:
+                    return
+                del self._pending[key]
+                rank = queued_entry[1]
+                self._changed.notify_all()
+            else:
+                rank = self._tick()
+            if key in self._doc_ids:
+                return
+            doc_id = len(self._doc_keys)
+            self._doc_keys.append(key)
+            self._ranks.append(rank)
+            self._live.append(1)
+            self._doc_ids[key] = doc_id
+            self._post(self._grams, grams, doc_id)
+            self._post(self._tokens, tokens, doc_id)
+
+    def remove(self, key: int):
+        with self._lock:
+            if self._pending.pop(key, None) is not None:
+                self._changed.notify_all()
+                return
+            doc_id = self._doc_ids.pop(key, None)
+            if doc_id is None:
+                return
+            self._live[doc_id] = 0
+            self._dead += 1
+            if self._dead > len(self._doc_ids) and self._dead > 1024:
+                self._compact()
+
+    def _compact(self):
+        """Renumber live documents densely and drop dead ids from every postings list"""
+        remap = array('i', [-1]) * len(self._doc_keys)
+        doc_keys = array('Q')
+        ranks = array('Q')
+        for doc_id, key in enumerate(self._doc_keys):
+            if self._live[doc_id]:
+                remap[doc_id] = len(doc_keys)
+                doc_keys.append(key)
+                ranks.append(self._ranks[doc_id])
+        for postings in (self._grams, self._tokens):
+            for term in list(postings):
+                ids = array('I', (remap[i] for i in postings[term] if remap[i] >= 0))
+                if ids:
+                    postings[term] = ids
+                else:
+                    del postings[term]
+        self._doc_keys = doc_keys
+        self._ranks = ranks
+        self._live = bytearray(b"\x01") * len(doc_keys)
+        self._doc_ids = {key: doc_id for doc_id, key in enumerate(doc_keys)}
+        self._dead = 0
+
+    def touch(self, key: int):
+        """Mark key as just used, so it sorts as the newest match"""
+        with self._lock:
+            queued = self._pending.get(key)
+            if queued is not None:
+                self._pending[key] = (queued[0], self._tick())
+                return
+            doc_id = self._doc_ids.get(key)
+            if doc_id is not None:
+                self._ranks[doc_id] = self._tick()
+
+    def rebuild(self, items: Iterable[Tuple[int, str]]):
+        """Discard the index and rebuild it from (key, content) pairs, oldest first"""
+        with self._lock:
+            self._clear()
+            self._pending.clear()
+            self._changed.notify_all()
+        for key, content in items:
+            self.add(key, content)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued document is posted; False if timeout expired first"""
+        with self._lock:
+            return self._changed.wait_for(lambda: not self._pending, timeout)
+
+    def _candidates(self, postings: Dict[str, array], terms: Set[str]) -> Set[int]:
+        if not terms:
+            return set()
+        lists = []
+        for term in terms:
+            ids = postings.get(term)
+            if ids is None:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for ids in lists[1:]:
+            if len(candidates) <= 64:
+                break
+            candidates.intersection_update(ids)
+        return candidates
+
+    def _short_candidates(self, needle: str) -> Set[int]:
+        """Queries under three characters: union of every gram that contains them"""
+        candidates: Set[int] = set()
+        for gram, ids in self._grams.items():
+            if needle in gram:
+                candidates.update(ids)
+        return candidates
+
+    def search(self, query: str, limit: Optional[int] = 20, tokens: bool = False) -> List[int]:
+        """Blob keys whose content contains query (or all of its word tokens), newest first"""
+        needle = query.lower()
+        if tokens:
+            terms = _tokens(needle)
+            if not terms:
+                return []
+            match = lambda content: terms <= _document_terms(content, self.chunk_chars)[1]
+        else:
+            if not needle:
+                return []
+            match = lambda content: _contains(content, needle, self.chunk_chars)
+
+        with self._lock:
+            if tokens:
+                candidates = self._candidates(self._tokens, terms)
+            elif len(needle) < 3:
+                candidates = self._short_candidates(needle)
+            else:
+                candidates = self._candidates(self._grams, _trigrams(needle))
+            # Queued documents carry their content; posted ones are read back when verified
+            ordered = [(rank, key, content) for key, (content, rank) in self._pending.items()]
+            ordered.extend((self._ranks[doc_id], self._doc_keys[doc_id], None) for doc_id in candidates
+                           if self._live[doc_id])
+        ordered.sort(key=lambda item: item[0], reverse=True)
+
+        results = []
+        for _, key, content in ordered:
+            if content is None:
+                try:
+                    content = self.content_source(key)
+                except KeyError:
+                    continue
+            if match(content):
+                results.append(key)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index structures"""
+        with self._lock:
+            total = sys.getsizeof(self._doc_keys) + sys.getsizeof(self._ranks) + sys.getsizeof(self._live)
+            total += sys.getsizeof(self._doc_ids)
+            for postings in (self._grams, self._tokens):
+                total += sys.getsizeof(postings)
+                for term, ids in postings.items():
+                    total += sys.getsizeof(term) + sys.getsizeof(ids)
+            return total
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": len(self._doc_ids),
+                "pending_documents": len(self._pending),
+                "dead_documents": self._dead,
+                "trigrams": len(self._grams),
+                "tokens": len(self._tokens),
+                "postings": sum(len(ids) for ids in self._grams.values())
+                            + sum(len(ids) for ids in self._tokens.values()),
+                "memory_bytes": self.memory_bytes(),
+            }
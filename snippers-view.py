@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, Any, Callable, Optional, List, Tuple
-import pyperclip
+from shared import clipboard_backend as clipboard
 from shared.snippets_manager import SnippetsManager, SnippetCommand, SnippetCategory
 
 class VariableSubstitutionDialog:
@@ -130,7 +130,7 @@ class VariableSubstitutionDialog:
     
     def _on_copy_clipboard(self):
         if hasattr(self, 'current_command'):
-            pyperclip.copy(self.current_command)
+            clipboard.copy(self.current_command)
             self.command.use()  # Increment usage count
             self.result = ("clipboard", self.current_command)
             self.dialog.destroy()
@@ -348,7 +348,7 @@ class SnippersViewWindow:
                     self.command_select_callback(action, command)
             else:
                 # No variables, copy directly
-                pyperclip.copy(self.current_command.content)
+                clipboard.copy(self.current_command.content)
                 self.current_command.use()
                 
                 if self.command_select_callback:
@@ -356,7 +356,7 @@ class SnippersViewWindow:
     
     def _copy_raw_command(self):
         if hasattr(self, 'current_command'):
-            pyperclip.copy(self.current_command.content)
+            clipboard.copy(self.current_command.content)
             messagebox.showinfo("Copied", "Raw command copied to clipboard")
     
     def _edit_command(self):
@@ -413,8 +413,17 @@ class SnippersViewWindow:
 
 # Standalone launcher
 if __name__ == "__main__":
+    import argparse
+    from shared import action_profiler
     from shared.snippets_manager import SnippetsManager
     
+    parser = argparse.ArgumentParser(description="Browse and paste snippets")
+    parser.add_argument("--profile", action="store_true",
+                        help="capture cProfile and tracemalloc diffs for each snippet search")
+    args = parser.parse_args()
+    if args.profile:
+        action_profiler.install(action_profiler.ActionProfiler(["snippet_search"]))
+    
     manager = SnippetsManager()
     window = SnippersViewWindow(manager)
     window.run()
@@ -0,0 +1,63 @@
+import threading
+
+from shared.action_executor import ActionExecutor
+
+
+def test_actions_with_the_same_key_run_in_submission_order():
+    executor = ActionExecutor(num_workers=4, max_queue=256)
+    ran = {key: [] for key in range(3)}
+    executor.start()
+    for i in range(100):
+        key = i % 3
+        assert executor.submit("append", ran[key].append, i, key=key)
+    executor.stop()
+
+    for key, order in ran.items():
+        assert order == list(range(key, 100, 3))
+    assert executor.get_stats()["completed"] == 100
+
+
+def test_a_blocked_key_does_not_hold_up_other_keys():
+    executor = ActionExecutor(num_workers=2)
+    started = threading.Event()
+    release = threading.Event()
+    other_ran = threading.Event()
+    executor.start()
+    try:
+        # Integer keys hash to themselves, so 0 and 1 land on different workers
+        executor.submit("blocked", lambda: started.set() or release.wait(5), key=0)
+        assert started.wait(5)
+        executor.submit("queued behind", lambda: None, key=0)
+        executor.submit("other", other_ran.set, key=1)
+        assert other_ran.wait(5)
+        assert executor.get_stats()["queued"] == 1
+    finally:
+        release.set()
+        executor.stop()
+    assert executor.get_stats()["completed"] == 3
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking():
+    executor = ActionExecutor(num_workers=1, max_queue=2)
+    ran = []
+    assert executor.submit("first", ran.append, 1)
+    assert executor.submit("second", ran.append, 2)
+    assert not executor.submit("third", ran.append, 3)
+    stats = executor.get_stats()
+    assert (stats["submitted"], stats["dropped"], stats["queued"]) == (2, 1, 2)
+
+    executor.start()
+    executor.stop()
+    assert ran == [1, 2]
+
+
+def test_failing_action_is_counted_and_the_worker_keeps_going():
+    executor = ActionExecutor()
+    ran = []
+    executor.start()
+    executor.submit("fails", lambda: 1 / 0)
+    executor.submit("runs", ran.append, "after")
+    executor.stop()
+    assert ran == ["after"]
+    stats = executor.get_stats()
+    assert (stats["failed"], stats["completed"]) == (1, 1)
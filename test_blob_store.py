@@ -0,0 +1,156 @@
+import random
+
+import pytest
+
+from shared.blob_store import BlobStore, content_hash
+from shared.clipboard_manager import ClipboardManager
+
+
+def make_store(**kwargs):
+    kwargs.setdefault("spill_threshold", None)
+    return BlobStore(**kwargs)
+
+
+def test_put_deduplicates_and_counts_references():
+    store = make_store()
+    key = store.put("same")
+    assert store.put("same") == key == content_hash("same")
+    assert store.refcount(key) == 2
+    assert len(store) == 1
+
+    store.release(key)
+    assert store.get(key) == "same"
+    store.release(key)
+    assert key not in store
+    assert store.refcount(key) == 0
+    # Releasing an unknown key is harmless
+    store.release(key)
+
+
+def test_listeners_see_first_put_and_last_release():
+    store = make_store()
+    events = []
+    store.add_listener(lambda key, content: events.append(("added", content)),
+                       lambda key: events.append(("removed", key)))
+    key = store.put("text")
+    store.acquire(key)
+    store.release(key)
+    store.release(key)
+    assert events == [("added", "text"), ("removed", key)]
+
+
+def test_refcounts_reach_zero_when_history_eviction_and_slot_overwrites_interleave():
+    store = make_store()
+    manager = ClipboardManager(num_slots=4, max_history=5, blob_store=store)
+    rng = random.Random(3)
+    for _ in range(500):
+        text = f"clip {rng.randrange(12)}"
+        if rng.random() < 0.5:
+            manager.history.add(text)
+        else:
+            manager.store_in_slot(rng.randrange(4), text)
+
+        # Every stored blob is held exactly by the slots and history entries that show it
+        expected = {}
+        for slot in manager.slots.values():
+            if slot.blob_key is not None:
+                expected[slot.blob_key] = expected.get(slot.blob_key, 0) + 1
+        for entry in manager.history.latest():
+            expected[entry.content_hash] = expected.get(entry.content_hash, 0) + 1
+        assert {key: store.refcount(key) for key in expected} == expected
+        assert len(store) == len(expected)
+
+    for slot_id in range(4):
+        manager.store_in_slot(slot_id, "")
+    manager.history.clear()
+    assert len(store) == 0
+
+
+def test_large_payloads_spill_to_disk_and_are_removed_on_release(tmp_path):
+    store = make_store(spill_dir=str(tmp_path), spill_threshold=1024, compress_threshold=None)
+    key = store.put("s" * 4096)
+    assert store.info(key).location == "spilled"
+    assert store.get(key) == "s" * 4096
+    assert len(list(tmp_path.glob("*.blob"))) == 1
+
+    store.release(key)
+    assert list(tmp_path.glob("*.blob")) == []
+
+
+def test_budget_evicts_least_recently_used_and_get_faults_back_in(tmp_path):
+    store = make_store(spill_dir=str(tmp_path), compress_threshold=None, memory_budget=35_000,
+                       evict_threshold=1024)
+    keys = [store.put(str(i) * 10_000) for i in range(3)]
+    store.get(keys[0])  # keys[1] is now the least recently used
+    store.put("3" * 10_000)
+
+    assert [store.info(key).location for key in keys] == ["memory", "evicted", "memory"]
+    assert store.stats()["resident_bytes"] <= 35_000
+
+    assert store.get(keys[1]) == "1" * 10_000
+    assert store.info(keys[1]).location == "memory"
+    assert store.stats()["faults"] == 1
+    assert store.stats()["evicted_blobs"] == 1
+
+
+def test_peek_does_not_touch_cache_or_fault_in(tmp_path):
+    store = make_store(spill_dir=str(tmp_path), compress_threshold=1024, memory_budget=1,
+                       evict_threshold=0)
+    first = store.put("a" * 5000)
+    second = store.put("b" * 5000)
+    assert store.info(first).location == "evicted"
+
+    assert store.peek(first) == "a" * 5000
+    assert store.peek(second) == "b" * 5000
+    stats = store.stats()
+    assert store.info(first).location == "evicted"
+    assert stats["faults"] == 0 and stats["cached_blobs"] == 0
+
+
+def test_small_payloads_are_not_tracked_for_eviction(tmp_path):
+    store = make_store(spill_dir=str(tmp_path), memory_budget=1, evict_threshold=4096)
+    keys = [store.put(f"small {i}") for i in range(100)]
+    assert all(store.info(key).location == "memory" for key in keys)
+    assert store.stats()["evictions"] == 0
+    for key in keys:
+        store.release(key)
+    assert store.stats()["resident_bytes"] == 0
+
+
+def test_preview_reads_only_a_prefix_from_every_tier(tmp_path):
+    text = "héllo " * 5000
+    memory = make_store(compress_threshold=None)
+    compressed = make_store(compress_threshold=1024)
+    spilled = make_store(spill_dir=str(tmp_path), spill_threshold=64, compress_threshold=1024)
+    evicted = make_store(spill_dir=str(tmp_path), compress_threshold=1024, memory_budget=1, evict_threshold=0)
+    for store in (memory, compressed, spilled, evicted):
+        key = store.put(text)
+        store.put("pushes the first one out")
+        assert store.preview(key, 9) == text[:9]
+        assert store.stats()["cached_blobs"] == 0 and store.stats()["faults"] == 0
+    assert spilled.info(content_hash(text)).location == "spilled"
+    assert evicted.info(content_hash(text)).location == "evicted"
+
+
+def test_failed_eviction_keeps_the_budget_and_retries_on_a_later_put(tmp_path):
+    blocked = tmp_path / "blobs"
+    blocked.write_text("not a directory")
+    store = make_store(spill_dir=str(blocked), compress_threshold=None, memory_budget=15_000,
+                       evict_threshold=1024, evict_retry_ms=0)
+    first = store.put("a" * 10_000)
+    store.put("b" * 10_000)
+    assert store.info(first).location == "memory"
+    assert store.memory_budget == 15_000 and store.stats()["evictions"] == 0
+
+    blocked.unlink()
+    store.put("c" * 10_000)
+    assert store.info(first).location == "evicted"
+    assert store.get(first) == "a" * 10_000
+
+
+def test_failed_put_leaves_no_reference_behind(tmp_path):
+    store = make_store(spill_dir=str(tmp_path / "missing"), spill_threshold=16, compress_threshold=None)
+    (tmp_path / "missing").write_text("blocks the spill directory")
+    with pytest.raises(OSError):
+        store.put("x" * 64)
+    assert len(store) == 0 and store.refcount(content_hash("x" * 64)) == 0
@@ -0,0 +1,82 @@
+import random
+from collections import OrderedDict
+
+from shared.blob_store import BlobStore, content_hash
+from shared.clipboard_history import ClipboardHistory
+
+
+def make_history(max_entries=4):
+    return ClipboardHistory(max_entries, BlobStore(spill_threshold=None))
+
+
+def contents(history):
+    return [entry.content for entry in history.latest()]
+
+
+def test_recopy_tombstones_old_slot_and_moves_to_front():
+    history = make_history()
+    for text in ("a", "b", "c"):
+        history.add(text)
+    history.add("a")
+
+    assert contents(history) == ["a", "c", "b"]
+    assert len(history) == 3
+    assert history.get(content_hash("a")).count == 2
+    # One reference for the entry, not one per copy
+    assert history.blob_store.refcount(content_hash("a")) == 1
+
+
+def test_eviction_skips_tombstones_and_releases_content():
+    history = make_history(max_entries=3)
+    for text in ("a", "b", "c"):
+        history.add(text)
+    history.add("a")  # tombstones the oldest ring slot
+    history.add("d")  # evicts "b", the oldest live entry
+
+    assert contents(history) == ["d", "a", "c"]
+    assert content_hash("b") not in history
+    assert content_hash("b") not in history.blob_store
+    assert len(history.blob_store) == 3
+
+
+def test_compaction_keeps_order_and_lookups():
+    history = make_history(max_entries=4)
+    for text in ("a", "b", "c", "d"):
+        history.add(text)
+    # Re-copying fills the ring with tombstones until it has to compact
+    for _ in range(10):
+        for text in ("b", "d"):
+            history.add(text)
+
+    assert contents(history) == ["d", "b", "c", "a"]
+    for text in ("a", "b", "c", "d"):
+        assert history.get(content_hash(text)).content == text
+    assert history.get(content_hash("d")).count == 11
+
+
+def test_random_operations_match_a_reference_model():
+    rng = random.Random(7)
+    history = make_history(max_entries=8)
+    model = OrderedDict()
+    for _ in range(2000):
+        text = f"clip {rng.randrange(20)}"
+        history.add(text)
+        model[text] = model.pop(text, 0) + 1
+        while len(model) > 8:
+            model.popitem(last=False)
+
+        assert contents(history) == list(reversed(model))
+    for text, count in model.items():
+        assert history.get(content_hash(text)).count == count
+    assert len(history.blob_store) == len(model)
+
+
+def test_clear_releases_every_entry():
+    history = make_history()
+    for text in ("a", "b", "a", "c"):
+        history.add(text)
+    history.clear()
+
+    assert len(history) == 0
+    assert history.latest() == []
+    assert len(history.blob_store) == 0
@@ -0,0 +1,79 @@
+import pytest
+
+from shared.blob_store import BlobStore, content_hash
+from shared.clipboard_manager import ClipboardManager
+
+
+def make_manager(num_slots=4):
+    return ClipboardManager(num_slots=num_slots, blob_store=BlobStore(spill_threshold=None))
+
+
+def test_transaction_notifies_once_with_every_changed_slot():
+    manager = make_manager()
+    notified = []
+    manager.subscribe(notified.append)
+    with manager.transaction():
+        manager.store_in_slot(0, "a")
+        manager.store_many({1: "b", 2: "c"})
+    assert notified == [[0, 1, 2]]
+
+
+def test_rollback_restores_slots_and_releases_new_content():
+    manager = make_manager()
+    manager.store_in_slot(0, "original")
+    before = manager.snapshot()[0]
+    notified = []
+    manager.subscribe(notified.append)
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            manager.store_in_slot(0, "replaced")
+            manager.store_in_slot(1, "created")
+            with manager.transaction():
+                manager.store_in_slot(0, "replaced again")
+            raise RuntimeError("abort")
+
+    assert manager.get_slot_content(0) == "original"
+    assert manager.snapshot()[0].timestamp == before.timestamp
+    assert 1 not in manager.slots
+    assert notified == []
+    store = manager.blob_store
+    assert store.refcount(content_hash("original")) == 1
+    for text in ("replaced", "created", "replaced again"):
+        assert content_hash(text) not in store
+
+
+def test_store_many_with_an_invalid_slot_stores_nothing():
+    manager = make_manager(num_slots=2)
+    assert not manager.store_many({0: "a", 5: "b"})
+    assert manager.snapshot() == {}
+
+
+def test_commit_releases_replaced_content():
+    manager = make_manager()
+    manager.store_in_slot(0, "old")
+    with manager.transaction():
+        manager.store_in_slot(0, "middle")
+        manager.store_in_slot(0, "new")
+    assert content_hash("old") not in manager.blob_store
+    assert content_hash("middle") not in manager.blob_store
+    assert manager.blob_store.refcount(content_hash("new")) == 1
+
+
+def test_rollback_hands_the_held_reference_back_without_reading_content(monkeypatch):
+    manager = make_manager()
+    original = "original " * 20
+    manager.store_in_slot(0, original)
+    store = manager.blob_store
+    monkeypatch.setattr(store, "get", lambda *args, **kwargs: pytest.fail("rollback read content"))
+    monkeypatch.setattr(store, "put", lambda *args, **kwargs: pytest.fail("rollback stored content"))
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            manager.store_in_slot(0, "")
+            raise RuntimeError("abort")
+
+    slot = manager.slots[0]
+    assert slot.blob_key == content_hash(original)
+    assert (slot.length, slot.preview) == (len(original), original[:47] + "...")
+    assert store.refcount(slot.blob_key) == 1
@@ -0,0 +1,32 @@
+from shared.config_manager import ConfigManager
+from shared.persistence_worker import PersistenceWorker
+
+
+def test_update_state_merges_over_a_save_still_pending(tmp_path):
+    config = ConfigManager(str(tmp_path))
+    worker = PersistenceWorker(debounce_ms=10_000)
+    config.set_persistence_worker(worker)
+
+    config.save_state({"current_mode": "Orderly", "frecency": {}})
+    config.update_state({"frecency": {"slot": [1]}})
+    assert config.load_state() == {}  # nothing written yet
+    worker.flush()
+    assert config.load_state() == {"current_mode": "Orderly", "frecency": {"slot": [1]}}
+
+    config.update_state({"window": "900x700"})
+    worker.flush()
+    assert config.load_state() == {"current_mode": "Orderly", "frecency": {"slot": [1]},
+                                   "window": "900x700"}
+
+
+def test_snippet_saves_are_deferred_to_the_worker(tmp_path):
+    config = ConfigManager(str(tmp_path))
+    worker = PersistenceWorker(debounce_ms=10_000)
+    config.set_persistence_worker(worker)
+    snippets = {"categories": {"git": {}}, "commands": {}}
+
+    config.save_snippets(snippets)
+    assert not config.snippets_file.exists()
+    assert config.load_snippets() == snippets
+    worker.flush()
+    assert ConfigManager(str(tmp_path)).load_snippets() == snippets
@@ -0,0 +1,105 @@
+import json
+import socket
+
+import pytest
+
+from shared.blob_store import BlobStore
+from shared.clipboard_manager import ClipboardManager
+from shared.control_client import ControlClient, ControlClientError
+from shared.control_server import ControlServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    manager = ClipboardManager(num_slots=4, blob_store=BlobStore(spill_threshold=None))
+    server = ControlServer(manager, str(tmp_path / "control.sock"))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    with ControlClient(str(server.socket_path), timeout=5) as client:
+        yield client
+
+
+def test_slots_are_numbered_from_one(server, client):
+    manager = server.clipboard_manager
+    manager.name_slot(1, "notes")
+    client.set(1, "first")
+    client.set("notes", "second")
+
+    assert manager.get_slot_content(0) == "first"
+    assert manager.get_slot_content(1) == "second"
+    assert client.get(2) == "second"
+    for bad in (0, 5, "missing"):
+        with pytest.raises(ControlClientError, match="no such slot"):
+            client.get(bad)
+
+
+def test_list_and_search(client):
+    client.set(1, "alpha needle")
+    client.set(3, "beta")
+    assert [(info["slot"], info["preview"]) for info in client.list()] == [(1, "alpha needle"), (3, "beta")]
+    assert [info["slot"] for info in client.list(all_slots=True)] == [1, 2, 3, 4]
+
+    matches = client.search("needle")
+    assert [(match["source"], match["slot"]) for match in matches] == [("slot", 1)]
+    assert client.search("absent") == []
+    with pytest.raises(ControlClientError, match="query"):
+        client.search("")
+
+
+def test_batch_applies_every_request_and_rejects_nesting(server, client):
+    results = client.batch([
+        {"op": "set", "slot": 1, "content": "one"},
+        {"op": "set", "slot": 2, "content": "two"},
+        {"op": "get", "slot": 1},
+        {"op": "get", "slot": 9},
+    ])
+    assert [result["ok"] for result in results] == [True, True, True, False]
+    assert results[2]["content"] == "one"
+
+    with pytest.raises(ControlClientError, match="nested"):
+        client.batch([{"op": "set", "slot": 3, "content": "three"},
+                      {"op": "batch", "requests": []}])
+    assert server.clipboard_manager.get_slot_content(2) == ""
+
+
+def test_malformed_requests_get_errors_and_keep_the_connection(server):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(str(server.socket_path))
+        reader = sock.makefile("rb")
+        sock.sendall(b'{"op": "get", "slot": 1\n[1, 2]\n{"op": "nope"}\n{"op": "ping"}\n')
+        responses = [json.loads(reader.readline()) for _ in range(4)]
+        reader.close()
+
+    assert [response["ok"] for response in responses] == [False, False, False, True]
+    assert responses[0]["error"].startswith("invalid JSON")
+    assert responses[1]["error"] == "request must be a JSON object"
+    assert responses[2]["error"] == "unknown op: nope"
+    assert server.request_count == 3
+
+
+def test_start_refuses_to_replace_a_live_socket(server):
+    second = ControlServer(server.clipboard_manager, str(server.socket_path))
+    with pytest.raises(OSError, match="already running"):
+        second.start()
+    with ControlClient(str(server.socket_path)) as client:
+        assert client.request("ping")["ok"]
+
+
+def test_start_replaces_a_stale_socket(tmp_path):
+    path = tmp_path / "control.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(path))  # left behind by an instance that exited without cleaning up
+    manager = ClipboardManager(num_slots=1, blob_store=BlobStore(spill_threshold=None))
+    server = ControlServer(manager, str(path))
+    server.start()
+    try:
+        with ControlClient(str(path)) as client:
+            assert client.request("ping")["ok"]
+    finally:
+        server.stop()
@@ -0,0 +1,91 @@
+import time
+
+from shared import notifier as notifier_module
+from shared.notifier import Notifier, NotifySendBackend, StandInNotificationDaemon
+
+
+class TimedDaemon(StandInNotificationDaemon):
+    def __init__(self):
+        super().__init__()
+        self.sent_at = []
+
+    def notify(self, title, message, icon, timeout_ms, replaces_id=0):
+        self.sent_at.append(time.monotonic())
+        return super().notify(title, message, icon, timeout_ms, replaces_id)
+
+
+class FailingBackend(StandInNotificationDaemon):
+    name = "failing"
+
+    def notify(self, title, message, icon, timeout_ms, replaces_id=0):
+        raise ConnectionError("bus went away")
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_burst_is_coalesced_into_one_summary():
+    daemon = StandInNotificationDaemon()
+    notifier = Notifier(daemon, coalesce_ms=50, min_interval_ms=0)
+    for i in range(7):
+        notifier.notify("Copied", f"clip {i}")
+    notifier.start()
+    notifier.stop()
+
+    assert len(daemon.notifications) == 1
+    _, title, message = daemon.notifications[0]
+    assert title == "Copied (7)"
+    assert message.splitlines() == ["... and 2 earlier", "clip 2", "clip 3", "clip 4", "clip 5", "clip 6"]
+
+
+def test_summary_replaces_the_visible_toast():
+    daemon = StandInNotificationDaemon()
+    notifier = Notifier(daemon, timeout_ms=60_000)
+    notifier._send([("Copied", "one")])
+    notifier._send([("Copied", "two"), ("Pasted", "three")])
+    notifier._send([("Copied", "four")])
+
+    ids = [notification_id for notification_id, _, _ in daemon.notifications]
+    assert ids == [1, 1, 2]
+    assert daemon.notifications[1][1] == "MultiClip (2)"
+
+    # Once the previous toast has timed out a summary gets a fresh one
+    notifier.timeout_ms = 0
+    notifier._send([("Copied", "five"), ("Copied", "six")])
+    assert daemon.notifications[-1][0] == 3
+
+
+def test_toasts_respect_the_minimum_interval():
+    daemon = TimedDaemon()
+    notifier = Notifier(daemon, coalesce_ms=10, min_interval_ms=200)
+    notifier.start()
+    try:
+        notifier.notify("Copied", "first")
+        wait_for(lambda: notifier.sent_count == 1)
+        notifier.notify("Copied", "second")
+        notifier.notify("Copied", "third")
+        wait_for(lambda: notifier.sent_count == 2)
+    finally:
+        notifier.stop()
+
+    assert daemon.sent_at[1] - daemon.sent_at[0] >= 0.2
+    assert [title for _, title, _ in daemon.notifications] == ["Copied", "Copied (2)"]
+
+
+def test_failing_backend_falls_back_to_notify_send(monkeypatch):
+    commands = []
+    monkeypatch.setattr(notifier_module.subprocess, "run",
+                        lambda command, check=False: commands.append(command))
+    notifier = Notifier(FailingBackend(), icon_path="icon.png", timeout_ms=1500)
+    notifier._send([("Copied", "slot 1")])
+
+    assert isinstance(notifier.backend, NotifySendBackend)
+    assert commands == [["notify-send", "-i", "icon.png", "Copied", "slot 1", "-t", "1500"]]
+    assert notifier.sent_count == 1
+
+    notifier._send([("Copied", "slot 2")])
+    assert len(commands) == 2 and notifier.sent_count == 2
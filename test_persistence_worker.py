@@ -0,0 +1,50 @@
+import threading
+
+from shared.persistence_worker import PersistenceWorker
+
+
+def test_failing_writer_keeps_its_keys_and_is_retried():
+    attempts = []
+    written = threading.Event()
+
+    def writer(keys):
+        attempts.append(set(keys))
+        if len(attempts) == 1:
+            raise OSError("disk full")
+        written.set()
+
+    worker = PersistenceWorker(debounce_ms=1, retry_ms=20)
+    worker.register("slots", writer)
+    worker.start()
+    try:
+        worker.mark_dirty_many("slots", {1, 2})
+        assert written.wait(5)
+    finally:
+        worker.stop()
+
+    assert attempts == [{1, 2}, {1, 2}]
+    assert worker.error_count == 1 and worker.write_count == 1
+
+
+def test_backoff_doubles_and_resets_after_a_successful_write():
+    failures = [True, True, False]
+    seen = []
+
+    def writer(keys):
+        seen.append(set(keys))
+        if failures.pop(0):
+            raise OSError("read-only file system")
+
+    worker = PersistenceWorker(retry_ms=100, max_retry_ms=150)
+    worker.register("state", writer)
+    worker.mark_dirty("state", "a")
+    worker.flush()
+    assert worker._backoff == 0.1
+    worker.mark_dirty("state", "b")
+    worker.flush()
+    assert worker._backoff == 0.15
+    assert seen[-1] == {"a", "b"}
+
+    worker.flush()
+    assert worker._backoff == 0.0 and worker._retry_at is None
+    assert worker.retry_count == 2
@@ -0,0 +1,66 @@
+import json
+import os
+
+from shared.slot_journal import SlotJournal
+
+
+def make_journal(tmp_path, **kwargs):
+    kwargs.setdefault("sync", False)
+    return SlotJournal(str(tmp_path / "clipboard_dict.json"), **kwargs)
+
+
+def test_replay_applies_changes_and_removals_over_the_snapshot(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.compact({"slot_1": "one", "slot_2": "two"})
+    journal.append("slot_2", "second")
+    journal.append_many({"slot_3": "three", "slot_1": None})
+    journal.close()
+
+    assert make_journal(tmp_path).load() == {"slot_2": "second", "slot_3": "three"}
+
+
+def test_replay_ignores_and_truncates_a_torn_final_record(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append("slot_1", "one")
+    journal.append("slot_2", "two")
+    journal.close()
+    intact = os.path.getsize(journal.journal_path)
+    with open(journal.journal_path, "a") as f:
+        f.write('{"slot": "slot_3", "cont')
+
+    reopened = make_journal(tmp_path)
+    assert reopened.load() == {"slot_1": "one", "slot_2": "two"}
+    assert os.path.getsize(reopened.journal_path) == intact
+
+    # Appends after the truncation start on a clean line
+    reopened.append("slot_3", "three")
+    reopened.close()
+    assert make_journal(tmp_path).load() == {"slot_1": "one", "slot_2": "two", "slot_3": "three"}
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    state = {}
+    journal = make_journal(tmp_path, snapshot_source=lambda: dict(state), compact_min_bytes=256)
+    for i in range(50):
+        state[f"slot_{i % 5}"] = f"content {i}"
+        journal.append(f"slot_{i % 5}", state[f"slot_{i % 5}"])
+    journal.close()
+
+    assert os.path.getsize(journal.journal_path) < 256
+    with open(journal.snapshot_path) as f:
+        assert json.load(f)
+    assert make_journal(tmp_path).load() == state
+
+
+def test_compressed_records_round_trip(tmp_path):
+    large = "compressible " * 1000
+    journal = make_journal(tmp_path, compress_threshold=1024)
+    journal.append("slot_1", large)
+    journal.compact({"slot_1": large, "slot_2": "small"})
+    journal.append("slot_3", large.upper())
+    journal.close()
+
+    with open(journal.journal_path) as f:
+        assert "codec" in json.loads(f.readline())
+    assert make_journal(tmp_path, compress_threshold=1024).load() == {
+        "slot_1": large, "slot_2": "small", "slot_3": large.upper()}
@@ -0,0 +1,78 @@
+import json
+import sqlite3
+
+from shared.slot_journal import SlotJournal
+from shared.sqlite_store import SQLiteStore
+
+
+def make_store(tmp_path, **kwargs):
+    kwargs.setdefault("sync", False)
+    return SQLiteStore(str(tmp_path / "multiclip.db"), **kwargs)
+
+
+def test_append_many_and_compact_round_trip(tmp_path):
+    store = make_store(tmp_path, compress_threshold=1024)
+    large = "compressible " * 1000
+    store.append_many({"slot_1": "one", "slot_2": large})
+    store.append_many({"slot_1": None, "slot_3": "three"})
+    assert store.load() == {"slot_2": large, "slot_3": "three"}
+
+    store.compact({"slot_4": "four"})
+    assert store.load() == {"slot_4": "four"}
+    store.close()
+    assert make_store(tmp_path).load() == {"slot_4": "four"}
+
+
+def test_search_follows_writes_removals_and_compaction(tmp_path):
+    store = make_store(tmp_path, compress_threshold=100)
+    store.append_many({"slot_1": "Hello world", "slot_2": "abc" * 100})
+    assert store.search("hello") == ["slot_1"]
+    assert store.search("cab") == ["slot_2"]
+    assert store.search("ab") == ["slot_2"]
+
+    store.append_many({"slot_1": None, "slot_3": "say hello"})
+    assert store.search("hello") == ["slot_3"]
+    store.compact({"slot_5": "fresh"})
+    assert store.search("hello") == []
+    assert store.search("fresh") == ["slot_5"]
+    store.close()
+
+
+def test_second_connection_sees_slots_and_index(tmp_path):
+    store = make_store(tmp_path)
+    store.append_many({"slot_1": "shared needle"})
+
+    reader = sqlite3.connect(str(tmp_path / "multiclip.db"))
+    try:
+        rows = reader.execute(
+            "SELECT slots.slot_key FROM slots_fts JOIN slots ON slots.id = slots_fts.rowid "
+            "WHERE slots_fts MATCH ?", ('"needle"',)).fetchall()
+        assert rows == [("slot_1",)]
+
+        store.append_many({"slot_1": "replaced"})
+        assert reader.execute("SELECT count(*) FROM slots_fts WHERE slots_fts MATCH '\"needle\"'"
+                              ).fetchone() == (0,)
+    finally:
+        reader.close()
+        store.close()
+
+
+def test_migrate_from_json_runs_once(tmp_path):
+    journal = SlotJournal(str(tmp_path / "clipboard_dict.json"), sync=False)
+    journal.compact({"slot_1": "from json"})
+    state_file = tmp_path / "state.json"
+    state_file.write_text(json.dumps({"current_mode": "Orderly"}))
+
+    store = make_store(tmp_path)
+    assert store.migrate_from_json(journal, str(state_file))
+    assert store.load() == {"slot_1": "from json"}
+    assert store.load_state() == {"current_mode": "Orderly"}
+
+    store.append_many({"slot_1": "changed since"})
+    assert not store.migrate_from_json(journal, str(state_file))
+    store.close()
+
+    reopened = make_store(tmp_path)
+    assert not reopened.migrate_from_json(journal, str(state_file))
+    assert reopened.load() == {"slot_1": "changed since"}
+    reopened.close()
@@ -0,0 +1,108 @@
+from shared.blob_store import BlobStore
+from shared.clipboard_manager import ClipboardManager
+from shared.text_index import TextIndex
+
+
+def make_index(docs, **kwargs):
+    return TextIndex(docs.__getitem__, **kwargs)
+
+
+def test_add_search_and_remove():
+    docs = {1: "Hello world", 2: "hello there", 3: "goodbye world"}
+    index = make_index(docs)
+    for key, content in docs.items():
+        index.add(key, content)
+    index.flush()
+
+    assert index.search("hello") == [2, 1]
+    assert index.search("WORLD") == [3, 1]
+    assert index.search("lo") == [2, 1]
+    assert index.search("world hello", tokens=True) == [1]
+    assert index.search("missing") == []
+
+    index.remove(1)
+    del docs[1]
+    assert index.search("hello") == [2]
+    assert 1 not in index
+    assert len(index) == 2
+
+
+def test_queued_documents_are_searchable_and_removable_before_posting():
+    docs = {}
+    index = make_index(docs)
+    for key in range(200):
+        docs[key] = f"entry {key} needle"
+        index.add(key, docs[key])
+    index.remove(199)
+    del docs[199]
+
+    # Whatever the worker has posted so far, results are exact and newest first
+    assert index.search("needle", limit=3) == [198, 197, 196]
+    index.flush()
+    assert index.stats()["pending_documents"] == 0
+    assert index.search("needle", limit=None) == list(range(198, -1, -1))
+
+
+def test_compaction_after_many_removals_keeps_results_exact():
+    docs = {key: f"doc {key} {'even' if key % 2 == 0 else 'odd'}" for key in range(5000)}
+    index = make_index(docs, background=False)
+    for key, content in docs.items():
+        index.add(key, content)
+    for key in range(0, 5000, 2):
+        index.remove(key)
+        del docs[key]
+    for key in range(1, 4000, 2):
+        index.remove(key)
+        del docs[key]
+
+    assert index.stats()["dead_documents"] < len(docs) + 1024
+    assert index.search("even") == []
+    assert index.search("odd", limit=None) == list(range(4999, 3999, -2))
+
+
+def test_large_documents_are_indexed_across_chunks():
+    docs = {1: "x" * 100 + " Tail MARKER", 2: "y" * 200}
+    index = make_index(docs, chunk_chars=16, background=False)
+    for key, content in docs.items():
+        index.add(key, content)
+
+    # Matches straddling chunk boundaries are still found, and the other large document
+    # is never a candidate
+    assert index.search("tail marker") == [1]
+    assert index.search("xxx tail") == [1]
+    assert index.search("marker", tokens=True) == [1]
+    read = []
+    index.content_source = lambda key: read.append(key) or docs[key]
+    assert index.search("marker") == [1]
+    assert read == [1]
+
+
+def test_touch_moves_a_document_to_the_front():
+    docs = {1: "shared word one", 2: "shared word two", 3: "shared word three"}
+    index = make_index(docs, background=False)
+    for key, content in docs.items():
+        index.add(key, content)
+    index.touch(1)
+    assert index.search("shared") == [1, 3, 2]
+
+
+def test_manager_search_orders_recopied_content_first():
+    manager = ClipboardManager(num_slots=3, blob_store=BlobStore(spill_threshold=None))
+    manager.store_in_slot(0, "match first")
+    manager.store_in_slot(1, "match second")
+    manager.store_in_slot(2, "match first")
+    assert [hit.preview for hit in manager.search("match")] == ["match first", "match second"]
+
+
+def test_manager_index_follows_slot_and_history_content():
+    manager = ClipboardManager(num_slots=2, max_history=2, blob_store=BlobStore(spill_threshold=None))
+    manager.store_in_slot(0, "alpha slot")
+    manager.history.add("alpha history")
+    assert {hit.preview for hit in manager.search("alpha")} == {"alpha slot", "alpha history"}
+
+    manager.store_in_slot(0, "beta")
+    for text in ("gamma", "delta"):
+        manager.history.add(text)
+    manager.index.flush()
+    assert manager.search("alpha") == []
+    assert len(manager.index) == len(manager.blob_store)